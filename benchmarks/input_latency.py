@@ -0,0 +1,60 @@
+"""Benchmark the latency of converting records with the Input node
+
+Compares inferring the format and dtypes of the data (the default) with
+using a declared schema, for single records and batches of records.
+
+Usage:
+
+    python benchmarks/input_latency.py
+"""
+
+import timeit
+
+import numpy as np
+
+from pipedown.nodes.base import Input
+
+N_NUMERIC = 40
+N_CATEGORICAL = 10
+
+
+def get_schema():
+    schema = {f"x{i}": "float64" for i in range(N_NUMERIC)}
+    schema.update({f"c{i}": "object" for i in range(N_CATEGORICAL)})
+    return schema
+
+
+def get_record(rng):
+    record = {f"x{i}": rng.normal() for i in range(N_NUMERIC)}
+    record.update({f"c{i}": f"cat{i}" for i in range(N_CATEGORICAL)})
+    return record
+
+
+def time_per_call(fn, number):
+    """Best time per call in microseconds"""
+    return 1e6 * min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    rng = np.random.default_rng(0)
+    record = get_record(rng)
+    records = [get_record(rng) for _ in range(1000)]
+    array = rng.normal(size=(1, N_NUMERIC + N_CATEGORICAL))
+
+    inferred = Input()
+    declared = Input(get_schema())
+
+    print(f"{'input':<24}{'inferred (us)':>16}{'schema (us)':>16}")
+    for name, data, number in [
+        ("single record", record, 2000),
+        ("1000 records", records, 20),
+    ]:
+        t_inferred = time_per_call(lambda: inferred.run(data), number)
+        t_declared = time_per_call(lambda: declared.run(data), number)
+        print(f"{name:<24}{t_inferred:>16.1f}{t_declared:>16.1f}")
+    t_array = time_per_call(lambda: declared.run(array), 2000)
+    print(f"{'single row array':<24}{'-':>16}{t_array:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,3 @@
 from .cross_validation_implementation import CrossValidationImplementation
+from .process_pool import ProcessPool
 from .sequential import Sequential
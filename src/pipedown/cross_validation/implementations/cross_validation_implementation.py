@@ -1,9 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any, List
+from contextlib import contextmanager
+from copy import deepcopy
+from typing import Any, List, Optional, Tuple, Union
 
 import pandas as pd
 
 from pipedown.cross_validation.splitters import CrossValidationSplitter
+from pipedown.nodes.base import Cache
+from pipedown.utils.cv_context import CVContext
 
 
 class CrossValidationImplementation(ABC):
@@ -11,7 +15,16 @@ class CrossValidationImplementation(ABC):
 
     @abstractmethod
     def run(
-        self, dag, df: pd.DataFrame, outputs, splitter: CrossValidationSplitter
+        self,
+        dag,
+        cv_on: str,
+        X: pd.DataFrame,
+        y: pd.Series,
+        outputs: Union[str, List[str]],
+        splitter: CrossValidationSplitter,
+        verbose: bool = False,
+        profiler=None,
+        return_node_states: bool = False,
     ) -> List[Any]:
         """Run the cross-validation
 
@@ -19,10 +32,112 @@ class CrossValidationImplementation(ABC):
         ----------
         dag : pipedown.dag.DAG
             The DAG on which to perform cross validation
-        df : pd.DataFrame
-            The entire dataset to use as the input to the primary data node
-        output : Union[str, List[str]]
+        cv_on : str
+            Name of the node on whose outputs to cross-validate.
+        X : pd.DataFrame
+            Feature values output by cv_on node.
+        y : pd.Series
+            Target values output by cv_on node.
+        outputs : Union[str, List[str]]
             Name(s) of the output node(s)
         splitter : CrossValidationSplitter object
             The splitter to use
+        verbose : bool
+            Whether to print info each fold
+        profiler : Optional[pipedown.dag.Profiler]
+            Profiler to record statistics and a timeline of each fold.
+        return_node_states : bool
+            Whether to also return the state of each node downstream of
+            `cv_on` after it was fit on each fold.
+
+        Returns
+        -------
+        List[Any]
+            The outputs for each fold.  Or, if `return_node_states`, a
+            ``(outputs, node_states)`` tuple for each fold, where
+            ``node_states`` is a dict mapping node names to their states.
         """
+
+
+def get_downstream_nodes(dag, cv_on: str) -> List[str]:
+    """Get the names of the nodes downstream of `cv_on`"""
+    downstream = []
+    to_visit = [c.name for c in dag.get_node(cv_on).get_children()]
+    while len(to_visit) > 0:
+        name = to_visit.pop()
+        if name not in downstream:
+            downstream.append(name)
+            to_visit += [c.name for c in dag.get_node(name).get_children()]
+    return downstream
+
+
+def get_downstream_caches(dag, cv_on: str) -> List[Cache]:
+    """Get the Cache nodes downstream of `cv_on`"""
+    return [
+        dag.get_node(n)
+        for n in get_downstream_nodes(dag, cv_on)
+        if isinstance(dag.get_node(n), Cache)
+    ]
+
+
+@contextmanager
+def cache_fold(caches: List[Cache], fingerprint: Optional[str], i: int):
+    """Have caches store separate data for one fold within a context
+
+    Parameters
+    ----------
+    caches : List[Cache]
+        The caches downstream of the node being cross-validated on
+    fingerprint : Optional[str]
+        Fingerprint of the splitter (see
+        :func:`pipedown.utils.cv_context.get_cv_fingerprint`).  Only needed
+        if there are any caches.
+    i : int
+        Index of the fold
+    """
+    for cache in caches:
+        cache.cv_context = CVContext(fingerprint, i)
+    try:
+        yield
+    finally:
+        for cache in caches:
+            cache.cv_context = None
+
+
+def get_fold_data(
+    splitter: CrossValidationSplitter, X: pd.DataFrame, y: pd.Series, i: int
+) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
+    """Get a copy of one fold of data, which nodes are free to modify.
+
+    If the splitter can return the positions of each fold's rows, the rows
+    are taken from the dataset directly (which copies them once).  Otherwise
+    the DataFrames returned by the splitter's ``get_fold`` are deep-copied,
+    in case they are views of the dataset.
+
+    Parameters
+    ----------
+    splitter : CrossValidationSplitter object
+        The splitter to use
+    X : pd.DataFrame
+        Features for the entire dataset
+    y : pd.Series
+        Target for the entire dataset
+    i : int
+        Index of the cross-validation fold to return.
+
+    Returns
+    -------
+    x_train : pd.DataFrame
+        Training features for fold i
+    y_train : pd.DataFrame
+        Training target for fold i
+    x_val : pd.DataFrame
+        Validation features for fold i
+    y_val : pd.DataFrame
+        Validation features for fold i
+    """
+    try:
+        ix_train, ix_val = splitter.get_fold_indices(X, y, i)
+    except NotImplementedError:
+        return deepcopy(splitter.get_fold(X, y, i))
+    return X.take(ix_train), y.take(ix_train), X.take(ix_val), y.take(ix_val)
@@ -0,0 +1,273 @@
+from typing import Any, Dict, List, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.splitters import CrossValidationSplitter
+from pipedown.nodes.base import Node
+from pipedown.utils.tracing import span
+
+from .cross_validation_implementation import get_fold_data
+
+
+class FoldInputs:
+    """Inputs to the DAG for each fold of cross-validation
+
+    By default, each fold's data is passed to the children of the `cv_on`
+    node, and every node downstream of it is fit and run on every fold.  But
+    stateless nodes (see :func:`is_stateless`) which only depend on the
+    `cv_on` node (or on other such nodes) give the same outputs whatever
+    they were fit on and whichever other rows they're run with.  So with
+    `reuse_stateless`, those are run once on the entire dataset, and each
+    fold starts at their children, with the rows of the precomputed outputs
+    which are in that fold.
+
+    Parameters
+    ----------
+    dag : pipedown.dag.DAG
+        The DAG on which to perform cross validation
+    cv_on : str
+        Name of the node on whose outputs to cross-validate.
+    X : pd.DataFrame
+        Feature values output by cv_on node.
+    y : pd.Series
+        Target values output by cv_on node.
+    outputs : Union[str, List[str]]
+        Name(s) of the output node(s)
+    splitter : CrossValidationSplitter object
+        The splitter to use (which must have been set up).  Stateless nodes
+        are only reused if it implements ``get_fold_indices``.
+    reuse_stateless : bool
+        Whether to run stateless nodes once, instead of on every fold.
+    profiler : Optional[pipedown.dag.Profiler]
+        Profiler to record running the stateless nodes.
+    incremental : bool
+        Whether the training inputs for each fold after the first should
+        only contain the rows which weren't in the previous fold's (see
+        ``CrossValidationSplitter.get_incremental_fold_indices``).
+    """
+
+    def __init__(
+        self,
+        dag,
+        cv_on: str,
+        X: pd.DataFrame,
+        y: pd.Series,
+        outputs: Union[str, List[str]],
+        splitter: CrossValidationSplitter,
+        reuse_stateless: bool = True,
+        profiler=None,
+        incremental: bool = False,
+    ):
+        self.X = X
+        self.y = y
+        self.splitter = splitter
+        self.incremental = incremental
+        self.cv_on_children = [
+            c.name for c in dag.get_node(cv_on).get_children()
+        ]
+
+        # Can only take rows from the data if we know which are in each fold
+        try:
+            splitter.get_fold_indices(X, y, 0)
+        except NotImplementedError:
+            if incremental:
+                raise
+            self.inputs = None
+            return
+        self.inputs = {c: (X, y) for c in self.cv_on_children}
+
+        # Run the stateless nodes once on all the data
+        stateless = get_stateless_nodes(dag, cv_on, outputs)
+        if not reuse_stateless or len(stateless) == 0:
+            return
+        starts = get_start_nodes(dag, cv_on, stateless)
+        last = [
+            n
+            for n in stateless
+            if any(c.name in starts for c in dag.get_node(n).get_children())
+        ]
+        # (copying the data for nodes which modify their inputs, since it's
+        # also passed to their siblings)
+        from pipedown.dag.dag_tools import copy_data  # avoid circular import
+
+        inputs = {}
+        for name in self.cv_on_children:
+            if name in stateless and dag.get_node(name).mutates_inputs:
+                inputs[name] = copy_data((X, y))
+            elif name in stateless:
+                inputs[name] = (X, y)
+        with span("stateless nodes", "cv precompute"):
+            results = dag.run(inputs, last, profiler=profiler)
+        if len(last) == 1:
+            results = {last[0]: results}
+        results[cv_on] = (X, y)
+        if not all(can_take_rows(v, X.index) for v in results.values()):
+            return
+
+        # Inputs to the nodes where each fold starts
+        self.inputs = {}
+        for name in starts:
+            parents = [p.name for p in dag.get_node(name).get_parents()]
+            parents = [p for p in parents if p in results]
+            if len(parents) == 1:
+                self.inputs[name] = results[parents[0]]
+            else:
+                self.inputs[name] = tuple(results[p] for p in parents)
+
+    def get_fold(self, i: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Get the inputs for one fold
+
+        Parameters
+        ----------
+        i : int
+            Index of the cross-validation fold to return.
+
+        Returns
+        -------
+        train_inputs : Dict[str, Any]
+            Inputs to fit the DAG on for fold i
+        val_inputs : Dict[str, Any]
+            Inputs to run the DAG on for fold i
+        """
+        if self.inputs is None:
+            x_train, y_train, x_val, y_val = get_fold_data(
+                self.splitter, self.X, self.y, i
+            )
+            return (
+                {c: (x_train, y_train) for c in self.cv_on_children},
+                {c: (x_val, y_val) for c in self.cv_on_children},
+            )
+        elif self.incremental and i > 0:
+            ix_train, ix_val = self.splitter.get_incremental_fold_indices(
+                self.X, self.y, i
+            )
+        else:
+            ix_train, ix_val = self.splitter.get_fold_indices(
+                self.X, self.y, i
+            )
+        index = self.X.index
+        return (
+            {n: take_rows(v, ix_train, index) for n, v in self.inputs.items()},
+            {n: take_rows(v, ix_val, index) for n, v in self.inputs.items()},
+        )
+
+
+def is_stateless(node: Node) -> bool:
+    """Whether a node's outputs don't depend on what it was fit on, and it
+    processes each row independently
+
+    Only nodes which are marked as stateless (with their ``stateless``
+    attribute) are, since a node which doesn't need to be fit can still use
+    statistics of all the rows it's run on.
+    """
+    return bool(getattr(node, "stateless", False))
+
+
+def get_stateless_nodes(
+    dag, cv_on: str, outputs: Union[str, List[str]]
+) -> Set[str]:
+    """Get the names of the nodes downstream of `cv_on` which can be run
+    once on the entire dataset instead of on each fold
+
+    These are the stateless, streamable nodes (other than the outputs)
+    between `cv_on` and the outputs, whose parents are all `cv_on` or other
+    such nodes.  And, so that each fold's inputs can be passed to the nodes
+    downstream of them, any of their children which are needed must only
+    have parents which are `cv_on` or such nodes.
+    """
+    if isinstance(outputs, str):
+        outputs = [outputs]
+
+    # Nodes needed to compute the outputs
+    needed = set()
+    to_visit = list(outputs)
+    while len(to_visit) > 0:
+        name = to_visit.pop()
+        if name not in needed and name != cv_on:
+            needed.add(name)
+            to_visit += [p.name for p in dag.get_node(name).get_parents()]
+
+    # Stateless nodes which only depend on cv_on or other stateless nodes
+    stateless = set()
+    to_visit = [c.name for c in dag.get_node(cv_on).get_children()]
+    while len(to_visit) > 0:
+        name = to_visit.pop(0)
+        node = dag.get_node(name)
+        parents = {p.name for p in node.get_parents()}
+        if (
+            name in stateless
+            or name not in needed
+            or name in outputs
+            or not (is_stateless(node) and node.streamable)
+            or not parents <= stateless | {cv_on}
+            or (cv_on in parents and len(parents) > 1)
+        ):
+            continue
+        stateless.add(name)
+        to_visit += [c.name for c in node.get_children()]
+
+    # Don't reuse nodes whose children also need other nodes' outputs (or
+    # which depend on nodes which can't be reused)
+    changed = True
+    while changed:
+        changed = False
+        for name in get_start_nodes(dag, cv_on, stateless):
+            parents = {p.name for p in dag.get_node(name).get_parents()}
+            if parents & stateless and not parents <= stateless | {cv_on}:
+                stateless -= parents
+                changed = True
+        for name in list(stateless):
+            parents = {p.name for p in dag.get_node(name).get_parents()}
+            if not parents <= stateless | {cv_on}:
+                stateless.remove(name)
+                changed = True
+    return stateless
+
+
+def get_start_nodes(dag, cv_on: str, stateless: Set[str]) -> List[str]:
+    """Get the names of the nodes at which each fold starts: the children
+    of `cv_on` and of the stateless nodes, which aren't stateless nodes"""
+    starts = []
+    for name in stateless | {cv_on}:
+        for child in dag.get_node(name).get_children():
+            if child.name not in stateless and child.name not in starts:
+                starts.append(child.name)
+    return starts
+
+
+def can_take_rows(data: Any, index: pd.Index) -> bool:
+    """Whether :func:`take_rows` can get rows of some data"""
+    if isinstance(data, tuple):
+        return all(can_take_rows(d, index) for d in data)
+    elif isinstance(data, (pd.DataFrame, pd.Series)):
+        return data.index.equals(index) or data.index.is_unique
+    return data is None
+
+
+def take_rows(data: Any, ix: np.ndarray, index: pd.Index) -> Any:
+    """Take the rows of some data which are at positions `ix` in `index`
+
+    Parameters
+    ----------
+    data : Any
+        A DataFrame or Series (or None, or a tuple of those) whose rows are a
+        subset of the rows of `index`.
+    ix : np.ndarray
+        Integer positions of the rows to take, in `index`
+    index : pd.Index
+        Index of the entire dataset
+
+    Returns
+    -------
+    Any
+        Copies of the rows of `data` which are in `ix` (in that order)
+    """
+    if isinstance(data, tuple):
+        return tuple(take_rows(d, ix, index) for d in data)
+    elif data is None:
+        return None
+    elif data.index is index or data.index.equals(index):
+        return data.take(ix)
+    positions = data.index.get_indexer(index[ix])
+    return data.take(positions[positions >= 0])
@@ -0,0 +1,292 @@
+import random
+import tempfile
+from concurrent import futures
+from copy import copy
+from typing import Any, List, Optional, Union
+
+import cloudpickle
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.splitters import CrossValidationSplitter
+from pipedown.utils.cv_context import get_cv_fingerprint
+from pipedown.utils.node_state import get_node_state
+from pipedown.utils.null_context import null_context
+from pipedown.utils.shared_frame import SharedFrame
+from pipedown.utils.tracing import span
+
+from .cross_validation_implementation import (
+    CrossValidationImplementation,
+    cache_fold,
+    get_downstream_caches,
+    get_downstream_nodes,
+)
+from .fold_inputs import FoldInputs
+
+# Data shared by all the folds run in a worker process
+_worker_data = {}
+
+
+class ProcessPool(CrossValidationImplementation):
+    """Parallel cross validation, running folds in a pool of processes
+
+    Each fold is fit and run on a separate copy of the DAG (as it was before
+    cross-validating) in a worker process.  The DAG, the data, and the
+    splitter are sent to each worker process once, and the outputs for each
+    fold are returned in order, the same as :class:`.Sequential`.
+
+    By default the data is written to memory-mapped files which all the
+    workers share, instead of being copied into each worker, so that memory
+    use doesn't grow with the number of workers.  Each worker only copies
+    the rows it needs for the fold it is running.
+
+    Parameters
+    ----------
+    max_workers : Optional[int]
+        Maximum number of folds to run at the same time.  Default is to use
+        the default for :class:`concurrent.futures.ProcessPoolExecutor`.
+    random_seed : Optional[int]
+        Python's and NumPy's global random number generators are seeded with
+        ``random_seed + fold`` before running each fold, so that nodes which
+        use them give the same results regardless of which worker runs which
+        fold.  If None, they aren't seeded.  Default = 12345
+    memmap : bool
+        Whether to share the data with the workers through memory-mapped
+        files.  If False, each worker gets its own copy.  Default = True
+    memmap_dir : Optional[str]
+        Directory in which to write the memory-mapped files, which are
+        deleted after cross-validating.  Use a RAM-backed filesystem (e.g.
+        ``/dev/shm`` on Linux) to keep the data in shared memory rather than
+        on disk.  Default is the system's temporary directory.
+    reuse_stateless : bool
+        Whether to run stateless nodes downstream of the node being
+        cross-validated on once on all the data (in this process), instead
+        of on every fold (see :class:`.FoldInputs`).  Default is True.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        random_seed: Optional[int] = 12345,
+        memmap: bool = True,
+        memmap_dir: Optional[str] = None,
+        reuse_stateless: bool = True,
+    ):
+        self.max_workers = max_workers
+        self.random_seed = random_seed
+        self.memmap = memmap
+        self.memmap_dir = memmap_dir
+        self.reuse_stateless = reuse_stateless
+
+    def run(
+        self,
+        dag,
+        cv_on: str,
+        X: pd.DataFrame,
+        y: pd.Series,
+        outputs: Union[str, List[str]],
+        splitter: CrossValidationSplitter,
+        verbose: bool = False,
+        profiler=None,
+        return_node_states: bool = False,
+    ) -> List[Any]:
+        """Run the cross-validation
+
+        Parameters
+        ----------
+        dag : pipedown.dag.DAG
+            The DAG on which to perform cross validation
+        cv_on : str
+            Name of the node on whose outputs to cross-validate.
+        X : pd.DataFrame
+            Feature values output by cv_on node.
+        y : pd.Series
+            Target values output by cv_on node.
+        outputs : Union[str, List[str]]
+            Name(s) of the output node(s)
+        splitter : CrossValidationSplitter object
+            The splitter to use
+        verbose : bool
+            Whether to print info each fold
+        profiler : Optional[pipedown.dag.Profiler]
+            Profiler to record statistics and a timeline of each fold.  Each
+            fold is profiled in its worker, and the results are added to this
+            profiler.
+        return_node_states : bool
+            Whether to also return the state of each node downstream of
+            `cv_on` after it was fit on each fold.
+
+        Returns
+        -------
+        List[Any]
+            The outputs for each fold.  Or, if `return_node_states`, a
+            ``(outputs, node_states)`` tuple for each fold, where
+            ``node_states`` is a dict mapping node names to their states.
+        """
+
+        # Set up the splitter, and run any stateless nodes
+        splitter.setup(X, y)
+        dag.instantiate_dag("train")
+        with profiler or null_context():
+            fold_inputs = FoldInputs(
+                dag,
+                cv_on,
+                X,
+                y,
+                outputs,
+                splitter,
+                self.reuse_stateless,
+                profiler,
+            )
+
+        # Nodes whose states to return
+        node_names = []
+        if return_node_states:
+            node_names = get_downstream_nodes(dag, cv_on)
+
+        # Caches downstream of cv_on store separate data for each fold
+        cache_names = [c.name for c in get_downstream_caches(dag, cv_on)]
+        fingerprint = None
+        if len(cache_names) > 0:
+            fingerprint = get_cv_fingerprint(splitter)
+
+        # Each fold gets a fresh profiler, whose results are merged after
+        fold_profiler = None
+        if profiler is not None:
+            fold_profiler = type(profiler)(profiler.trace_memory)
+
+        # Share the data w/ the workers via memory-mapped files
+        with tempfile.TemporaryDirectory(dir=self.memmap_dir) as directory:
+            if self.memmap:
+                fold_inputs = copy(fold_inputs)
+                shared = {}
+                fold_inputs.X = share(fold_inputs.X, directory, shared)
+                fold_inputs.y = share(fold_inputs.y, directory, shared)
+                fold_inputs.inputs = share(
+                    fold_inputs.inputs, directory, shared
+                )
+
+            # Run the folds in parallel
+            with futures.ProcessPoolExecutor(
+                self.max_workers,
+                initializer=set_worker_data,
+                initargs=(
+                    cloudpickle.dumps(dag),
+                    cloudpickle.dumps(fold_inputs),
+                ),
+            ) as pool:
+                fold_futures = {
+                    pool.submit(
+                        run_fold,
+                        i,
+                        outputs,
+                        self.random_seed,
+                        fold_profiler,
+                        node_names,
+                        cache_names,
+                        fingerprint,
+                    ): i
+                    for i in range(splitter.get_n_folds())
+                }
+                results = [None] * len(fold_futures)
+                for future in futures.as_completed(fold_futures):
+                    i = fold_futures[future]
+                    results[i] = future.result()
+                    if verbose:
+                        print(f"Fold {i} done")
+
+        # Collect the outputs (and profiling results) of each fold
+        output_values = []
+        for fold_outputs, node_states, fold_profiler in results:
+            if return_node_states:
+                fold_outputs = (fold_outputs, node_states)
+            output_values.append(fold_outputs)
+            if profiler is not None:
+                profiler.records.extend(fold_profiler.records)
+                profiler.trace_events.extend(fold_profiler.trace_events)
+        return output_values
+
+
+def share(data: Any, directory: str, shared: dict) -> Any:
+    """Write DataFrames and Series (and any in tuples or dicts) to
+    memory-mapped files to share them.  `shared` maps the ids of data which
+    has already been shared to the :class:`.SharedFrame` it was written to.
+    """
+    if isinstance(data, tuple):
+        return tuple(share(d, directory, shared) for d in data)
+    elif isinstance(data, dict):
+        return {k: share(v, directory, shared) for k, v in data.items()}
+    elif isinstance(data, (pd.DataFrame, pd.Series)):
+        if id(data) not in shared:
+            shared[id(data)] = SharedFrame(data, directory)
+        return shared[id(data)]
+    return data
+
+
+def load_shared(data: Any, loaded: dict) -> Any:
+    """Load data written by :func:`share`.  `loaded` maps the ids of
+    :class:`.SharedFrame` objects which have already been loaded to the
+    loaded data.
+    """
+    if isinstance(data, tuple):
+        return tuple(load_shared(d, loaded) for d in data)
+    elif isinstance(data, dict):
+        return {k: load_shared(v, loaded) for k, v in data.items()}
+    elif isinstance(data, SharedFrame):
+        if id(data) not in loaded:
+            loaded[id(data)] = data.load()
+        return loaded[id(data)]
+    return data
+
+
+def set_worker_data(dag: bytes, fold_inputs: bytes) -> None:
+    """Store the DAG and data in a worker process (when it's started)"""
+    fold_inputs = cloudpickle.loads(fold_inputs)
+    loaded = {}
+    fold_inputs.X = load_shared(fold_inputs.X, loaded)
+    fold_inputs.y = load_shared(fold_inputs.y, loaded)
+    fold_inputs.inputs = load_shared(fold_inputs.inputs, loaded)
+    _worker_data["dag"] = dag
+    _worker_data["fold_inputs"] = fold_inputs
+
+
+def run_fold(
+    i: int,
+    outputs: Union[str, List[str]],
+    random_seed: Optional[int],
+    profiler=None,
+    node_names: List[str] = [],
+    cache_names: List[str] = [],
+    fingerprint: Optional[str] = None,
+):
+    """Fit a fresh copy of the DAG on one fold and run it on the validation
+    data, in a worker process
+
+    Returns
+    -------
+    Tuple[Any, Dict[str, Dict[str, Any]], Optional[pipedown.dag.Profiler]]
+        The outputs for the fold, the states of the nodes in `node_names`,
+        and the profiler
+    """
+    if random_seed is not None:
+        random.seed(random_seed + i)
+        np.random.seed(random_seed + i)
+    dag = cloudpickle.loads(_worker_data["dag"])
+    caches = [dag.get_node(n) for n in cache_names]
+    with profiler or null_context():
+        with span(f"fold {i}", "cv", fold=i), cache_fold(
+            caches, fingerprint, i
+        ):
+
+            # Get data for this fold
+            with span(f"fold {i}", "cv split", fold=i):
+                train_inputs, val_inputs = _worker_data[
+                    "fold_inputs"
+                ].get_fold(i)
+
+            # Fit the DAG on training data, and run it on validation data
+            fold_outputs = dag.fit_and_run(
+                train_inputs, val_inputs, outputs, profiler=profiler
+            )
+    node_states = {n: get_node_state(dag.get_node(n)) for n in node_names}
+    return fold_outputs, node_states, profiler
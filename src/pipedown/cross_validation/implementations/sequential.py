@@ -4,12 +4,55 @@ from typing import Any, List, Union
 import pandas as pd
 
 from pipedown.cross_validation.splitters import CrossValidationSplitter
+from pipedown.nodes.base import Node
+from pipedown.utils.cv_context import get_cv_fingerprint
+from pipedown.utils.node_state import get_node_state
+from pipedown.utils.null_context import null_context
+from pipedown.utils.tracing import span
 
-from .cross_validation_implementation import CrossValidationImplementation
+from .cross_validation_implementation import (
+    CrossValidationImplementation,
+    cache_fold,
+    get_downstream_caches,
+    get_downstream_nodes,
+)
+from .fold_inputs import FoldInputs, is_stateless
 
 
 class Sequential(CrossValidationImplementation):
-    """Sequential, single-threaded, cross validation"""
+    """Sequential, single-threaded, cross validation
+
+    Parameters
+    ----------
+    fused : bool
+        Whether to fit each node on the training data and run it on the
+        validation data in a single pass through the DAG for each fold (see
+        :meth:`pipedown.dag.DAG.fit_and_run`), instead of fitting the whole
+        DAG and then running it.  The results are the same.  Default is True.
+    reuse_stateless : bool
+        Whether to run stateless nodes downstream of the node being
+        cross-validated on once on all the data, instead of on every fold
+        (see :class:`.FoldInputs`).  The results are the same.  Default is
+        True.
+    incremental : bool
+        Whether to fit each fold after the first incrementally: continuing
+        from the nodes' state after the previous fold, on only the training
+        data which wasn't in the previous fold.  This needs a splitter whose
+        training sets only grow from fold to fold, such as
+        :class:`.OutOfTimeSplitter`, and every node which keeps state from
+        fitting to have a ``partial_fit`` method (see
+        :meth:`pipedown.dag.DAG.fit`).  Default is False.
+    """
+
+    def __init__(
+        self,
+        fused: bool = True,
+        reuse_stateless: bool = True,
+        incremental: bool = False,
+    ):
+        self.fused = fused
+        self.reuse_stateless = reuse_stateless
+        self.incremental = incremental
 
     def run(
         self,
@@ -20,6 +63,8 @@ class Sequential(CrossValidationImplementation):
         outputs: Union[str, List[str]],
         splitter: CrossValidationSplitter,
         verbose: bool = False,
+        profiler=None,
+        return_node_states: bool = False,
     ) -> List[Any]:
         """Run the cross-validation
 
@@ -39,28 +84,99 @@ class Sequential(CrossValidationImplementation):
             The splitter to use
         verbose : bool
             Whether to print info each fold
+        profiler : Optional[pipedown.dag.Profiler]
+            Profiler to record statistics and a timeline of each fold.
+        return_node_states : bool
+            Whether to also return the state of each node downstream of
+            `cv_on` after it was fit on each fold.
+
+        Returns
+        -------
+        List[Any]
+            The outputs for each fold.  Or, if `return_node_states`, a
+            ``(outputs, node_states)`` tuple for each fold, where
+            ``node_states`` is a dict mapping node names to their states.
         """
 
         # Set up the splitter
         output_values = []
         splitter.setup(X, y)
         dag.instantiate_dag("train")
-        cv_on_children = dag.get_node(cv_on).get_children()
+        if self.incremental:
+            check_incremental(dag, cv_on)
 
-        # Run each fold sequentially
-        for i in range(splitter.get_n_folds()):
+        # Caches downstream of cv_on store separate data for each fold
+        caches = get_downstream_caches(dag, cv_on)
+        fingerprint = None
+        if len(caches) > 0:
+            fingerprint = get_cv_fingerprint(splitter, self.incremental)
 
-            # Get data for this fold
-            x_train, y_train, x_val, y_val = deepcopy(
-                splitter.get_fold(X, y, i)
+        # Run each fold sequentially
+        with profiler or null_context():
+            fold_inputs = FoldInputs(
+                dag,
+                cv_on,
+                X,
+                y,
+                outputs,
+                splitter,
+                self.reuse_stateless,
+                profiler,
+                self.incremental,
             )
+            for i in range(splitter.get_n_folds()):
+                with span(f"fold {i}", "cv", fold=i), cache_fold(
+                    caches, fingerprint, i
+                ):
+
+                    # Get data for this fold
+                    with span(f"fold {i}", "cv split", fold=i):
+                        train_inputs, val_inputs = fold_inputs.get_fold(i)
 
-            # Fit the DAG on training data for this fold
-            train_inputs = {c.name: (x_train, y_train) for c in cv_on_children}
-            dag.fit(inputs=train_inputs, outputs=outputs)
+                    # Fit the DAG on training data for this fold, and run it
+                    # on validation data
+                    warm_start = self.incremental and i > 0
+                    if self.fused:
+                        fold_outputs = dag.fit_and_run(
+                            train_inputs,
+                            val_inputs,
+                            outputs,
+                            profiler=profiler,
+                            warm_start=warm_start,
+                        )
+                    else:
+                        dag.fit(
+                            train_inputs,
+                            outputs,
+                            profiler=profiler,
+                            warm_start=warm_start,
+                        )
+                        fold_outputs = dag.run(
+                            val_inputs, outputs, profiler=profiler
+                        )
 
-            # Run the pipeline on validation data for this fold
-            val_inputs = {c.name: (x_val, y_val) for c in cv_on_children}
-            output_values.append(dag.run(inputs=val_inputs, outputs=outputs))
+                    # Copy the states of the nodes fit on this fold
+                    if return_node_states:
+                        node_states = {
+                            n: deepcopy(get_node_state(dag.get_node(n)))
+                            for n in get_downstream_nodes(dag, cv_on)
+                        }
+                        fold_outputs = (fold_outputs, node_states)
+                    output_values.append(fold_outputs)
 
         return output_values
+
+
+def check_incremental(dag, cv_on: str) -> None:
+    """Check the nodes downstream of `cv_on` can be fit incrementally"""
+    for name in get_downstream_nodes(dag, cv_on):
+        node = dag.get_node(name)
+        if (
+            type(node).fit is not Node.fit
+            and not is_stateless(node)
+            and not hasattr(node, "partial_fit")
+        ):
+            raise ValueError(
+                f"Node {name} can't be fit incrementally, as it has no "
+                "partial_fit method"
+            )
@@ -5,7 +5,7 @@ dataset-splitting schemes for cross validation.
 * :class:`.CrossValidationSplitter` - abstract base class for all splitters
 * :class:`.OutOfTimeSplitter` - out-of-time cross-val for timeseries
 * :class:`.RandomSplitter` - random split cross-validation
-* :class:`.StratifiedSplitter` - stratified cross-val by class
+* :class:`.StratifiedSplitter` - stratified cross-val by class or binned target
 * :class:`.TimeBinSplitter` - split using specific time bins
 """
 
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -59,3 +60,70 @@ class CrossValidationSplitter(ABC):
         y_val : pd.DataFrame
             Validation features for fold i
         """
+
+    def get_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold.
+
+        Splitters which can should override this, so that cross-validation
+        implementations can take each fold's rows from the dataset once
+        (instead of copying the DataFrames returned by :meth:`get_fold`).
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.
+
+        Returns
+        -------
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
+
+        Raises
+        ------
+        NotImplementedError
+            If the splitter only supports :meth:`get_fold`
+        """
+        raise NotImplementedError
+
+    def get_incremental_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold, with only the
+        training rows which weren't in the previous fold's training rows.
+
+        Splitters whose training sets only grow from fold to fold (e.g.
+        expanding-window time series splits) can override this, so that
+        models which can be warm-started only need to continue fitting on
+        the new rows each fold (see ``Sequential(incremental=True)``).
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.  Must be > 0.
+
+        Returns
+        -------
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i which weren't
+            in fold i-1
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
+
+        Raises
+        ------
+        NotImplementedError
+            If the splitter's folds can't be fit incrementally
+        """
+        raise NotImplementedError
@@ -1,5 +1,6 @@
 from typing import Tuple
 
+import numpy as np
 import pandas as pd
 
 from .cross_validation_splitter import CrossValidationSplitter
@@ -8,7 +9,12 @@ from .cross_validation_splitter import CrossValidationSplitter
 class OutOfTimeSplitter(CrossValidationSplitter):
     """Perform out-of-time cross validation
 
-    TODO: explain what that means
+    The data is sorted by time and divided into `n_folds` consecutive time
+    periods with (about) the same number of datapoints.  Each fold then
+    trains on all the periods before some period, and validates on that
+    period.  So the model is always validated on data from after the data it
+    was trained on, and the training window expands with each fold.
+    Datapoints with the same time are always in the same period.
 
     Parameters
     ----------
@@ -24,40 +30,132 @@ class OutOfTimeSplitter(CrossValidationSplitter):
     """
 
     def __init__(self, time_col: str, n_folds: int = 5, start_fold: int = 1):
+        if not 0 < start_fold < n_folds:
+            raise ValueError("start_fold must be between 1 and n_folds-1")
         self.time_col = time_col
         self.n_folds = n_folds
         self.start_fold = start_fold
+        self.order = None
+        self.bounds = None
 
-    def setup(self, df: pd.DataFrame) -> None:
+    def setup(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Set up the cross-validation
 
         Parameters
         ----------
-        df : pd.DataFrame
-            The entire dataset
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
         """
-        # TODO
+        times = X[self.time_col]
+        self.order = np.argsort(times.values, kind="stable")
+        sorted_times = times.iloc[self.order].reset_index(drop=True)
+
+        # Positions in the sorted data where each time period starts
+        ix = (np.arange(self.n_folds + 1) * X.shape[0]) // self.n_folds
+        self.bounds = np.append(
+            sorted_times.searchsorted(sorted_times.iloc[ix[:-1]]), X.shape[0]
+        )
 
     def get_n_folds(self):
-        return self.n_folds
+        """Get the number of folds
+
+        Returns
+        -------
+        n_folds : int
+            The number of folds
+        """
+        return self.n_folds - self.start_fold
 
     def get_fold(
-        self, df: pd.DataFrame, i: int
-    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
         """Get one fold of data.
 
         Parameters
         ----------
-        df : pd.DataFrame
-            The entire dataset
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
         i : int
             Index of the cross-validation fold to return.
 
         Returns
         -------
-        df_train : pd.DataFrame
-            Training dataset for fold i
-        df_val : pd.DataFrame
-            Validation dataset for fold i
+        x_train : pd.DataFrame
+            Training features for fold i
+        y_train : pd.DataFrame
+            Training target for fold i
+        x_val : pd.DataFrame
+            Validation features for fold i
+        y_val : pd.DataFrame
+            Validation features for fold i
         """
-        # TODO
+        ix_train, ix_val = self.get_fold_indices(X, y, i)
+        return (
+            X.iloc[ix_train, :],
+            y.iloc[ix_train],
+            X.iloc[ix_val, :],
+            y.iloc[ix_val],
+        )
+
+    def get_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.
+
+        Returns
+        -------
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
+        """
+        period = self.start_fold + i
+        return self.get_period_indices(0, period), self.get_period_indices(
+            period, period + 1
+        )
+
+    def get_incremental_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold, with only the
+        training rows which weren't in the previous fold's training rows.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.  Must be > 0.
+
+        Returns
+        -------
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i which weren't
+            in fold i-1
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
+        """
+        period = self.start_fold + i
+        return self.get_period_indices(
+            period - 1, period
+        ), self.get_period_indices(period, period + 1)
+
+    def get_period_indices(self, start: int, end: int) -> np.ndarray:
+        """Get the positions of the rows in some of the time periods, in the
+        order they are in the dataset"""
+        return np.sort(self.order[self.bounds[start] : self.bounds[end]])
@@ -72,18 +72,40 @@ class RandomSplitter(CrossValidationSplitter):
         y_val : pd.DataFrame
             Validation features for fold i
         """
-        ix_0 = int(i * self.n_per_fold)
-        if i + 1 == self.get_n_folds():
-            ix_1 = X.shape[0]
-        else:
-            ix_1 = int((i + 1) * self.n_per_fold)
-        val_mask = np.zeros(X.shape[0], bool)
-        val_mask[ix_0:ix_1] = True
-        ix_val = self.ix[val_mask]
-        ix_train = self.ix[~val_mask]
+        ix_train, ix_val = self.get_fold_indices(X, y, i)
         return (
             X.iloc[ix_train, :],
             y.iloc[ix_train],
             X.iloc[ix_val, :],
             y.iloc[ix_val],
         )
+
+    def get_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.
+
+        Returns
+        -------
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
+        """
+        ix_0 = int(i * self.n_per_fold)
+        if i + 1 == self.get_n_folds():
+            ix_1 = X.shape[0]
+        else:
+            ix_1 = int((i + 1) * self.n_per_fold)
+        ix_val = self.ix[ix_0:ix_1]
+        ix_train = np.concatenate([self.ix[:ix_0], self.ix[ix_1:]])
+        return ix_train, ix_val
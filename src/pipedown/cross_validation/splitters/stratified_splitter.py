@@ -1,5 +1,6 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .cross_validation_splitter import CrossValidationSplitter
@@ -8,53 +9,139 @@ from .cross_validation_splitter import CrossValidationSplitter
 class StratifiedSplitter(CrossValidationSplitter):
     """Perform stratified cross validation
 
+    Datapoints are grouped by stratum (in a random order within each
+    stratum), and dealt out to the folds in turn, so that each stratum is
+    split as evenly as possible between the folds.  Missing values are
+    treated as their own stratum.
+
     Parameters
     ----------
-    stratify_on : str
-        Name of the column / feature on which to stratify
+    stratify_on : Optional[str]
+        Name of the column / feature on which to stratify.  Default is to
+        stratify on the target.
     n_folds : int
         Total number of folds for cross-validation.  Default = 5
     random_seed : int
         Random seed to use for the random split.  Default = 12345
+    n_bins : Optional[int]
+        If set, stratify on quantile bins of the values instead of on the
+        values themselves (e.g. for a continuous target), using this many
+        bins.  Default is to use the values.
     """
 
     def __init__(
-        self, stratify_on: str, n_folds: int = 5, random_seed: int = 12345
+        self,
+        stratify_on: Optional[str] = None,
+        n_folds: int = 5,
+        random_seed: int = 12345,
+        n_bins: Optional[int] = None,
     ):
         self.stratify_on = stratify_on
         self.n_folds = n_folds
         self.random_seed = random_seed
+        self.n_bins = n_bins
+        self.train_ix = None
+        self.val_ix = None
 
-    def setup(self, df: pd.DataFrame) -> None:
+    def setup(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Set up the cross-validation
 
         Parameters
         ----------
-        df : pd.DataFrame
-            The entire dataset
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
         """
-        # TODO
+        values = y if self.stratify_on is None else X[self.stratify_on]
+        codes = self.get_strata(values)
+
+        # Group datapoints by stratum, in a random order within each, and
+        # assign them to folds round-robin
+        rng = np.random.default_rng(self.random_seed)
+        ix = rng.permutation(values.shape[0])
+        ix = ix[np.argsort(codes[ix], kind="stable")]
+        folds = np.empty(values.shape[0], dtype=np.int64)
+        folds[ix] = np.arange(values.shape[0]) % self.n_folds
+
+        # Positions of the training and validation data for each fold
+        self.train_ix = []
+        self.val_ix = []
+        for i in range(self.n_folds):
+            in_fold = folds == i
+            self.train_ix.append(np.flatnonzero(~in_fold))
+            self.val_ix.append(np.flatnonzero(in_fold))
+
+    def get_strata(self, values: pd.Series) -> np.ndarray:
+        """Get an integer code for the stratum of each datapoint"""
+        if self.n_bins is None:
+            return pd.factorize(values)[0]
+        ranks = values.rank(method="first")
+        codes = pd.qcut(ranks, self.n_bins, labels=False).values
+        return np.where(np.isnan(codes), -1, codes).astype(np.int64)
 
     def get_n_folds(self):
+        """Get the number of folds
+
+        Returns
+        -------
+        n_folds : int
+            The number of folds
+        """
         return self.n_folds
 
     def get_fold(
-        self, df: pd.DataFrame, i: int
-    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]:
         """Get one fold of data.
 
         Parameters
         ----------
-        df : pd.DataFrame
-            The entire dataset
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.
+
+        Returns
+        -------
+        x_train : pd.DataFrame
+            Training features for fold i
+        y_train : pd.DataFrame
+            Training target for fold i
+        x_val : pd.DataFrame
+            Validation features for fold i
+        y_val : pd.DataFrame
+            Validation features for fold i
+        """
+        ix_train, ix_val = self.get_fold_indices(X, y, i)
+        return (
+            X.iloc[ix_train, :],
+            y.iloc[ix_train],
+            X.iloc[ix_val, :],
+            y.iloc[ix_val],
+        )
+
+    def get_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
         i : int
             Index of the cross-validation fold to return.
 
         Returns
         -------
-        df_train : pd.DataFrame
-            Training dataset for fold i
-        df_val : pd.DataFrame
-            Validation dataset for fold i
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
         """
-        # TODO
+        return self.train_ix[i], self.val_ix[i]
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .cross_validation_splitter import CrossValidationSplitter
@@ -9,6 +10,11 @@ from .cross_validation_splitter import CrossValidationSplitter
 class TimeBinSplitter(CrossValidationSplitter):
     """Perform cross validation split using specific time bins
 
+    Datapoints are in a bin if their time is strictly between the bin's
+    start and end times.  The time column is sorted once (in :meth:`setup`),
+    so that finding the datapoints in each fold only takes time proportional
+    to the size of that fold, rather than the size of the dataset.
+
     Parameters
     ----------
     time_col : str
@@ -25,6 +31,8 @@ class TimeBinSplitter(CrossValidationSplitter):
     ):
         self.time_col = time_col
         self.time_bins = time_bins
+        self.order = None
+        self.sorted_times = None
 
     def setup(self, X: pd.DataFrame, y: pd.Series) -> None:
         """Set up the cross-validation
@@ -36,6 +44,9 @@ class TimeBinSplitter(CrossValidationSplitter):
         y : pd.Series
             Target for the entire dataset
         """
+        times = X[self.time_col]
+        self.order = np.argsort(times.values, kind="stable")
+        self.sorted_times = times.iloc[self.order].reset_index(drop=True)
 
     def get_n_folds(self):
         """Get the number of folds
@@ -72,10 +83,41 @@ class TimeBinSplitter(CrossValidationSplitter):
         y_val : pd.DataFrame
             Validation features for fold i
         """
-        train_ix = (X[self.time_col] > self.time_bins[i][0]) & (
-            X[self.time_col] < self.time_bins[i][1]
-        )
-        val_ix = (X[self.time_col] > self.time_bins[i][2]) & (
-            X[self.time_col] < self.time_bins[i][3]
+        ix_train, ix_val = self.get_fold_indices(X, y, i)
+        return (
+            X.iloc[ix_train, :],
+            y.iloc[ix_train],
+            X.iloc[ix_val, :],
+            y.iloc[ix_val],
         )
-        return X[train_ix], y[train_ix], X[val_ix], y[val_ix]
+
+    def get_fold_indices(
+        self, X: pd.DataFrame, y: pd.Series, i: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the integer positions of the rows in one fold.
+
+        Parameters
+        ----------
+        X : pd.DataFrame
+            Features for the entire dataset
+        y : pd.Series
+            Target for the entire dataset
+        i : int
+            Index of the cross-validation fold to return.
+
+        Returns
+        -------
+        ix_train : np.ndarray
+            Integer positions of the training rows for fold i
+        ix_val : np.ndarray
+            Integer positions of the validation rows for fold i
+        """
+        t0, t1, t2, t3 = self.time_bins[i]
+        return self.get_bin_indices(t0, t1), self.get_bin_indices(t2, t3)
+
+    def get_bin_indices(self, start: datetime, end: datetime) -> np.ndarray:
+        """Get the positions of the rows strictly between two times, in the
+        order they are in the dataset"""
+        ix_0 = self.sorted_times.searchsorted(start, side="right")
+        ix_1 = self.sorted_times.searchsorted(end, side="left")
+        return np.sort(self.order[ix_0:ix_1])
@@ -1,2 +1,5 @@
-from .dag import DAG
+from .batching import MicroBatcher
+from .dag import DAG, InferenceDAG
 from .io import load_dag, save_dag
+from .memoization import MemoStore
+from .profiling import Profiler
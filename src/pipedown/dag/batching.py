@@ -0,0 +1,194 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent import futures
+from typing import Any, List, Optional, Union
+
+import pandas as pd
+
+
+class MicroBatcher:
+    """Runs a DAG on batches of records collected from concurrent requests
+
+    Running a DAG on a single record has a large fixed overhead (creating
+    DataFrames, calling each node, model prediction, etc.).  When many
+    requests are being served at once, it's much faster to collect the
+    records into batches and run the DAG once per batch.  Each request waits
+    until either ``max_batch_size`` records have been collected, or
+    ``max_wait`` seconds have passed since the first record in the batch was
+    submitted, and then gets its own row of the outputs.
+
+    Can be used from multiple threads, or from asyncio:
+
+    .. code-block:: python3
+
+        batcher = MicroBatcher(my_dag, "model", max_wait=0.005)
+
+        # From a thread
+        y_pred, _ = batcher.run({"a": 1, "b": 2})
+
+        # From a coroutine
+        y_pred, _ = await batcher.run_async({"a": 1, "b": 2})
+
+    The outputs for each record are the same as calling
+    ``dag.run({input_name: record}, outputs)``: e.g. a length-1 Series of
+    predictions for a model node.  Rows are matched to records by the index
+    which the Input node creates, so nodes may filter out rows (in which case
+    that record's outputs are empty), but mustn't reset the index.
+
+    Parameters
+    ----------
+    dag : pipedown.dag.DAG
+        The fitted DAG to run.
+    outputs : Union[str, List[str]]
+        Output node(s) to get.
+    input_name : str
+        Name of the node to pass the records to.  Default is "input".
+    max_batch_size : int
+        Maximum number of records to run in one batch.  Default is 64.
+    max_wait : float
+        Maximum time to wait for more records before running a batch, in
+        seconds.  Default is 0.005.
+    """
+
+    def __init__(
+        self,
+        dag,
+        outputs: Union[str, List[str]] = [],
+        input_name: str = "input",
+        max_batch_size: int = 64,
+        max_wait: float = 0.005,
+    ):
+        self.dag = dag
+        self.outputs = outputs
+        self.input_name = input_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run_batches, daemon=True)
+        self._thread.start()
+
+    def submit(self, record: Any) -> futures.Future:
+        """Add a record to the next batch
+
+        Parameters
+        ----------
+        record : Any
+            A single record (e.g. a dict of feature values).
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Future whose result will be the outputs for the record.
+        """
+        future = futures.Future()
+        self._queue.put((record, future))
+        return future
+
+    def run(self, record: Any) -> Any:
+        """Run the DAG on a record (in a batch), waiting for the outputs"""
+        return self.submit(record).result()
+
+    async def run_async(self, record: Any) -> Any:
+        """Run the DAG on a record (in a batch), awaiting the outputs"""
+        return await asyncio.wrap_future(self.submit(record))
+
+    def close(self) -> None:
+        """Run any records which are waiting, and stop the batching thread"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self) -> "MicroBatcher":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _run_batches(self) -> None:
+        """Collect records into batches and run them until closed"""
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    timeout = max(deadline - time.monotonic(), 0)
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._run_batch(batch)
+                    return
+                batch.append(request)
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List) -> None:
+        """Run the DAG on a batch of records and scatter the outputs"""
+
+        # Drop records whose futures were cancelled (e.g. because a coroutine
+        # awaiting them timed out).  The rest can't be cancelled after this.
+        batch = [r for r in batch if r[1].set_running_or_notify_cancel()]
+        if len(batch) == 0:
+            return
+        records = [record for record, _ in batch]
+        try:
+            outputs = self.dag.run({self.input_name: records}, self.outputs)
+            rows = split_rows(outputs, len(batch))
+        except Exception as error:
+            for _, future in batch:
+                set_future(future, exception=error)
+            return
+        for (_, future), row in zip(batch, rows):
+            set_future(future, result=row)
+
+
+def set_future(
+    future: futures.Future,
+    result: Any = None,
+    exception: Optional[BaseException] = None,
+) -> None:
+    """Set a future's result (or exception), unless it's already done, so
+    that one bad request can't stop the batching thread"""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except futures.InvalidStateError:
+        pass
+
+
+def split_rows(data: Any, n: int) -> List[Any]:
+    """Split the outputs of running a DAG on n records into per-record outputs
+
+    Parameters
+    ----------
+    data : Any
+        The outputs of the DAG.  DataFrames and Series (including those in
+        tuples or dicts) are split by their index, which should be the
+        position of the record in the batch.  Anything else is shared.
+    n : int
+        Number of records in the batch.
+
+    Returns
+    -------
+    List[Any]
+        The outputs for each record.
+    """
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        if data.index.equals(pd.RangeIndex(n)):  # one row per record
+            positions = [slice(i, i + 1) for i in range(n)]
+        else:
+            groups = data.groupby(level=0, sort=False).indices
+            positions = [groups.get(i, []) for i in range(n)]
+        return [data.iloc[p].reset_index(drop=True) for p in positions]
+    elif isinstance(data, tuple):
+        return list(zip(*(split_rows(e, n) for e in data)))
+    elif isinstance(data, dict):
+        split = {k: split_rows(v, n) for k, v in data.items()}
+        return [{k: v[i] for k, v in split.items()} for i in range(n)]
+    else:
+        return [data] * n
@@ -1,6 +1,17 @@
 from abc import abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from copy import copy
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
 
 from pipedown.cross_validation.implementations import (
@@ -11,9 +22,17 @@ from pipedown.cross_validation.splitters import (
     CrossValidationSplitter,
     RandomSplitter,
 )
-from pipedown.dag.dag_tools import run_dag
+from pipedown.dag.dag_tools import ExecutionPlan, fit_and_run_plans, run_plan
+from pipedown.dag.executors import Executor
 from pipedown.dag.io import save_dag
-from pipedown.nodes.base import Cache, Metric, Model, Node, Primary
+from pipedown.dag.memoization import MemoStore
+from pipedown.dag.profiling import Profiler
+from pipedown.dag.search import (
+    check_candidates,
+    get_best,
+    successive_halving,
+)
+from pipedown.nodes.base import Cache, Input, Metric, Model, Node, Primary
 from pipedown.visualization.dag_viewer import get_dag_viewer_html
 
 
@@ -29,10 +48,19 @@ class DAG:
         """Get the edges between nodes in the DAG"""
 
     def fit(
-        self, inputs: Dict[str, Any] = {}, outputs: Union[str, List[str]] = []
+        self,
+        inputs: Dict[str, Any] = {},
+        outputs: Union[str, List[str]] = [],
+        executor: Optional[Executor] = None,
+        memo: Optional[MemoStore] = None,
+        profiler: Optional[Profiler] = None,
+        warm_start: bool = False,
     ) -> None:
         """Fit part of or the whole pipeline
 
+        The output nodes are only fit, and not run (e.g. models don't predict
+        on the training data).  Use :meth:`fit_run` to also get the outputs.
+
         Parameters
         ----------
         inputs : Dict[str, Any]
@@ -40,18 +68,46 @@ class DAG:
             should be the data to use as inputs to those nodes.
         outputs : Union[str, List[str]]
             List of output nodes.
+        executor : Optional[Executor]
+            How to schedule running the nodes.  Default is to run them one at
+            a time.  Use :class:`pipedown.dag.executors.ThreadPool` or
+            :class:`pipedown.dag.executors.ProcessPool` to run independent
+            nodes in parallel.
+        memo : Optional[MemoStore]
+            Store of memoized node outputs.  Nodes whose code, parameters
+            and inputs haven't changed since they were last run with the
+            same store are loaded from it instead of being run.  Default is
+            not to memoize.
+        profiler : Optional[Profiler]
+            Profiler to record the time, memory, and data sizes of each node
+            which is run.  Use :meth:`Profiler.get_report` to get them.
+        warm_start : bool
+            Whether nodes which have a ``partial_fit`` method should continue
+            fitting from their current state on the new data (by calling it
+            instead of ``fit``), e.g. to update models incrementally.  Nodes
+            without one are fit as usual.  Memoization isn't used when
+            warm-starting.  Default is False.
 
         Returns
         -------
         None
         """
-        self.instantiate_dag("train")
-        if len(outputs) == 0:  # default outputs are nodes w/o children
-            outputs = self.get_default_outputs("train")
-        run_dag(inputs, outputs, "train", self.get_nodes())
+        plan = self.get_plan(
+            "train",
+            inputs,
+            outputs,
+            return_outputs=False,
+            warm_start=warm_start,
+        )
+        run_plan(plan, inputs, executor, memo, profiler)
 
     def run(
-        self, inputs: Dict[str, Any] = {}, outputs: Union[str, List[str]] = []
+        self,
+        inputs: Dict[str, Any] = {},
+        outputs: Union[str, List[str]] = [],
+        executor: Optional[Executor] = None,
+        memo: Optional[MemoStore] = None,
+        profiler: Optional[Profiler] = None,
     ):
         """Run part of or the whole pipeline
 
@@ -62,6 +118,19 @@ class DAG:
             should be the data to use as inputs to those nodes.
         outputs : Union[str, List[str]]
             List of output nodes.
+        executor : Optional[Executor]
+            How to schedule running the nodes.  Default is to run them one at
+            a time.  Use :class:`pipedown.dag.executors.ThreadPool` or
+            :class:`pipedown.dag.executors.ProcessPool` to run independent
+            nodes in parallel.
+        memo : Optional[MemoStore]
+            Store of memoized node outputs.  Nodes whose code, parameters
+            and inputs haven't changed since they were last run with the
+            same store are loaded from it instead of being run.  Default is
+            not to memoize.
+        profiler : Optional[Profiler]
+            Profiler to record the time, memory, and data sizes of each node
+            which is run.  Use :meth:`Profiler.get_report` to get them.
 
         Returns
         -------
@@ -71,13 +140,16 @@ class DAG:
             returns a Dict whose keys are output node names, and values are the
             output data for that node.
         """
-        self.instantiate_dag("test")
-        if len(outputs) == 0:  # default outputs are nodes w/o children
-            outputs = self.get_default_outputs("train")
-        return run_dag(inputs, outputs, "test", self.get_nodes())
+        plan = self.get_plan("test", inputs, outputs)
+        return run_plan(plan, inputs, executor, memo, profiler)
 
     def fit_run(
-        self, inputs: Dict[str, Any] = {}, outputs: Union[str, List[str]] = []
+        self,
+        inputs: Dict[str, Any] = {},
+        outputs: Union[str, List[str]] = [],
+        executor: Optional[Executor] = None,
+        memo: Optional[MemoStore] = None,
+        profiler: Optional[Profiler] = None,
     ) -> Union[Any, Dict[str, Any]]:
         """Fit and run part of or the whole pipeline
 
@@ -88,6 +160,19 @@ class DAG:
             should be the data to use as inputs to those nodes.
         outputs : Union[str, List[str]]
             List of output nodes.
+        executor : Optional[Executor]
+            How to schedule running the nodes.  Default is to run them one at
+            a time.  Use :class:`pipedown.dag.executors.ThreadPool` or
+            :class:`pipedown.dag.executors.ProcessPool` to run independent
+            nodes in parallel.
+        memo : Optional[MemoStore]
+            Store of memoized node outputs.  Nodes whose code, parameters
+            and inputs haven't changed since they were last run with the
+            same store are loaded from it instead of being run.  Default is
+            not to memoize.
+        profiler : Optional[Profiler]
+            Profiler to record the time, memory, and data sizes of each node
+            which is run.  Use :meth:`Profiler.get_report` to get them.
 
         Returns
         -------
@@ -97,10 +182,205 @@ class DAG:
             returns a Dict whose keys are output node names, and values are the
             output data for that node.
         """
-        self.instantiate_dag("train")
-        if len(outputs) == 0:  # default outputs are nodes w/o children
-            outputs = self.get_default_outputs("train")
-        return run_dag(inputs, outputs, "train", self.get_nodes())
+        plan = self.get_plan("train", inputs, outputs)
+        return run_plan(plan, inputs, executor, memo, profiler)
+
+    def fit_and_run(
+        self,
+        fit_inputs: Dict[str, Any],
+        run_inputs: Dict[str, Any],
+        outputs: Union[str, List[str]] = [],
+        profiler: Optional[Profiler] = None,
+        warm_start: bool = False,
+    ) -> Union[Any, Dict[str, Any]]:
+        """Fit the pipeline on some data and run it on other data
+
+        Gives the same results as calling :meth:`fit` on `fit_inputs` and
+        then :meth:`run` on `run_inputs`, but goes through the DAG only once:
+        each node is fit, and then immediately run on both sets of data.  So
+        intermediate data from fitting is released sooner.  This is used
+        when cross-validating, to fit on the training data and run on the
+        validation data for each fold.
+
+        Parameters
+        ----------
+        fit_inputs : Dict[str, Any]
+            Dict of the input data to fit on.
+        run_inputs : Dict[str, Any]
+            Dict of the input data to run on.  Must have the same keys as
+            `fit_inputs`.
+        outputs : Union[str, List[str]]
+            List of output nodes.
+        profiler : Optional[Profiler]
+            Profiler to record the time, memory, and data sizes of each node
+            which is run.
+        warm_start : bool
+            Whether nodes which have a ``partial_fit`` method should continue
+            fitting from their current state (see :meth:`fit`).
+
+        Returns
+        -------
+        output_data : Union[Any, Dict[str, Any]]
+            The output data from running on `run_inputs`, in the same form as
+            :meth:`run`.
+        """
+        fit_plan = self.get_plan(
+            "train", fit_inputs, outputs, False, warm_start=warm_start
+        )
+        plan = self.get_plan("test", run_inputs, outputs)
+
+        # Fit and then run if the nodes aren't the same in each mode
+        if [n.name for n in fit_plan.eval_order] != [
+            n.name for n in plan.eval_order
+        ]:
+            run_plan(fit_plan, fit_inputs, profiler=profiler)
+            return run_plan(plan, run_inputs, profiler=profiler)
+
+        return fit_and_run_plans(
+            fit_plan, fit_inputs, plan, run_inputs, profiler
+        )
+
+    def run_stream(
+        self,
+        chunks: Iterable[Any],
+        outputs: Union[str, List[str]] = [],
+        input_name: Optional[str] = None,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[Union[Any, Dict[str, Any]]]:
+        """Run the pipeline on chunks of data, one chunk at a time
+
+        Only one chunk of data is in memory at a time, so this can be used to
+        run the pipeline on more data than would fit in memory, e.g.
+
+        .. code-block:: python3
+
+            chunks = pd.read_csv("big.csv", chunksize=100000)
+            for predictions in my_dag.run_stream(chunks, "model"):
+                predictions[0].to_csv("predictions.csv", mode="a")
+
+        All the nodes between the input and the outputs must process rows
+        independently (see :attr:`pipedown.nodes.base.Node.streamable`).
+
+        Parameters
+        ----------
+        chunks : Iterable[Any]
+            Chunks of input data (e.g. DataFrames) to pass to the input node.
+        outputs : Union[str, List[str]]
+            List of output nodes.
+        input_name : Optional[str]
+            Name of the node to pass the chunks to.  Default is the DAG's
+            only :class:`pipedown.nodes.base.Input` node.
+        executor : Optional[Executor]
+            How to schedule running the nodes.  Default is to run them one at
+            a time.
+
+        Returns
+        -------
+        Iterator[Union[Any, Dict[str, Any]]]
+            Iterator over the outputs for each chunk, in the same form as
+            :meth:`run`.  Each chunk is run when its outputs are requested.
+
+        Raises
+        ------
+        ValueError
+            If any of the nodes which would be run can't process chunks of
+            data independently (e.g. Collate, which sorts all its data).
+        """
+
+        # Get the node to pass the chunks to
+        if input_name is None:
+            self.instantiate_dag("test")
+            input_nodes = self.get_nodes(Input)
+            if len(input_nodes) != 1:
+                raise ValueError(
+                    "input_name must be specified for DAGs which don't have "
+                    "exactly one Input node"
+                )
+            input_name = input_nodes[0].name
+
+        # Check all the nodes can be run on chunks before running any
+        plan = self.get_plan("test", {input_name: None}, outputs)
+        for node in plan.eval_order:
+            if not node.streamable and node.name != input_name:
+                raise ValueError(
+                    f"Node {node.name} ({type(node).__name__}) can't be run "
+                    "on chunks of data"
+                )
+
+        # Run each chunk (lazily, as the outputs are consumed)
+        return (run_plan(plan, {input_name: c}, executor) for c in chunks)
+
+    def get_plan(
+        self,
+        mode: str,
+        inputs: Dict[str, Any] = {},
+        outputs: Union[str, List[str]] = [],
+        return_outputs: bool = True,
+        warm_start: bool = False,
+    ) -> ExecutionPlan:
+        """Get the execution plan for running part of the pipeline
+
+        Plans are compiled once for each combination of mode, input node
+        names, output node names, whether the outputs are returned, whether
+        to warm-start, and which caches are full, and then re-used until the
+        nodes or edges of the DAG change.
+
+        Parameters
+        ----------
+        mode : str {'train' or 'test'}
+            Whether the plan is for fitting ('train') or running ('test').
+        inputs : Dict[str, Any]
+            Dict of the input data (only the keys are used).
+        outputs : Union[str, List[str]]
+            List of output nodes.
+        return_outputs : bool
+            Whether the outputs of the output nodes will be used.  If False,
+            nodes whose outputs aren't needed are just fit in train mode.
+        warm_start : bool
+            Whether nodes which have a ``partial_fit`` method should continue
+            fitting from their current state, in train mode.
+
+        Returns
+        -------
+        ExecutionPlan
+            The plan for running the DAG between the inputs and outputs.
+        """
+
+        # Forget any compiled plans if the nodes or edges have changed
+        edges = self.edges()
+        if (
+            not hasattr(self, "_plans")
+            or self._plan_nodes is not self.get_node_dict()
+            or self._plan_edges != edges
+        ):
+            self._plans = {}
+            self._plan_nodes = self.get_node_dict()
+            self._plan_edges = edges
+
+        # Compile a new plan if needed
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        key = (
+            mode,
+            frozenset(inputs),
+            tuple(outputs),
+            return_outputs,
+            warm_start,
+            tuple(c.is_cached() for c in self.get_nodes(Cache)),
+        )
+        if key not in self._plans:
+            self.instantiate_dag(mode)
+            if len(outputs) == 0:  # default outputs are nodes w/o children
+                outputs = self.get_default_outputs(mode)
+            self._plans[key] = ExecutionPlan(
+                inputs,
+                outputs,
+                mode,
+                self.get_nodes(),
+                return_outputs,
+                warm_start,
+            )
+        return self._plans[key]
 
     def instantiate_dag(self, mode: str):
         """Create nodes and connections between them"""
@@ -176,6 +456,26 @@ class DAG:
         """Get a node in the pipeline by its name"""
         return self.get_node_dict()[node_name]
 
+    def replace_nodes(self, replacements: Dict[str, Node]):
+        """Replace some of the nodes in the DAG
+
+        Parameters
+        ----------
+        replacements : Dict[str, Node]
+            Dict mapping the names of the nodes to replace to the nodes to
+            replace them with (which are used as-is, not copied).
+        """
+        nodes = copy(self.get_node_dict())
+        for name, node in replacements.items():
+            if name not in nodes:
+                raise ValueError(f"No node named {name} in the DAG")
+            node.name = name
+            node.reset_connections()
+            nodes[name] = node
+        self._nodes = nodes
+        self._plans = {}
+        self.instantiate_dag("train")
+
     def get_primary(self) -> Node:
         """Get the primary node if it exists in the DAG"""
         primaries = self.get_nodes(Primary)
@@ -202,6 +502,7 @@ class DAG:
         cv_implementation: CrossValidationImplementation = Sequential(),
         y_true_name: str = "y_true",
         verbose=False,
+        profiler: Optional[Profiler] = None,
     ):
         """Make cross-validated predictions using the pipeline
 
@@ -222,6 +523,8 @@ class DAG:
             Name for the column containing the true predictions
         verbose : bool
             Whether to show fold times
+        profiler : Optional[Profiler]
+            Profiler to record statistics and a timeline of each fold.
 
         Returns
         -------
@@ -242,49 +545,26 @@ class DAG:
             cv_on = self.get_primary().name
 
         # Run the pipeline up to the node to cross validate on
-        X, y, original_index = self.run_to_cv_node(inputs, cv_on)
+        X, y, original_index = self.run_to_cv_node(inputs, cv_on, profiler)
 
         # Run the cross-validation
         predictions = cv_implementation.run(
-            self, cv_on, X, y, outputs, cv_splitter, verbose=verbose
+            self,
+            cv_on,
+            X,
+            y,
+            outputs,
+            cv_splitter,
+            verbose=verbose,
+            profiler=profiler,
         )
 
         # Return the collated predictions
-        if isinstance(outputs, (list, set)) and len(outputs) > 1:
-
-            # Get true values
-            y_true = pd.concat([p[outputs[0]][1] for p in predictions])
-            y_true.sort_index(inplace=True)
-            y_true.index = original_index
-            y_true.rename(y_true_name, inplace=True)
-
-            # Get predicted values
-            y_pred = [None] * len(outputs)
-            for i, output in enumerate(outputs):
-                y_pred[i] = pd.concat([p[output][0] for p in predictions])
-                y_pred[i].sort_index(inplace=True)
-                y_pred[i].index = original_index
-                y_pred[i].rename(output, inplace=True)
-
-            # Return dataframe with true + predicted target values
-            return pd.concat([y_true] + y_pred, axis=1)
-
-        else:  # single model
-
-            # Get true values
-            y_true = pd.concat([p[1] for p in predictions])
-            y_true.sort_index(inplace=True)
-            y_true.index = original_index
-            y_true.rename(y_true_name, inplace=True)
-
-            # Get predicted values
-            y_pred = pd.concat([p[0] for p in predictions])
-            y_pred.sort_index(inplace=True)
-            y_pred.index = original_index
-            y_pred.rename(outputs[0], inplace=True)
-
-            # Return dataframe with true + predicted target values
-            return pd.concat([y_true, y_pred], axis=1)
+        if len(outputs) == 1:
+            predictions = [{outputs[0]: p} for p in predictions]
+        return collate_cv_predictions(
+            predictions, outputs, original_index, y_true_name
+        )
 
     def cv_metric(
         self,
@@ -294,6 +574,7 @@ class DAG:
         cv_splitter: CrossValidationSplitter = RandomSplitter(),
         cv_implementation: CrossValidationImplementation = Sequential(),
         verbose=False,
+        profiler: Optional[Profiler] = None,
     ):
         """Compute metric(s) from cross-validated predictions
 
@@ -312,6 +593,8 @@ class DAG:
             Cross-validation implementation to use.
         verbose : bool
             Whether to show fold times and metrics
+        profiler : Optional[Profiler]
+            Profiler to record statistics and a timeline of each fold.
 
         Returns
         -------
@@ -353,35 +636,243 @@ class DAG:
             cv_on = self.get_primary().name
 
         # Run the pipeline up to the node to cross validate on
-        X, y, _ = self.run_to_cv_node(inputs, cv_on)
+        X, y, _ = self.run_to_cv_node(inputs, cv_on, profiler)
 
         # Run the cross-validation
         metrics = cv_implementation.run(
-            self, cv_on, X, y, outputs, cv_splitter, verbose=verbose
+            self,
+            cv_on,
+            X,
+            y,
+            outputs,
+            cv_splitter,
+            verbose=verbose,
+            profiler=profiler,
         )
 
         # Convert the metrics into a dataframe
         if len(outputs) == 1:  # only a single output, metrics is a list
             metrics = [{outputs[0]: m} for m in metrics]
-        metric_list = []
-        for output in outputs:
-            m_node = self.get_node(output)
-            for i, metric_set in enumerate(metrics):
-                metric_list.append(
-                    {
-                        "model_name": m_node.get_parents()[0].name,
-                        "metric_name": m_node.get_metric_name(),
-                        "fold": i,
-                        "metric_value": metric_set[output],
-                    }
-                )
+        return collate_cv_metrics(self, metrics, outputs)
 
-        # Return the metrics as a dataframe
-        return pd.DataFrame.from_records(metric_list)
+    def cv_evaluate(
+        self,
+        inputs: Dict[str, Any] = {},
+        models: Union[str, List[str]] = [],
+        metrics: Union[str, List[str]] = [],
+        cv_on: Optional[str] = None,
+        cv_splitter: CrossValidationSplitter = RandomSplitter(),
+        cv_implementation: CrossValidationImplementation = Sequential(),
+        y_true_name: str = "y_true",
+        verbose=False,
+        profiler: Optional[Profiler] = None,
+        return_node_states: bool = False,
+    ) -> Union[
+        Tuple[pd.DataFrame, pd.DataFrame],
+        Tuple[pd.DataFrame, pd.DataFrame, List[Dict[str, Dict[str, Any]]]],
+    ]:
+        """Get both cross-validated predictions and metrics, from a single
+        cross-validation
+
+        Gives the same results as :meth:`cv_predict` and :meth:`cv_metric`,
+        but only runs the pipeline up to `cv_on`, and fits the nodes on each
+        fold, once.  To get the time each node took on each fold, pass a
+        `profiler`.
 
-    def run_to_cv_node(self, inputs, cv_on):
+        Parameters
+        ----------
+        inputs : Dict[str, Any]
+            Input data to use, if any.
+        models : Union[str, List[str]]
+            Names of the model nodes from which to get predictions.  Default
+            is all the Model nodes.
+        metrics : Union[str, List[str]]
+            Names of the metric nodes to evaluate.  Default is all the Metric
+            nodes.
+        cv_on : Optional[str]
+            Node on which to cross-validate.  By default uses the Primary.
+        cv_splitter : CrossValidationSplitter object
+            Cross-validation scheme to use.
+        cv_implementation : CrossValidationImplementation object
+            Cross-validation implementation to use.
+        y_true_name : str
+            Name for the column containing the true predictions
+        verbose : bool
+            Whether to show fold times
+        profiler : Optional[Profiler]
+            Profiler to record statistics and a timeline of each fold.
+        return_node_states : bool
+            Whether to also return the state of each node downstream of
+            `cv_on` after it was fit on each fold.
+
+        Returns
+        -------
+        predictions : pd.DataFrame
+            Cross-validated predictions, as returned by :meth:`cv_predict`.
+        metrics : pd.DataFrame
+            Cross-validated metrics, as returned by :meth:`cv_metric`.
+        node_states : List[Dict[str, Dict[str, Any]]]
+            Only returned if `return_node_states`.  For each fold, a dict
+            mapping the names of the nodes downstream of `cv_on` to their
+            attributes after being fit on that fold.
+        """
+
+        # Default is to run all models and metrics in the pipeline
+        if isinstance(models, str):
+            models = [models]
+        if len(models) == 0:
+            models = [n.name for n in self.get_nodes(Model)]
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        if len(metrics) == 0:
+            metrics = [n.name for n in self.get_nodes(Metric)]
+        outputs = models + metrics
+
+        # Cross validate on the outputs of the primary if none specified
+        if cv_on is None:
+            cv_on = self.get_primary().name
+
+        # Run the pipeline up to the node to cross validate on
+        X, y, original_index = self.run_to_cv_node(inputs, cv_on, profiler)
+
+        # Run the cross-validation, once for both predictions and metrics
+        results = cv_implementation.run(
+            self,
+            cv_on,
+            X,
+            y,
+            outputs,
+            cv_splitter,
+            verbose=verbose,
+            profiler=profiler,
+            return_node_states=return_node_states,
+        )
+        if return_node_states:
+            results, node_states = zip(*results)
+        if len(outputs) == 1:
+            results = [{outputs[0]: r} for r in results]
+
+        # Collate the predictions and metrics
+        predictions = collate_cv_predictions(
+            results, models, original_index, y_true_name
+        )
+        metric_values = collate_cv_metrics(self, results, metrics)
+        if return_node_states:
+            return predictions, metric_values, list(node_states)
+        return predictions, metric_values
+
+    def cv_search(
+        self,
+        candidates: List[Dict[str, Node]],
+        inputs: Dict[str, Any] = {},
+        metric: Optional[str] = None,
+        cv_on: Optional[str] = None,
+        cv_splitter: CrossValidationSplitter = RandomSplitter(),
+        cv_implementation: CrossValidationImplementation = Sequential(),
+        greater_is_better: bool = False,
+        reduction_factor: int = 3,
+        min_rows: int = 100,
+        max_workers: int = 1,
+        random_seed: int = 12345,
+        verbose: bool = False,
+    ) -> Tuple[Dict[str, Node], pd.DataFrame]:
+        """Find the best of several versions of the pipeline, by
+        cross-validating them with successive halving
+
+        Each candidate is a dict mapping the names of nodes to replace to the
+        nodes to replace them with (e.g. models with different
+        hyperparameters).  The pipeline is only run up to `cv_on` once, and
+        that data is used to cross-validate all the candidates.  So only
+        nodes downstream of `cv_on` can be replaced.
+
+        In the first round, all the candidates are cross-validated on a
+        random subset of the rows, and the best ``1/reduction_factor`` of
+        them are kept.  Each round uses ``reduction_factor`` times as many
+        rows as the last, and the last round uses all the rows.  So poor
+        candidates are dropped after only being cross-validated on a small
+        amount of data.
+
+        Parameters
+        ----------
+        candidates : List[Dict[str, Node]]
+            The candidates: dicts of node names and the nodes to replace them
+            with.  The nodes in this pipeline aren't changed.
+        inputs : Dict[str, Any]
+            Input data to use, if any.
+        metric : Optional[str]
+            Name of the metric node by which to compare candidates.  Default
+            is the first Metric node.
+        cv_on : Optional[str]
+            Node on which to cross-validate.  By default uses the Primary.
+        cv_splitter : CrossValidationSplitter object
+            Cross-validation scheme to use.
+        cv_implementation : CrossValidationImplementation object
+            Cross-validation implementation to use.
+        greater_is_better : bool
+            Whether greater values of the metric are better.  Default is
+            False (e.g. for errors).
+        reduction_factor : int
+            Factor by which the number of candidates is reduced, and the
+            number of rows is increased, each round.  Default = 3
+        min_rows : int
+            Minimum number of rows to cross-validate on.  Default = 100
+        max_workers : int
+            Number of candidates to cross-validate at the same time, in
+            separate processes.  Default = 1 (cross-validate them one at a
+            time in this process).
+        random_seed : int
+            Random seed for choosing the rows to use in each round.
+        verbose : bool
+            Whether to print the progress after each round
+
+        Returns
+        -------
+        best : Dict[str, Node]
+            The best candidate
+        results : pd.DataFrame
+            The mean of the metric over the folds for each candidate
+            evaluated in each round.  Contains the following columns:
+
+            * candidate: index of the candidate in `candidates`
+            * rung: the round
+            * n_rows: number of rows cross-validated on
+            * metric_value: mean value of the metric over the folds
+        """
+
+        # Compare by the first metric if none specified
+        if metric is None:
+            metric = self.get_nodes(Metric)[0].name
+
+        # Cross validate on the outputs of the primary if none specified
+        if cv_on is None:
+            cv_on = self.get_primary().name
+        check_candidates(self, candidates, cv_on)
+
+        # Run the pipeline up to the node to cross validate on, once
+        X, y, _ = self.run_to_cv_node(inputs, cv_on)
+
+        # Cross-validate the candidates
+        results = successive_halving(
+            self,
+            candidates,
+            cv_on,
+            X,
+            y,
+            metric,
+            cv_splitter,
+            cv_implementation,
+            greater_is_better=greater_is_better,
+            reduction_factor=reduction_factor,
+            min_rows=min_rows,
+            max_workers=max_workers,
+            random_seed=random_seed,
+            verbose=verbose,
+        )
+        return candidates[get_best(results, greater_is_better)], results
+
+    def run_to_cv_node(self, inputs, cv_on, profiler=None):
         """Run the pipeline up to the node to cross validate on"""
-        X, y = self.fit_run(inputs=inputs, outputs=[cv_on])
+        X, y = self.fit_run(inputs, [cv_on], profiler=profiler)
         original_index = X.index
         X.reset_index(inplace=True, drop=True)
         y.reset_index(inplace=True, drop=True)
@@ -391,6 +882,91 @@ class DAG:
         """Serialize the entire pipeline"""
         save_dag(self, filename)
 
+    def get_inference_dag(
+        self, outputs: Union[str, List[str]] = []
+    ) -> "InferenceDAG":
+        """Get a copy of the fitted pipeline with only what's needed to run it
+
+        Only keeps the nodes which are run (in test mode) between the Input
+        nodes and the outputs.  Nodes which are only used for training (e.g.
+        Loaders of training data, and Metrics) are dropped, as are Caches
+        (whose children are connected directly to the caches' parents), and
+        the DAG's own attributes.  The nodes are shallow copies, and share
+        their fitted state with the nodes in this DAG.
+
+        Parameters
+        ----------
+        outputs : Union[str, List[str]]
+            Output node(s) to keep.  Default is all the Model nodes.
+
+        Returns
+        -------
+        InferenceDAG
+            DAG with just the nodes needed to run the outputs.
+        """
+
+        # Default is to keep all models
+        if isinstance(outputs, str):
+            outputs = [outputs]
+        if len(outputs) == 0:
+            outputs = [n.name for n in self.get_nodes(Model)]
+
+        # Walk back from the outputs to the inputs, skipping over caches
+        def get_parent_names(node) -> List[str]:
+            names = []
+            for parent in node.get_parents():
+                if isinstance(parent, Cache):
+                    names += get_parent_names(parent)
+                else:
+                    names.append(parent.name)
+            return names
+
+        self.instantiate_dag("test")
+        edges = {}
+        to_visit = list(outputs)
+        visited = set()
+        while len(to_visit) > 0:
+            name = to_visit.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            node = self.get_node(name)
+            if isinstance(node, Input) or node.num_parents() == 0:
+                continue
+            parents = get_parent_names(node)
+            if isinstance(node, Primary):
+                edges[name] = {"test": parents[0], "train": parents[0]}
+            elif len(parents) == 1:
+                edges[name] = parents[0]
+            else:
+                edges[name] = parents
+            to_visit += parents
+
+        # Copy the nodes, w/o their connections to the rest of this DAG
+        nodes = {}
+        for name, node in self.get_node_dict().items():
+            if name in visited:
+                nodes[name] = copy(node)
+                nodes[name].reset_connections()
+        return InferenceDAG(nodes, edges)
+
+    def save_inference_dag(
+        self, filename: str, outputs: Union[str, List[str]] = []
+    ):
+        """Serialize only what's needed to run the fitted pipeline
+
+        See :meth:`get_inference_dag`.  Load the saved DAG with
+        :func:`pipedown.dag.load_dag`.
+
+        Parameters
+        ----------
+        filename : str
+            File to save the DAG to.
+        outputs : Union[str, List[str]]
+            Output node(s) to keep.  Default is all the Model nodes.
+        """
+        save_dag(self.get_inference_dag(outputs), filename)
+
     def get_html(self):
         """Get html for the dashboard displaying the pipeline"""
         return get_dag_viewer_html(self)
@@ -399,3 +975,136 @@ class DAG:
         """Save an html file with the dashboard displaying the pipeline"""
         with open(filename, "w") as f:
             f.write(self.get_html())
+
+
+def collate_cv_predictions(
+    predictions: List[Dict[str, Any]],
+    outputs: List[str],
+    original_index: pd.Index,
+    y_true_name: str = "y_true",
+) -> pd.DataFrame:
+    """Collate the outputs of models on each fold into a DataFrame
+
+    Parameters
+    ----------
+    predictions : List[Dict[str, Any]]
+        For each fold, a dict mapping model names to their
+        ``(y_pred, y_true)`` outputs.
+    outputs : List[str]
+        Names of the models
+    original_index : pd.Index
+        Index of the data before cross-validating
+    y_true_name : str
+        Name for the column containing the true predictions
+
+    Returns
+    -------
+    pd.DataFrame
+        The true target values (column `y_true_name`), and then one column
+        for each of the models in `outputs`, with that model's predictions.
+    """
+
+    columns = {y_true_name: [p[outputs[0]][1] for p in predictions]}
+    for output in outputs:
+        columns[output] = [p[output][0] for p in predictions]
+    return pd.DataFrame(
+        {
+            name: collate_column(values, original_index)
+            for name, values in columns.items()
+        },
+        index=original_index,
+        copy=False,
+    )
+
+
+def collate_column(
+    values: List[pd.Series], original_index: pd.Index
+) -> Union[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """Collate the values of one column on each fold
+
+    The index of the data is reset before cross-validating, so the index of
+    each fold's values is the position of those rows in the data.  The
+    values are written straight into one array at those positions, without
+    concatenating and sorting them.  If the values don't have a plain numpy
+    dtype, or don't cover every position exactly once, they're concatenated
+    and sorted instead.
+    """
+    n = len(original_index)
+    dtypes = [v.dtype for v in values]
+    if all(isinstance(d, np.dtype) for d in dtypes) and all(
+        v.index.dtype.kind in "iu" for v in values
+    ):
+        out = np.empty(n, dtype=np.result_type(*dtypes))
+        filled = np.zeros(n, dtype=bool)
+        for v in values:
+            ix = v.index.values
+            if ix.size > 0 and (ix.min() < 0 or ix.max() >= n):
+                break
+            out[ix] = v.values
+            filled[ix] = True
+        else:
+            if sum(len(v) for v in values) == n and filled.all():
+                return out
+    return pd.concat(values).sort_index().array
+
+
+def collate_cv_metrics(
+    dag: DAG, metrics: List[Dict[str, Any]], outputs: List[str]
+) -> pd.DataFrame:
+    """Collate the values of metrics on each fold into a DataFrame
+
+    Parameters
+    ----------
+    dag : DAG
+        The DAG the metric nodes are in
+    metrics : List[Dict[str, Any]]
+        For each fold, a dict mapping metric node names to their values
+    outputs : List[str]
+        Names of the metric nodes
+
+    Returns
+    -------
+    pd.DataFrame
+        The metrics, as returned by :meth:`DAG.cv_metric`
+    """
+    metric_list = []
+    for output in outputs:
+        m_node = dag.get_node(output)
+        for i, metric_set in enumerate(metrics):
+            metric_list.append(
+                {
+                    "model_name": m_node.get_parents()[0].name,
+                    "metric_name": m_node.get_metric_name(),
+                    "fold": i,
+                    "metric_value": metric_set[output],
+                }
+            )
+    return pd.DataFrame.from_records(metric_list)
+
+
+class InferenceDAG(DAG):
+    """A fitted DAG with only the nodes needed to run it
+
+    Created by :meth:`DAG.get_inference_dag`.
+
+    Parameters
+    ----------
+    nodes : Dict[str, Node]
+        The nodes in the DAG
+    edges : Dict[str, Union[str, List[str]]]
+        The edges between the nodes
+    """
+
+    def __init__(
+        self,
+        nodes: Dict[str, Node],
+        edges: Dict[str, Union[str, List[str]]],
+    ):
+        self._inference_nodes = nodes
+        self._inference_edges = edges
+
+    def nodes(self) -> Dict[str, Node]:
+        return self._inference_nodes
+
+    def edges(self) -> Dict[str, Union[str, List[str]]]:
+        return self._inference_edges
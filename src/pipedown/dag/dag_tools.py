@@ -1,17 +1,60 @@
+import time
+from collections import defaultdict
 from copy import deepcopy
+from functools import partial
 from types import GeneratorType
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
+import pandas as pd
+
+from pipedown.dag.executors import Executor, Sequential
+from pipedown.dag.memoization import MemoStore
+from pipedown.dag.profiling import Profiler
 from pipedown.nodes.base.cache import Cache
 from pipedown.nodes.base.input import Input
+from pipedown.nodes.base.metric import Metric
+from pipedown.nodes.base.node import Node
 from pipedown.nodes.base.primary import Primary
 from pipedown.utils.empty import EMPTY, is_empty
+from pipedown.utils.tracing import span
 
 
 def run_dag(
-    inputs: Dict[str, Any], outputs: Union[str, List[str]], mode, nodes
+    inputs: Dict[str, Any],
+    outputs: Union[str, List[str]],
+    mode,
+    nodes,
+    executor: Optional[Executor] = None,
+    memo: Optional[MemoStore] = None,
+    profiler: Optional[Profiler] = None,
 ):
-    """Run the dag between inputs and outputs"""
+    """Run the dag between inputs and outputs
+
+    Parameters
+    ----------
+    inputs : Dict[str, Any]
+        Dict of the input data.  Keys should be node names, and values
+        should be the data to use as inputs to those nodes.
+    outputs : Union[str, List[str]]
+        Output node(s).  Default is all nodes without children.
+    mode : str {'train' or 'test'}
+        Whether to fit and run the nodes ('train') or just run them ('test').
+    nodes : List[Node]
+        All the nodes in the DAG.
+    executor : Optional[Executor]
+        How to schedule running the nodes.  Default is to run them one at a
+        time (:class:`pipedown.dag.executors.Sequential`).
+    memo : Optional[MemoStore]
+        Store of memoized node outputs to re-use.  Default is not to memoize.
+    profiler : Optional[Profiler]
+        Profiler to record statistics about each node which is run.
+
+    Returns
+    -------
+    output_data : Union[Any, Dict[str, Any]]
+        The output data from the output node, or a dict of output data if
+        there are multiple output nodes.
+    """
 
     # Default output nodes are all nodes without children
     if isinstance(outputs, str):
@@ -19,56 +62,414 @@ def run_dag(
     if len(outputs) == 0:
         outputs = [n.name for n in nodes if n.num_children() == 0]
 
-    # To store cached outputs
-    cached_outputs = {}
-    output_data = {}
-
-    # Run each node in reverse post-order
-    node_outputs = None
-    for node in get_dag_eval_order(inputs, outputs, nodes):
-
-        # Check inputs are supplied
-        if isinstance(node, Input) and node.name not in inputs:
-            raise RuntimeError(f"No input supplied for {node.name}")
-
-        # Get node's inputs
-        if node.name in inputs:
-            node_inputs = inputs.get(node.name)
-        elif node.num_parents() == 1:
-            parent_name = node.get_parents()[0].name
-            if parent_name in cached_outputs:
-                node_inputs = deepcopy(cached_outputs[parent_name])
-            else:  # only child / single parent -> we ran this last step
-                node_inputs = node_outputs
-        else:  # >1 parent, all of whose outputs will have been cached
-            node_inputs = (
-                deepcopy(cached_outputs[p.name]) for p in node.get_parents()
-            )
+    # Run the nodes
+    plan = ExecutionPlan(inputs, outputs, mode, nodes)
+    return run_plan(plan, inputs, executor, memo, profiler)
 
-        # Run the node
-        node_outputs = run_node(node, node_inputs, mode)
 
-        # Cache this node's outputs if it has multiple children
-        # or if any of its children have multiple parents
-        # TODO: there's definitely a more efficient way to be doing this...
-        # should delete data as soon as it won't be needed by further nodes
-        # and way you've currently got it set up there's an extra copy made
-        if node.num_children() > 1 or any(
-            c.num_parents() > 1 for c in node.get_children()
-        ):
-            cached_outputs[node.name] = deepcopy(node_outputs)
+def run_plan(
+    plan: "ExecutionPlan",
+    inputs: Dict[str, Any],
+    executor: Optional[Executor] = None,
+    memo: Optional[MemoStore] = None,
+    profiler: Optional[Profiler] = None,
+):
+    """Run the dag according to a compiled execution plan
 
-        # And store the output if this node is an output node
-        if node.name in outputs:
-            output_data[node.name] = node_outputs
+    Parameters
+    ----------
+    plan : ExecutionPlan
+        The plan to run.  Must have been compiled for inputs with the same
+        names as `inputs`.
+    inputs : Dict[str, Any]
+        Dict of the input data.  Keys should be node names, and values
+        should be the data to use as inputs to those nodes.
+    executor : Optional[Executor]
+        How to schedule running the nodes.  Default is to run them one at a
+        time (:class:`pipedown.dag.executors.Sequential`).
+    memo : Optional[MemoStore]
+        Store of memoized node outputs to re-use.  Default is not to memoize.
+    profiler : Optional[Profiler]
+        Profiler to record statistics about each node which is run.
 
-    # Return output data
-    if len(outputs) == 1:
-        return output_data[outputs[0]]
+    Returns
+    -------
+    output_data : Union[Any, Dict[str, Any]]
+        The output data from the output node, or a dict of output data if
+        there are multiple output nodes.
+    """
+
+    # Run the nodes
+    if executor is None:
+        executor = Sequential()
+    dag_run = DagRun(plan, inputs, memo, profiler)
+    if profiler is not None:
+        profiler.start()
+    try:
+        executor.run(dag_run)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    return get_returned_data(dag_run)
+
+
+def fit_and_run_plans(
+    fit_plan: "ExecutionPlan",
+    fit_inputs: Dict[str, Any],
+    run_plan: "ExecutionPlan",
+    run_inputs: Dict[str, Any],
+    profiler: Optional[Profiler] = None,
+):
+    """Fit the dag on some data and run it on other data in a single pass
+
+    Each node is fit on (and, if needed, run on) the fitting data, and then
+    immediately run on the other data, before moving on to the next node.
+    The plans must run the same nodes in the same order.
+
+    Parameters
+    ----------
+    fit_plan : ExecutionPlan
+        Plan for fitting the DAG (in train mode).
+    fit_inputs : Dict[str, Any]
+        Dict of the input data to fit on.
+    run_plan : ExecutionPlan
+        Plan for running the DAG (in test mode).
+    run_inputs : Dict[str, Any]
+        Dict of the input data to run on.
+    profiler : Optional[Profiler]
+        Profiler to record statistics about each node which is run.
+
+    Returns
+    -------
+    output_data : Union[Any, Dict[str, Any]]
+        The output data from running the output node, or a dict of output
+        data if there are multiple output nodes.
+    """
+    fit_run = DagRun(fit_plan, fit_inputs, profiler=profiler)
+    dag_run = DagRun(run_plan, run_inputs, profiler=profiler)
+    if profiler is not None:
+        profiler.start()
+    try:
+        for node in fit_plan.eval_order:
+            for each_run in (fit_run, dag_run):
+                node_inputs = each_run.get_inputs(node)
+                node_outputs = each_run.run_node(node, node_inputs)
+                del node_inputs
+                each_run.set_outputs(node, node_outputs)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+    return get_returned_data(dag_run)
+
+
+def get_returned_data(dag_run: "DagRun"):
+    """Get the output data from a finished DAG run, in the form to return
+
+    Returns the output data from the output node, or a dict of output data if
+    there are multiple output nodes.
+    """
+    output_data = dag_run.get_output_data()
+    if len(dag_run.plan.outputs) == 1:
+        return output_data[dag_run.plan.outputs[0]]
     else:
         return output_data
 
 
+class ExecutionPlan:
+    """A compiled plan for running part of a DAG
+
+    Contains everything about running the DAG which only depends on the
+    structure of the DAG, the mode, and the names of the input and output
+    nodes (and not on the input data itself), so that it can be computed
+    once and re-used across many runs:
+
+    * the nodes to run, in reverse post-order
+    * how to get each node's inputs
+    * which nodes must be run before each node
+    * which edges need copies of the data, and how many nodes consume each
+      node's outputs (so they can be released when no longer needed)
+    * which nodes only need to be fit, and not run, and which don't need to
+      be fit or run at all
+    * whether nodes continue fitting from their current state
+
+    Parameters
+    ----------
+    inputs : Union[Dict[str, Any], Set[str]]
+        The input data, or just the names of the input nodes.
+    outputs : List[str]
+        Names of the output nodes.
+    mode : str {'train' or 'test'}
+        Whether to fit and run the nodes ('train') or just run them ('test').
+    nodes : List[Node]
+        All the nodes in the DAG.
+    return_outputs : bool
+        Whether the outputs of the output nodes will be used.  If False, in
+        train mode, nodes whose outputs aren't consumed by any other node are
+        just fit, and not run (or, if fitting them does nothing, skipped
+        entirely).  Default is True.
+    warm_start : bool
+        Whether, in train mode, nodes which have a ``partial_fit`` method
+        continue fitting from their current state on the new data (by
+        calling it instead of ``fit``).  Default is False.
+    """
+
+    def __init__(
+        self,
+        inputs,
+        outputs: List[str],
+        mode: str,
+        nodes,
+        return_outputs: bool = True,
+        warm_start: bool = False,
+    ):
+        self.input_names = set(inputs)
+        self.outputs = outputs
+        self.mode = mode
+        self.return_outputs = return_outputs
+        self.warm_start = warm_start
+        self.eval_order = get_dag_eval_order(self.input_names, outputs, nodes)
+        consumers = get_consumers(self.input_names, self.eval_order)
+
+        # Nodes which only need to be fit, because nothing uses their
+        # outputs, and nodes which don't need to be fit or run at all,
+        # because they're also stateless (e.g. metrics).  Nodes whose only
+        # consumers are skipped only need to be fit too.
+        self.fit_only = set()
+        self.skip = set()
+        if mode == "train":
+            for node in reversed(self.eval_order):
+                if (return_outputs and node.name in outputs) or not all(
+                    c.name in self.skip for c in consumers[node.name]
+                ):
+                    continue
+                elif needs_fit(node):
+                    self.fit_only.add(node.name)
+                else:
+                    self.skip.add(node.name)
+            consumers = {
+                k: [c for c in v if c.name not in self.skip]
+                for k, v in consumers.items()
+            }
+        self.num_consumers = {k: len(v) for k, v in consumers.items()}
+        self.copy_free_edges = get_copy_free_edges(
+            outputs, self.eval_order, consumers
+        )
+
+        # Get the names of the nodes whose outputs each node takes as inputs,
+        # and which nodes must be run before each node
+        self.sources = {}
+        self.dependencies = {}
+        for node in self.eval_order:
+            if isinstance(node, Input) and node.name not in self.input_names:
+                raise RuntimeError(f"No input supplied for {node.name}")
+            self.dependencies[node.name] = set()
+            if node.name in self.skip or is_truncated(node, self.input_names):
+                self.sources[node.name] = []
+                continue
+            self.sources[node.name] = [p.name for p in node.get_parents()]
+            for parent in node.get_parents():
+                edge = (parent.name, node.name)
+                self.dependencies[node.name].add(parent.name)
+                self.dependencies[node.name].update(
+                    self.copy_free_edges.get(edge, set())
+                )
+
+
+class DagRun:
+    """The state of a single run of a DAG
+
+    Stores each node's outputs until no further nodes need them, and gets
+    the inputs for each node (copying data only when needed) according to an
+    :class:`ExecutionPlan`.  The executors in :mod:`pipedown.dag.executors`
+    use this to run the nodes in whatever order they choose, as long as each
+    node is run after all of its dependencies.
+
+    Parameters
+    ----------
+    plan : ExecutionPlan
+        The plan to run.
+    inputs : Dict[str, Any]
+        Dict of the input data.
+    memo : Optional[MemoStore]
+        Store of memoized node outputs to re-use.  Nodes whose outputs are in
+        the store are not run, and their inputs aren't computed unless
+        another node needs them.  Not used when warm-starting.
+    profiler : Optional[Profiler]
+        Profiler to record statistics about each node which is run.
+    """
+
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        inputs: Dict[str, Any],
+        memo: Optional[MemoStore] = None,
+        profiler: Optional[Profiler] = None,
+    ):
+        self.plan = plan
+        self.inputs = inputs
+        self.mode = plan.mode
+        self.eval_order = plan.eval_order
+        self.memo = memo
+        self.profiler = profiler
+        self._copy_time = defaultdict(float)
+        self._remaining = dict(plan.num_consumers)
+        self._cached_outputs = {}
+        self._output_data = {}
+        self._fingerprints = {}
+        self._memoized = set()
+        self._needed = set(n.name for n in self.eval_order)
+        if memo is not None and not plan.warm_start:
+            self._find_memoized_nodes()
+
+    def _find_memoized_nodes(self) -> None:
+        """Fingerprint the nodes and find which are already in the memo"""
+
+        # Nodes are fingerprinted by their code, parameters, and inputs
+        for node in self.eval_order:
+            if node.name in self.plan.skip:
+                self._fingerprints[node.name] = None
+                continue
+            elif node.name in self.inputs:
+                upstream = [
+                    self.memo.get_data_fingerprint(self.inputs[node.name])
+                ]
+            elif isinstance(node, Cache) and node.is_cached():
+                upstream = [None]  # can't tell what's in it without loading
+            else:
+                upstream = [
+                    self._fingerprints[p] for p in self.plan.sources[node.name]
+                ]
+            if any(f is None for f in upstream):
+                self._fingerprints[node.name] = None
+            else:
+                self._fingerprints[node.name] = self.memo.get_fingerprint(
+                    node, self.mode, upstream
+                )
+            if is_memoizable(node) and self._fingerprints[node.name]:
+                if self.memo.contains(self._fingerprints[node.name]):
+                    self._memoized.add(node.name)
+
+        # Only need the outputs of memoized nodes which are output nodes or
+        # are consumed by nodes which will actually be run
+        consumers = get_consumers(self.plan.input_names, self.eval_order)
+        self._needed = set()
+        for node in reversed(self.eval_order):
+            if (
+                self.plan.return_outputs and node.name in self.plan.outputs
+            ) or any(
+                c.name not in self._memoized and c.name not in self.plan.skip
+                for c in consumers[node.name]
+            ):
+                self._needed.add(node.name)
+
+    def get_dependencies(self, node) -> Set[str]:
+        """Get the names of nodes which must be run before a node"""
+        return set(self.plan.dependencies[node.name])
+
+    def get_inputs(self, node, copy: bool = True) -> Any:
+        """Get a node's inputs (its dependencies must have already been run)
+
+        Parameters
+        ----------
+        node : Node
+            The node whose inputs to get
+        copy : bool
+            Whether to copy data which the node could modify.  Only set this
+            to False if the node won't be run on this data directly, e.g. if
+            the data is going to be sent to another process.
+        """
+        sources = self.plan.sources[node.name]
+        if node.name in self._memoized or node.name in self.plan.skip:
+            return None
+        elif node.name in self.inputs:
+            return self.inputs.get(node.name)
+        elif len(sources) == 0:  # cached cache, or node w/o parents
+            return None
+        with span(node.name, "inputs"):
+            if len(sources) == 1:
+                return self._get_parent_outputs(node.name, sources[0], copy)
+            else:  # >1 parent, all of whose outputs will have been cached
+                return tuple(
+                    self._get_parent_outputs(node.name, p, copy)
+                    for p in sources
+                )
+
+    def _get_parent_outputs(self, name, parent_name, copy: bool) -> Any:
+        if not copy or (parent_name, name) in self.plan.copy_free_edges:
+            return self._cached_outputs[parent_name]
+        elif self.profiler is None:
+            return copy_data(self._cached_outputs[parent_name])
+        start = time.perf_counter()
+        with span(name, "copy", parent=parent_name):
+            data = copy_data(self._cached_outputs[parent_name])
+        self._copy_time[name] += time.perf_counter() - start
+        return data
+
+    def get_runner(self, node) -> Callable:
+        """Get the function which runs a node, given the node and its inputs
+
+        The function can be pickled and called in another process.  Pass
+        what it returns to :meth:`get_node_outputs` to get the outputs.
+        """
+        fingerprint = self._fingerprints.get(node.name)
+        fit_only = node.name in self.plan.fit_only
+        if node.name in self.plan.skip:
+            return skip_node
+        elif fingerprint is None or not is_memoizable(node):
+            runner = partial(
+                run_node,
+                mode=self.mode,
+                fit_only=fit_only,
+                warm_start=self.plan.warm_start,
+            )
+        else:
+            runner = self.memo.get_runner(
+                self.mode,
+                fingerprint,
+                load_outputs=node.name in self._needed,
+                fit_only=fit_only,
+            )
+        if self.profiler is not None:
+            runner = self.profiler.get_runner(runner)
+        return runner
+
+    def get_node_outputs(self, node, result) -> Any:
+        """Get a node's outputs from what its runner returned"""
+        if self.profiler is None or node.name in self.plan.skip:
+            return result
+        node_outputs, stats = result
+        stats["copy_time"] = self._copy_time.pop(node.name, 0.0)
+        stats["memoized"] = node.name in self._memoized
+        self.profiler.record(node.name, self.mode, stats)
+        return node_outputs
+
+    def run_node(self, node, node_inputs) -> Any:
+        """Run (and fit, if in train mode) a node on its inputs"""
+        result = self.get_runner(node)(node, node_inputs)
+        return self.get_node_outputs(node, result)
+
+    def set_outputs(self, node, node_outputs) -> None:
+        """Store a node's outputs after it has been run"""
+
+        # Release outputs which no further nodes will need
+        for parent_name in self.plan.sources[node.name]:
+            self._remaining[parent_name] -= 1
+            if self._remaining[parent_name] == 0:
+                del self._cached_outputs[parent_name]
+
+        # Keep this node's outputs until its last consumer has run
+        if self._remaining[node.name] > 0:
+            self._cached_outputs[node.name] = node_outputs
+
+        # And store the output if this node is an output node
+        if node.name in self.plan.outputs:
+            self._output_data[node.name] = node_outputs
+
+    def get_output_data(self) -> Dict[str, Any]:
+        """Get the outputs of the output nodes after the DAG has been run"""
+        return self._output_data
+
+
 def get_dag_eval_order(
     inputs: Dict[str, Any],
     outputs: Union[str, List[str]],
@@ -85,10 +486,7 @@ def get_dag_eval_order(
     visit_order = []
 
     def dfs_walk_reverse_post_order(node):
-        if (  # truncate the walk at inputs and cached caches
-            node.name not in inputs
-            and not (isinstance(node, Cache) and node.is_cached())
-        ):
+        if not is_truncated(node, inputs):
             for parent in node.get_parents():
                 if parent not in visited:
                     dfs_walk_reverse_post_order(parent)
@@ -101,31 +499,213 @@ def get_dag_eval_order(
             dfs_walk_reverse_post_order(node)
 
     # Ensure there aren't any cycles in the graph
+    position = {node: i for i, node in enumerate(visit_order)}
     for i, node in enumerate(visit_order):
         for child in node.get_children():
-            if child in visit_order and visit_order.index(child) < i:
+            if position.get(child, i) < i:
                 raise RuntimeError("Your graph has a cycle in it!")
 
     return visit_order
 
 
-def run_node(node, node_inputs, mode):
+def is_truncated(node, inputs) -> bool:
+    """Whether the DAG walk stops at this node (inputs and cached caches)"""
+    return node.name in inputs or (
+        isinstance(node, Cache) and node.is_cached()
+    )
+
+
+def get_consumers(inputs: Dict[str, Any], eval_order) -> Dict[str, list]:
+    """Get the nodes which consume each node's outputs
+
+    Parameters
+    ----------
+    inputs : Dict[str, Any]
+        Dict of the input data.  Nodes in `inputs` don't consume the outputs
+        of their parents.
+    eval_order : List[Node]
+        Nodes in the order they will be run, from :func:`get_dag_eval_order`.
+
+    Returns
+    -------
+    Dict[str, List[Node]]
+        Dict whose keys are the names of the nodes in `eval_order`, and values
+        are the nodes which consume that node's outputs, in eval order.
+    """
+    consumers = {node.name: [] for node in eval_order}
+    for node in eval_order:
+        if not is_truncated(node, inputs):
+            for parent in node.get_parents():
+                consumers[parent.name].append(node)
+    return consumers
+
+
+def get_copy_free_edges(
+    outputs: List[str], eval_order, consumers: Dict[str, list]
+) -> Dict[Tuple[str, str], Set[str]]:
+    """Get the edges along which outputs can be passed without copying them
+
+    A node which doesn't mutate its inputs can always share its parents'
+    outputs.  A node which does mutate its inputs can only take ownership of
+    a parent's outputs if it is the last node to use them, and if no other
+    data which is still needed could be a view of them.  The outputs of nodes
+    which don't mutate their inputs may be views of those inputs, and the
+    outputs of output nodes are needed after the whole DAG has run.
+
+    Parameters
+    ----------
+    outputs : List[str]
+        Names of the output nodes.
+    eval_order : List[Node]
+        Nodes in the order they will be run, from :func:`get_dag_eval_order`.
+    consumers : Dict[str, List[Node]]
+        The consumers of each node's outputs, from :func:`get_consumers`.
+
+    Returns
+    -------
+    Dict[Tuple[str, str], Set[str]]
+        Dict whose keys are (parent name, child name) tuples for edges along
+        which the child can be passed the parent's outputs without copying
+        them.  Values are the names of nodes which must have finished running
+        before the child can take ownership of the data (these are all before
+        the child in the eval order).
+    """
+
+    # Get the nodes which use each node's outputs or data which could be a
+    # view of them, and whether that data is returned (walking backwards so
+    # consumers are done before parents)
+    users = {}
+    returned = {}
+    for node in reversed(eval_order):
+        users[node.name] = set()
+        returned[node.name] = node.name in outputs
+        for child in consumers[node.name]:
+            users[node.name].add(child.name)
+            if not child.mutates_inputs:
+                users[node.name].update(users[child.name])
+                returned[node.name] |= returned[child.name]
+
+    # Nodes whose outputs each node's outputs could be a view of (including
+    # its own)
+    viewed = {node.name: {node.name} for node in eval_order}
+    for node in eval_order:
+        for child in consumers[node.name]:
+            if not child.mutates_inputs:
+                viewed[child.name].update(viewed[node.name])
+
+    # Find edges which don't need copies
+    position = {node.name: i for i, node in enumerate(eval_order)}
+    copy_free_edges = {}
+    for node in eval_order:
+        for child in consumers[node.name]:
+            if not child.mutates_inputs:
+                copy_free_edges[(node.name, child.name)] = set()
+            elif consumers[node.name].count(child) == 1 and all(
+                not returned[name]
+                and all(
+                    position[u] <= position[child.name] for u in users[name]
+                )
+                for name in viewed[node.name]
+            ):
+                copy_free_edges[(node.name, child.name)] = set().union(
+                    *(users[name] for name in viewed[node.name])
+                ) - {child.name}
+    return copy_free_edges
+
+
+def is_memoizable(node) -> bool:
+    """Whether a node's outputs can be stored in a MemoStore"""
+    return not isinstance(node, (Input, Cache))
+
+
+def copy_data(data):
+    """Copy data so that it can be safely modified in place
+
+    When pandas' copy-on-write mode is enabled, DataFrames and Series are
+    copied lazily (only when they are actually modified).
+    """
+    if not copy_on_write():
+        return deepcopy(data)
+    elif isinstance(data, (pd.DataFrame, pd.Series)):
+        return data.copy(deep=False)
+    elif isinstance(data, tuple):
+        return tuple(copy_data(e) for e in data)
+    else:
+        return deepcopy(data)
+
+
+def copy_on_write() -> bool:
+    """Whether pandas' copy-on-write mode is enabled"""
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:  # pandas < 1.5 has no copy-on-write mode
+        return False
+
+
+def needs_fit(node) -> bool:
+    """Whether fitting a node does anything (metrics and nodes which don't
+    override ``fit()`` don't need to be fit)"""
+    return not isinstance(node, Metric) and type(node).fit is not Node.fit
+
+
+def skip_node(node, node_inputs) -> None:
+    """Runner for nodes which don't need to be fit or run"""
+    return None
+
+
+def run_node(
+    node, node_inputs, mode, fit_only: bool = False, warm_start: bool = False
+):
+    """Run (and fit, if in train mode) a node on its inputs
+
+    Parameters
+    ----------
+    node : Node
+        The node to run
+    node_inputs : Any
+        The node's inputs
+    mode : str {'train' or 'test'}
+        Whether to fit and run the node ('train') or just run it ('test').
+    fit_only : bool
+        Whether to only fit the node, and not run it (in train mode).
+    warm_start : bool
+        Whether to continue fitting the node from its current state, with
+        its ``partial_fit`` method (in train mode, if it has one).
+
+    Returns
+    -------
+    Any
+        The node's outputs, or None if it was only fit.
+    """
     if is_empty(node_inputs):  # don't run nodes with empty input
         return EMPTY
     if isinstance(node, Primary):
-        return node.run(node_inputs, mode)
+        if fit_only:
+            return None
+        with span(node.name, "run"):
+            return node.run(node_inputs, mode)
     if isinstance(node_inputs, GeneratorType):
         node_inputs = tuple(node_inputs)
     if node_inputs is None:
-        if mode == "train":
-            node.fit()
-        return node.run()
+        args = []
     elif isinstance(node_inputs, tuple):
-        node_inputs = [e for e in node_inputs]
-        if mode == "train":
-            node.fit(*node_inputs)
-        return node.run(*node_inputs)
+        args = [e for e in node_inputs]
     else:
-        if mode == "train":
-            node.fit(node_inputs)
-        return node.run(node_inputs)
+        args = [node_inputs]
+    is_cache = isinstance(node, Cache)
+    if is_cache and node.cv_context is not None:
+        node.cv_context = node.cv_context._replace(mode=mode)
+    if mode == "train":
+        fit = node.fit
+        if warm_start and hasattr(node, "partial_fit"):
+            fit = node.partial_fit
+        with span(node.name, "cache write" if is_cache else "fit"):
+            fit(*args)
+        if fit_only:
+            return None
+    with span(
+        node.name, "cache read" if is_cache and node.is_cached() else "run"
+    ):
+        return node.run(*args)
@@ -0,0 +1,24 @@
+"""
+The pipedown.dag.executors module contains classes for different ways of
+scheduling the nodes of a DAG when it is run.
+
+* :class:`.Executor` - abstract base class for all executors
+* :class:`.PoolExecutor` - abstract base class for executors using a pool
+* :class:`.ProcessPool` - run independent nodes in parallel on a process pool
+* :class:`.Sequential` - run nodes one at a time
+* :class:`.ThreadPool` - run independent nodes in parallel on a thread pool
+"""
+
+__all__ = [
+    "Executor",
+    "PoolExecutor",
+    "ProcessPool",
+    "Sequential",
+    "ThreadPool",
+]
+
+from .executor import Executor
+from .pool_executor import PoolExecutor
+from .process_pool import ProcessPool
+from .sequential import Sequential
+from .thread_pool import ThreadPool
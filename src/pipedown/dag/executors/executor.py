@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+
+
+class Executor(ABC):
+    """Abstract base class for a way of scheduling the nodes in a DAG"""
+
+    @abstractmethod
+    def run(self, dag_run) -> None:
+        """Run all the nodes in a DAG run
+
+        Each node must be run only after all of its dependencies (from
+        ``dag_run.get_dependencies(node)``) have been run and their outputs
+        stored.
+
+        Parameters
+        ----------
+        dag_run : pipedown.dag.dag_tools.DagRun
+            The DAG run containing the nodes to run and their data.
+        """
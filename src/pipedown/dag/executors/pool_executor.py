@@ -0,0 +1,80 @@
+from abc import abstractmethod
+from concurrent import futures
+from typing import Any, Optional
+
+from .executor import Executor
+
+
+class PoolExecutor(Executor):
+    """Abstract base class for executors which run nodes on a worker pool
+
+    Each node is started as soon as all the nodes it depends on have
+    finished, so independent branches of the DAG run at the same time.
+
+    Parameters
+    ----------
+    max_workers : Optional[int]
+        Maximum number of nodes to run at the same time.  Default is to use
+        the default for the underlying :mod:`concurrent.futures` pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+
+    @abstractmethod
+    def get_pool(self) -> futures.Executor:
+        """Create the pool of workers to run nodes on"""
+
+    @abstractmethod
+    def submit(self, pool: futures.Executor, dag_run, node) -> futures.Future:
+        """Start running a node on the pool (its dependencies are done)"""
+
+    def get_outputs(self, dag_run, node, result: Any) -> Any:
+        """Get a node's outputs from the result of a finished future"""
+        return result
+
+    def run(self, dag_run) -> None:
+        """Run all the nodes in a DAG run
+
+        Parameters
+        ----------
+        dag_run : pipedown.dag.dag_tools.DagRun
+            The DAG run containing the nodes to run and their data.
+        """
+
+        # Nodes each node is waiting on, and nodes waiting on each node
+        position = {n.name: i for i, n in enumerate(dag_run.eval_order)}
+        waiting_on = {}
+        waiting_for = {}
+        for node in dag_run.eval_order:
+            waiting_on[node.name] = dag_run.get_dependencies(node)
+            for name in waiting_on[node.name]:
+                waiting_for.setdefault(name, []).append(node)
+
+        # Only this thread touches the stored data, workers just run nodes
+        with self.get_pool() as pool:
+
+            # Start nodes which have no dependencies
+            running = {}
+            for node in dag_run.eval_order:
+                if len(waiting_on[node.name]) == 0:
+                    running[self.submit(pool, dag_run, node)] = node
+
+            # Start other nodes as soon as their dependencies are done
+            while len(running) > 0:
+                done, _ = futures.wait(
+                    running, return_when=futures.FIRST_COMPLETED
+                )
+                for node, future in sorted(
+                    ((running.pop(f), f) for f in done),
+                    key=lambda e: position[e[0].name],
+                ):
+                    node_outputs = self.get_outputs(
+                        dag_run, node, future.result()
+                    )
+                    dag_run.set_outputs(node, node_outputs)
+                    for child in waiting_for.get(node.name, []):
+                        waiting_on[child.name].discard(node.name)
+                        if len(waiting_on[child.name]) == 0:
+                            future = self.submit(pool, dag_run, child)
+                            running[future] = child
@@ -0,0 +1,75 @@
+from concurrent import futures
+from copy import copy
+from typing import Any
+
+import cloudpickle
+
+from pipedown.utils.node_state import get_node_state, set_node_state
+
+from .pool_executor import PoolExecutor
+
+
+class ProcessPool(PoolExecutor):
+    """Run independent nodes in parallel on a pool of processes
+
+    Each node is started as soon as all the nodes it depends on have
+    finished, so sibling branches of the DAG run at the same time.  Unlike
+    :class:`.ThreadPool`, this speeds up nodes which hold the GIL (e.g.
+    pure-Python feature engineering).
+
+    Nodes and their inputs are serialized with cloudpickle and sent to the
+    worker processes, and the nodes' state after fitting is sent back and
+    copied onto the nodes in this process, so the DAG can be run afterwards
+    as usual.  Because of that overhead, this is most useful when nodes take
+    a long time to run relative to the size of their inputs and outputs.
+
+    Parameters
+    ----------
+    max_workers : Optional[int]
+        Maximum number of nodes to run at the same time.  Default is to use
+        the default for :class:`concurrent.futures.ProcessPoolExecutor`.
+    """
+
+    def get_pool(self) -> futures.Executor:
+        """Create the pool of processes to run nodes on"""
+        return futures.ProcessPoolExecutor(self.max_workers)
+
+    def submit(self, pool: futures.Executor, dag_run, node) -> futures.Future:
+        """Start running a node on the pool (its dependencies are done)"""
+
+        # Don't send the rest of the DAG along with the node
+        detached = copy(node)
+        detached.reset_connections()
+
+        # Inputs are copied when they're serialized, so don't copy them here
+        node_inputs = dag_run.get_inputs(node, copy=False)
+        runner = dag_run.get_runner(node)
+        payload = cloudpickle.dumps((runner, detached, node_inputs))
+        return pool.submit(run_pickled_node, payload)
+
+    def get_outputs(self, dag_run, node, result: bytes) -> Any:
+        """Update a node with its fitted state, and get its outputs"""
+        state, runner_result = cloudpickle.loads(result)
+        set_node_state(node, state)
+        return dag_run.get_node_outputs(node, runner_result)
+
+
+def run_pickled_node(payload: bytes) -> bytes:
+    """Run a serialized node in a worker process
+
+    Parameters
+    ----------
+    payload : bytes
+        The cloudpickled (runner, node, node_inputs) tuple, where runner is
+        the function which runs the node, from DagRun.get_runner.
+
+    Returns
+    -------
+    bytes
+        The cloudpickled (node_state, runner_result) tuple, where node_state
+        is the node's attributes after running it (excluding its
+        connections), and runner_result is what the runner returned.
+    """
+    runner, node, node_inputs = cloudpickle.loads(payload)
+    runner_result = runner(node, node_inputs)
+    return cloudpickle.dumps((get_node_state(node), runner_result))
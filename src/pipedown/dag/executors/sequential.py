@@ -0,0 +1,19 @@
+from .executor import Executor
+
+
+class Sequential(Executor):
+    """Run the nodes one at a time, in reverse post-order"""
+
+    def run(self, dag_run) -> None:
+        """Run all the nodes in a DAG run
+
+        Parameters
+        ----------
+        dag_run : pipedown.dag.dag_tools.DagRun
+            The DAG run containing the nodes to run and their data.
+        """
+        for node in dag_run.eval_order:
+            node_inputs = dag_run.get_inputs(node)
+            node_outputs = dag_run.run_node(node, node_inputs)
+            del node_inputs
+            dag_run.set_outputs(node, node_outputs)
@@ -0,0 +1,29 @@
+from concurrent import futures
+
+from .pool_executor import PoolExecutor
+
+
+class ThreadPool(PoolExecutor):
+    """Run independent nodes in parallel on a pool of threads
+
+    Each node is started as soon as all the nodes it depends on have
+    finished, so sibling branches of the DAG run at the same time.  This
+    speeds things up when nodes spend most of their time in code which
+    releases the GIL (e.g. numpy, pandas, or CatBoost).  The outputs are
+    identical to running the nodes sequentially.
+
+    Parameters
+    ----------
+    max_workers : Optional[int]
+        Maximum number of nodes to run at the same time.  Default is to use
+        the default for :class:`concurrent.futures.ThreadPoolExecutor`.
+    """
+
+    def get_pool(self) -> futures.Executor:
+        """Create the pool of threads to run nodes on"""
+        return futures.ThreadPoolExecutor(self.max_workers)
+
+    def submit(self, pool: futures.Executor, dag_run, node) -> futures.Future:
+        """Start running a node on the pool (its dependencies are done)"""
+        node_inputs = dag_run.get_inputs(node)
+        return pool.submit(dag_run.run_node, node, node_inputs)
@@ -0,0 +1,265 @@
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Union
+
+import cloudpickle
+import numpy as np
+import pandas as pd
+
+from pipedown.utils.node_state import get_node_state, set_node_state
+from pipedown.utils.tracing import span
+
+
+class MemoStore:
+    """Content-addressed store for memoizing the outputs of nodes
+
+    When a DAG is fit or run with a MemoStore, each node is fingerprinted by
+    its code (the source of its class), its parameters (its attributes
+    before it is run), the mode, and the fingerprints of its inputs.  If
+    the store already has outputs for that fingerprint, the node isn't run:
+    its outputs (and, when fitting, its fitted state) are loaded from disk
+    instead.  So when only the end of a DAG changes, the unchanged nodes
+    before it are served from the store, across processes and sessions.
+
+    Unlike :class:`pipedown.nodes.base.Cache` nodes, this doesn't need to
+    be placed manually, and is invalidated automatically when code,
+    parameters, or upstream data change.  Note that changes to external
+    data which nodes load themselves (e.g. a Loader reading a file or
+    database) are *not* detected.  Input and Cache nodes are always run.
+
+    Parameters
+    ----------
+    directory : str
+        Directory in which to store the memoized outputs.  Default is
+        ".pipedown_memo" in the current directory.
+    """
+
+    def __init__(self, directory: str = ".pipedown_memo"):
+        self.directory = directory
+
+    def get_fingerprint(
+        self, node, mode: str, upstream: List[str]
+    ) -> Optional[str]:
+        """Get the fingerprint of a node
+
+        Parameters
+        ----------
+        node : Node
+            The node to fingerprint
+        mode : str {'train' or 'test'}
+            Whether the node is going to be fit and run, or just run
+        upstream : List[str]
+            Fingerprints of the node's inputs, in order
+
+        Returns
+        -------
+        Optional[str]
+            The fingerprint, or None if the node can't be fingerprinted
+            (e.g. its attributes can't be serialized).
+        """
+        state = get_node_state(node)
+        state.pop("name", None)
+        try:
+            pickled_state = cloudpickle.dumps(state)
+        except Exception:
+            return None
+        fingerprint = hashlib.sha256()
+        fingerprint.update(mode.encode())
+        fingerprint.update(get_code_fingerprint(type(node)).encode())
+        fingerprint.update(pickled_state)
+        for upstream_fingerprint in upstream:
+            fingerprint.update(upstream_fingerprint.encode())
+        return fingerprint.hexdigest()
+
+    def get_data_fingerprint(self, data: Any) -> Optional[str]:
+        """Get the fingerprint of some input data"""
+        fingerprint = hashlib.sha256()
+        try:
+            update_data_fingerprint(fingerprint, data)
+        except Exception:
+            return None
+        return fingerprint.hexdigest()
+
+    def contains(self, fingerprint: str) -> bool:
+        """Whether the store has outputs for a fingerprint"""
+        return os.path.isfile(self._get_filename(fingerprint, "outputs"))
+
+    def get_runner(
+        self,
+        mode: str,
+        fingerprint: str,
+        load_outputs: bool = True,
+        fit_only: bool = False,
+    ) -> Callable:
+        """Get a function to run a node, using memoized outputs if possible
+
+        Parameters
+        ----------
+        mode : str {'train' or 'test'}
+            Whether to fit and run the node, or just run it
+        fingerprint : str
+            The node's fingerprint
+        load_outputs : bool
+            Whether to load the outputs if they are memoized.  If False and
+            the outputs are memoized, the function returns None (the node's
+            state is still loaded).
+        fit_only : bool
+            Whether to only fit the node, and not run it, if its outputs
+            aren't memoized.  Nothing is stored in that case.
+
+        Returns
+        -------
+        Callable
+            Function which takes a node and its inputs, and returns its
+            outputs.  It can be pickled and called in another process.
+        """
+        return MemoizedRunner(self, mode, fingerprint, load_outputs, fit_only)
+
+    def load(self, node, fingerprint: str, load_outputs: bool = True) -> Any:
+        """Load a node's state and (optionally) its outputs from the store"""
+        with open(self._get_filename(fingerprint, "state"), "rb") as fid:
+            set_node_state(node, cloudpickle.load(fid))
+        if load_outputs:
+            with open(self._get_filename(fingerprint, "outputs"), "rb") as fid:
+                return cloudpickle.load(fid)
+
+    def save(self, node, fingerprint: str, node_outputs: Any) -> None:
+        """Save a node's state and outputs to the store"""
+        state = get_node_state(node)
+        state.pop("name", None)
+        try:  # state first, so outputs existing means both do
+            self._write(self._get_filename(fingerprint, "state"), state)
+            self._write(
+                self._get_filename(fingerprint, "outputs"), node_outputs
+            )
+        except Exception:  # can't serialize, so just don't memoize
+            pass
+
+    def clear(self) -> None:
+        """Delete everything in the store"""
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+
+    def _get_filename(self, fingerprint: str, kind: str) -> str:
+        return os.path.join(self.directory, f"{fingerprint}.{kind}.pkl")
+
+    def _write(self, filename: str, obj: Any) -> None:
+        """Write atomically, so concurrent readers never see partial files"""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as fid:
+                cloudpickle.dump(obj, fid)
+            os.replace(tmp_filename, filename)
+        except Exception:
+            os.remove(tmp_filename)
+            raise
+
+
+class MemoizedRunner:
+    """Runs a node, or loads its memoized outputs (see MemoStore.get_runner)"""
+
+    def __init__(
+        self,
+        memo: MemoStore,
+        mode: str,
+        fingerprint: str,
+        load_outputs: bool,
+        fit_only: bool,
+    ):
+        self.memo = memo
+        self.mode = mode
+        self.fingerprint = fingerprint
+        self.load_outputs = load_outputs
+        self.fit_only = fit_only
+
+    def __call__(self, node, node_inputs) -> Any:
+        from pipedown.dag.dag_tools import run_node  # avoid circular import
+
+        if self.memo.contains(self.fingerprint):
+            with span(node.name, "memo read"):
+                return self.memo.load(
+                    node, self.fingerprint, self.load_outputs
+                )
+        node_outputs = run_node(node, node_inputs, self.mode, self.fit_only)
+        if self.fit_only:  # no outputs to store
+            return node_outputs
+        with span(node.name, "memo write"):
+            self.memo.save(node, self.fingerprint, node_outputs)
+        return node_outputs
+
+
+def update_data_fingerprint(fingerprint, data: Any) -> None:
+    """Add some data to a fingerprint (a hashlib hash)
+
+    The buffers of NumPy arrays (and of the columns and indexes of
+    DataFrames and Series) are hashed directly, instead of serializing them,
+    which would make a copy of all their data (at most one column which
+    isn't contiguous in memory is copied at a time).  Other data (including
+    columns with object or extension dtypes) is hashed by pickling it.
+    """
+    if isinstance(data, (tuple, list)):
+        fingerprint.update(f"{type(data).__name__}:{len(data)}".encode())
+        for element in data:
+            update_data_fingerprint(fingerprint, element)
+    elif isinstance(data, dict):
+        fingerprint.update(f"dict:{len(data)}".encode())
+        for key, value in data.items():
+            fingerprint.update(cloudpickle.dumps(key))
+            update_data_fingerprint(fingerprint, value)
+    elif isinstance(data, pd.DataFrame):
+        fingerprint.update(
+            cloudpickle.dumps((type(data), data.columns, type(data.index)))
+        )
+        update_values_fingerprint(fingerprint, data.index)
+        for _, column in data.items():
+            update_values_fingerprint(fingerprint, column)
+    elif isinstance(data, pd.Series):
+        fingerprint.update(
+            cloudpickle.dumps((type(data), data.name, type(data.index)))
+        )
+        update_values_fingerprint(fingerprint, data.index)
+        update_values_fingerprint(fingerprint, data)
+    elif isinstance(data, np.ndarray) and not data.dtype.hasobject:
+        fingerprint.update(f"ndarray:{data.dtype.str}:{data.shape}".encode())
+        fingerprint.update(np.ascontiguousarray(data).data)
+    else:
+        fingerprint.update(cloudpickle.dumps(data))
+
+
+def update_values_fingerprint(
+    fingerprint, values: Union[pd.Series, pd.Index]
+) -> None:
+    """Add the values (and name and dtype) of a Series or an Index to a
+    fingerprint"""
+    fingerprint.update(cloudpickle.dumps((values.name, str(values.dtype))))
+    if (
+        isinstance(values.dtype, np.dtype)
+        and not values.dtype.hasobject
+        and not isinstance(values, (pd.RangeIndex, pd.MultiIndex))
+    ):
+        update_data_fingerprint(fingerprint, values.to_numpy())
+    elif isinstance(values, pd.Series):
+        fingerprint.update(cloudpickle.dumps(values.array))
+    else:
+        fingerprint.update(cloudpickle.dumps(values))
+
+
+@lru_cache(maxsize=None)
+def get_code_fingerprint(cls) -> str:
+    """Get a fingerprint of the source code of a class and its bases"""
+    fingerprint = hashlib.sha256()
+    for base in inspect.getmro(cls):
+        if base.__module__ in ("builtins", "abc"):
+            continue
+        try:
+            fingerprint.update(inspect.getsource(base).encode())
+        except (OSError, TypeError):  # no source available
+            fingerprint.update(
+                f"{base.__module__}.{base.__qualname__}".encode()
+            )
+    return fingerprint.hexdigest()
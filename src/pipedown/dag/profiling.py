@@ -0,0 +1,281 @@
+import json
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from pipedown.nodes.base.cache import Cache
+from pipedown.utils.tracing import recording, set_trace_events, span
+
+
+class Profiler:
+    """Records per-node statistics while fitting or running a DAG
+
+    Pass a Profiler to :meth:`pipedown.dag.DAG.fit`, :meth:`~.DAG.run` or
+    :meth:`~.DAG.fit_run`, and every node which is run adds a row to its
+    report, with:
+
+    * node: the node's name
+    * mode: 'train' if the node was fit and run, 'test' if it was just run
+    * start: when the node started running (``time.perf_counter()``)
+    * wall_time: elapsed time to fit and run the node, in seconds
+    * cpu_time: process CPU time used while fitting and running the node
+    * peak_memory: peak bytes allocated (according to :mod:`tracemalloc`)
+      above what was allocated when the node started.  Before Python 3.9,
+      the peak can't be reset for each node, so this is the bytes still
+      allocated when the node finished instead.
+    * input_rows, input_columns: size of the node's inputs
+    * output_rows, output_columns: size of the node's outputs
+    * copy_time: time spent copying the node's inputs, in seconds
+    * cached: whether the node was a Cache whose data was already cached
+    * memoized: whether the outputs were loaded from a
+      :class:`pipedown.dag.MemoStore` instead of running the node
+
+    Rows are added for each run of the DAG until :meth:`clear` is called, so
+    the same Profiler can be used for a fit and then a run.
+
+    The Profiler also records a timeline of what happened: fitting and
+    running each node, getting (and copying) its inputs, reading and writing
+    caches and memoized outputs, and cross-validation folds (if passed to
+    :meth:`pipedown.dag.DAG.cv_predict` or :meth:`~.DAG.cv_metric`).  Use
+    :meth:`to_chrome_trace` to save it in the Chrome trace event format,
+    which can be viewed with Perfetto (https://ui.perfetto.dev) or
+    chrome://tracing.
+
+    When nodes are run in parallel threads (e.g. with
+    :class:`pipedown.dag.executors.ThreadPool`), the CPU time of nodes which
+    are running at the same time includes each other's.  And since
+    tracemalloc only tracks the peak memory of the whole process, the peak
+    memory of nodes which ran at the same time as another node in the same
+    process isn't measured (and is NaN).
+
+    Parameters
+    ----------
+    trace_memory : bool
+        Whether to record peak memory usage.  Tracing memory allocations
+        slows Python code down substantially.  Default is True.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.records = []
+        self.trace_events = []
+        self._depth = 0
+        self._started_tracing = False
+        self._previous_events = None
+
+    def start(self) -> None:
+        """Start profiling in this thread (e.g. before a DAG run)"""
+        if self._depth == 0:
+            self._started_tracing = (
+                self.trace_memory and not tracemalloc.is_tracing()
+            )
+            if self._started_tracing:
+                tracemalloc.start()
+            self._previous_events = set_trace_events(self.trace_events)
+        self._depth += 1
+
+    def stop(self) -> None:
+        """Stop profiling in this thread (e.g. after a DAG run)"""
+        self._depth -= 1
+        if self._depth == 0:
+            if self._started_tracing:
+                tracemalloc.stop()
+            set_trace_events(self._previous_events)
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def get_runner(self, runner: Callable) -> "ProfiledRunner":
+        """Wrap the function which runs a node so that it's profiled"""
+        return ProfiledRunner(runner, self.trace_memory)
+
+    def record(self, name: str, mode: str, stats: Dict[str, Any]) -> None:
+        """Add a node's statistics to the report"""
+        self.trace_events.extend(stats.pop("trace_events", []))
+        self.records.append({"node": name, "mode": mode, **stats})
+
+    def get_report(self) -> pd.DataFrame:
+        """Get the profiling report
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame with one row per node run, in the order the nodes
+            finished.
+        """
+        return pd.DataFrame(self.records, columns=REPORT_COLUMNS)
+
+    def to_json(self, filename: Optional[str] = None) -> str:
+        """Export the profiling report as JSON
+
+        Parameters
+        ----------
+        filename : Optional[str]
+            File to save the JSON to.  Default is to just return it.
+
+        Returns
+        -------
+        str
+            The report as a JSON list with one object per node run.
+        """
+        report = self.get_report().to_json(orient="records")
+        if filename is not None:
+            with open(filename, "w") as fid:
+                fid.write(report)
+        return report
+
+    def to_chrome_trace(self, filename: str) -> None:
+        """Save the timeline in the Chrome trace event format
+
+        Parameters
+        ----------
+        filename : str
+            JSON file to save the trace to.
+        """
+        with open(filename, "w") as fid:
+            json.dump(
+                {"traceEvents": self.trace_events, "displayTimeUnit": "ms"},
+                fid,
+            )
+
+    def clear(self) -> None:
+        """Remove all the recorded statistics and trace events"""
+        self.records.clear()
+        self.trace_events.clear()
+
+
+class ProfiledRunner:
+    """Runs a node and measures it (see Profiler.get_runner)
+
+    Returns a tuple of the node's outputs and a dict of statistics.  Like
+    the runner it wraps, it can be pickled and called in another process.
+    """
+
+    def __init__(self, runner: Callable, trace_memory: bool):
+        self.runner = runner
+        self.trace_memory = trace_memory
+
+    def __call__(self, node, node_inputs) -> Tuple[Any, Dict[str, Any]]:
+
+        # Start tracing memory if this is a new process
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        if self.trace_memory:
+            measurement = start_measuring_memory()
+            start_memory = tracemalloc.get_traced_memory()[0]
+
+        # Run the node
+        input_rows, input_columns = get_shape(node_inputs)
+        cached = isinstance(node, Cache) and node.is_cached()
+        trace_events = []
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        with recording(trace_events), span(node.name, "node"):
+            node_outputs = self.runner(node, node_inputs)
+        cpu_time = time.process_time() - start_cpu
+        wall_time = time.perf_counter() - start
+
+        # Get the peak memory used
+        peak_memory = np.nan
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stop_measuring_memory(measurement):
+                peak_memory = np.nan
+            elif hasattr(tracemalloc, "reset_peak"):
+                peak_memory = peak - start_memory
+            else:
+                peak_memory = current - start_memory
+        if started_tracing:
+            tracemalloc.stop()
+
+        output_rows, output_columns = get_shape(node_outputs)
+        return node_outputs, {
+            "start": start,
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "peak_memory": peak_memory,
+            "input_rows": input_rows,
+            "input_columns": input_columns,
+            "output_rows": output_rows,
+            "output_columns": output_columns,
+            "cached": cached,
+            "trace_events": trace_events,
+        }
+
+
+# Whether each node whose memory is being measured (in this process) has
+# run at the same time as another node
+_overlapped = {}
+_overlapped_lock = threading.Lock()
+
+
+def start_measuring_memory() -> object:
+    """Start measuring the peak memory used by a node
+
+    Returns a token to pass to :func:`stop_measuring_memory`.
+    """
+    measurement = object()
+    with _overlapped_lock:
+        for other in _overlapped:
+            _overlapped[other] = True
+        _overlapped[measurement] = len(_overlapped) > 0
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+            tracemalloc.reset_peak()
+    return measurement
+
+
+def stop_measuring_memory(measurement: object) -> bool:
+    """Stop measuring the peak memory used by a node
+
+    Returns whether another node was run at the same time (in which case
+    the peak memory includes theirs, and may have been reset by them).
+    """
+    with _overlapped_lock:
+        return _overlapped.pop(measurement)
+
+
+REPORT_COLUMNS = [
+    "node",
+    "mode",
+    "start",
+    "wall_time",
+    "cpu_time",
+    "peak_memory",
+    "input_rows",
+    "input_columns",
+    "output_rows",
+    "output_columns",
+    "copy_time",
+    "cached",
+    "memoized",
+]
+
+
+def get_shape(data: Any) -> Tuple[float, float]:
+    """Get the number of rows and columns in some data
+
+    For tuples (e.g. features and target), the number of rows is the largest
+    number of rows of any element, and the number of columns is the total
+    number of columns.  Returns NaNs for data without a shape.
+    """
+    if isinstance(data, (tuple, list)):
+        shapes = [get_shape(e) for e in data]
+        shapes = [s for s in shapes if not np.isnan(s[0])]
+        if len(shapes) == 0:
+            return np.nan, np.nan
+        return max(s[0] for s in shapes), sum(s[1] for s in shapes)
+    elif isinstance(data, (pd.DataFrame, np.ndarray)) and data.ndim > 1:
+        return data.shape[0], data.shape[1]
+    elif isinstance(data, (pd.Series, np.ndarray)):
+        return len(data), 1
+    else:
+        return np.nan, np.nan
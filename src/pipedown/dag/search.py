@@ -0,0 +1,210 @@
+import math
+from concurrent import futures
+from copy import deepcopy
+from typing import Any, Dict, List
+
+import cloudpickle
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.implementations import (
+    cross_validation_implementation,
+)
+from pipedown.nodes.base import Cache, Node
+from pipedown.utils.null_context import null_context
+
+# Data shared by all the candidates evaluated in a worker process
+_worker_data = {}
+
+
+def successive_halving(
+    dag,
+    candidates: List[Dict[str, Node]],
+    cv_on: str,
+    X: pd.DataFrame,
+    y: pd.Series,
+    metric: str,
+    cv_splitter,
+    cv_implementation,
+    greater_is_better: bool = False,
+    reduction_factor: int = 3,
+    min_rows: int = 100,
+    max_workers: int = 1,
+    random_seed: int = 12345,
+    verbose: bool = False,
+) -> pd.DataFrame:
+    """Find the best of several candidate versions of a DAG by successive
+    halving
+
+    All the candidates are cross-validated on a random subset of the rows,
+    and only the best ``1/reduction_factor`` of them are kept.  The number
+    of rows is then multiplied by ``reduction_factor``, and so on, until the
+    last candidates are cross-validated on all the rows.
+
+    See :meth:`pipedown.dag.DAG.cv_search` for the parameters.
+
+    Returns
+    -------
+    pd.DataFrame
+        The mean of the metric over the folds, for each candidate (column
+        ``candidate``, its index in `candidates`) which was evaluated in each
+        round (column ``rung``) and the number of rows used (``n_rows``).
+    """
+
+    # Number of rows to use in each round
+    n_total = X.shape[0]
+    n_rungs = math.ceil(math.log(len(candidates)) / math.log(reduction_factor))
+    n_rows = [
+        min(n_total, max(min_rows, int(n_total * reduction_factor**-r)))
+        for r in reversed(range(n_rungs + 1))
+    ]
+    rows = np.random.default_rng(random_seed).permutation(n_total)
+
+    # Cross-validate the remaining candidates, and keep the best ones
+    results = []
+    remaining = list(range(len(candidates)))
+    with get_pool(max_workers, X, y) as pool:
+        for rung, n in enumerate(n_rows):
+            ix = np.sort(rows[:n])
+            args = (cv_on, ix, metric, cv_splitter, cv_implementation)
+            dags = [get_candidate_dag(dag, candidates[c]) for c in remaining]
+            if pool is None:
+                scores = [evaluate(d, X, y, *args) for d in dags]
+            else:
+                scores = list(
+                    pool.map(
+                        evaluate_in_worker,
+                        [cloudpickle.dumps(d) for d in dags],
+                        *[[a] * len(dags) for a in args],
+                    )
+                )
+            for c, score in zip(remaining, scores):
+                results.append(
+                    {
+                        "candidate": c,
+                        "rung": rung,
+                        "n_rows": n,
+                        "metric_value": score,
+                    }
+                )
+            if verbose:
+                print(f"Rung {rung}: {len(remaining)} candidates, {n} rows")
+
+            # Keep the best candidates for the next round (ranking failed
+            # candidates, whose scores are NaN, last)
+            order = get_order(scores, greater_is_better)
+            n_keep = math.ceil(len(remaining) / reduction_factor)
+            remaining = [remaining[i] for i in order[:n_keep]]
+
+    return pd.DataFrame.from_records(results)
+
+
+def get_candidate_dag(dag, replacements: Dict[str, Node]):
+    """Get a copy of a DAG with some of its nodes replaced
+
+    Caches aren't copied: candidates can't replace nodes upstream of a
+    cache (see :func:`check_candidates`), so a cache holds the same data
+    for every candidate.
+    """
+    memo = {id(c): c for c in dag.get_nodes(Cache)}
+    dag = deepcopy(dag, memo)
+    dag.replace_nodes({n: deepcopy(c) for n, c in replacements.items()})
+    return dag
+
+
+def get_order(scores: List[float], greater_is_better: bool) -> np.ndarray:
+    """Get the indices of candidates' scores from best to worst, with NaN
+    scores last"""
+    scores = np.asarray(scores, dtype=float)
+    if greater_is_better:
+        scores = -scores
+    return np.argsort(np.where(np.isnan(scores), np.inf, scores))
+
+
+def evaluate(
+    dag,
+    X: pd.DataFrame,
+    y: pd.Series,
+    cv_on: str,
+    ix: np.ndarray,
+    metric: str,
+    cv_splitter,
+    cv_implementation,
+) -> float:
+    """Get the mean of a metric over folds, using rows `ix` of the data"""
+    values = cv_implementation.run(
+        dag, cv_on, X.take(ix), y.take(ix), [metric], cv_splitter
+    )
+    return float(np.mean(values))
+
+
+def get_pool(max_workers: int, X: pd.DataFrame, y: pd.Series) -> Any:
+    """Get a pool of processes to evaluate candidates in (or a context
+    manager which gives None if there's only one worker)"""
+    if max_workers == 1:
+        return null_context()
+    return futures.ProcessPoolExecutor(
+        max_workers,
+        initializer=set_worker_data,
+        initargs=(cloudpickle.dumps((X, y)),),
+    )
+
+
+def set_worker_data(data: bytes) -> None:
+    """Store the data in a worker process (when it's started)"""
+    _worker_data["X"], _worker_data["y"] = cloudpickle.loads(data)
+
+
+def evaluate_in_worker(dag: bytes, *args) -> float:
+    """Evaluate a candidate DAG in a worker process"""
+    dag = cloudpickle.loads(dag)
+    return evaluate(dag, _worker_data["X"], _worker_data["y"], *args)
+
+
+def get_upstream_nodes(dag, name: str) -> List[str]:
+    """Get the names of a node and all the nodes upstream of it"""
+    dag.instantiate_dag("train")
+    upstream = []
+    to_visit = [name]
+    while len(to_visit) > 0:
+        name = to_visit.pop()
+        if name not in upstream:
+            upstream.append(name)
+            to_visit += [p.name for p in dag.get_node(name).get_parents()]
+    return upstream
+
+
+def get_best(results: pd.DataFrame, greater_is_better: bool) -> int:
+    """Get the index of the best candidate from the last round"""
+    last = results[results["rung"] == results["rung"].max()]
+    if greater_is_better:
+        return int(last.loc[last["metric_value"].idxmax(), "candidate"])
+    return int(last.loc[last["metric_value"].idxmin(), "candidate"])
+
+
+def check_candidates(
+    dag, candidates: List[Dict[str, Node]], cv_on: str
+) -> None:
+    """Check the candidates only replace nodes downstream of `cv_on`"""
+    if len(candidates) == 0:
+        raise ValueError("No candidates to search over")
+    upstream = set(get_upstream_nodes(dag, cv_on))
+    for replacements in candidates:
+        for name, node in replacements.items():
+            if name not in dag.get_node_dict():
+                raise ValueError(f"No node named {name} in the DAG")
+            elif name in upstream:
+                raise ValueError(
+                    f"Can't replace node {name}, which isn't downstream of "
+                    f"the node being cross-validated on ({cv_on})"
+                )
+            elif not isinstance(node, Node):
+                raise TypeError(f"Replacement for {name} isn't a Node")
+            elif cross_validation_implementation.get_downstream_caches(
+                dag, name
+            ):
+                raise ValueError(
+                    f"Can't replace node {name}, which is upstream of a "
+                    "cache (which would serve the same data to every "
+                    "candidate)"
+                )
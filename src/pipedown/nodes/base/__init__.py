@@ -1,4 +1,4 @@
-from .cache import Cache
+from .cache import Cache, FileCache
 from .input import Input
 from .loader import Loader
 from .metric import Metric
@@ -1,10 +1,25 @@
+import glob
+import os
 from abc import abstractmethod
-from typing import Any
+from typing import Any, Optional
+
+from pipedown.utils.cv_context import KEY_PREFIX
 
 from .node import Node
 
 
 class Cache(Node):
+
+    streamable = False
+
+    # Fold of cross-validation the cache is being used in, if it's downstream
+    # of the node being cross-validated on (a pipedown.utils.cv_context
+    # CVContext).  While this is set, caches store separate data for the
+    # training and validation data of each fold, and are only cached once
+    # both have been stored.  Like any cache, changes to the nodes upstream
+    # of it aren't detected, so clear it after changing them.
+    cv_context = None
+
     @abstractmethod
     def fit(self, *args, **kwargs) -> None:
         pass
@@ -20,3 +35,52 @@ class Cache(Node):
     @abstractmethod
     def clear_cache(self) -> None:
         pass
+
+    def get_cache_key(self, mode: Optional[str] = None) -> Optional[str]:
+        """Get the key of the data to cache for the current fold of
+        cross-validation (or None if not cross-validating)"""
+        if self.cv_context is None:
+            return None
+        return self.cv_context.get_key(mode)
+
+    def is_caching_validation_data(self) -> bool:
+        """Whether the cache is being run on the validation data of a fold
+        of cross-validation, and so should store the data when it's run"""
+        return self.cv_context is not None and self.cv_context.mode == "test"
+
+
+class FileCache(Cache):
+    """A cache which stores data in a file (``self.filename``)
+
+    When cross-validating, the data for each fold is stored in a separate
+    file, with the fold's key appended to the filename.
+    """
+
+    filename = None
+
+    def is_cached(self) -> bool:
+        if self.cv_context is None:
+            return self.has_data()
+        return all(
+            self.has_data(self.get_cache_key(mode))
+            for mode in ("train", "test")
+        )
+
+    def clear_cache(self) -> None:
+        root, ext = os.path.splitext(self.filename)
+        pattern = f"{glob.escape(root)}-{KEY_PREFIX}*{ext}"
+        for filename in glob.glob(pattern):
+            os.remove(filename)
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def get_filename(self, key: Optional[str] = None) -> str:
+        """Get the name of the file to cache the data for some key in"""
+        if key is None:
+            return self.filename
+        root, ext = os.path.splitext(self.filename)
+        return f"{root}-{key}{ext}"
+
+    def has_data(self, key: Optional[str] = None) -> bool:
+        """Whether the data for some key has been cached"""
+        return os.path.isfile(self.get_filename(key))
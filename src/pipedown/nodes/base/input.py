@@ -1,3 +1,6 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
 import pandas as pd
 
 from pipedown.visualization.node_drawers import square_box_json_icon
@@ -13,11 +16,64 @@ class Input(Node):
     * Pandas DataFrame representing one or more datapoints
     * Pandas Series representing a single datapoint
     * List of dicts represeting one or more datapoints ("record" format)
-    * Dict of lists representing one or more datapoints ("column" format)
+    * Dict of lists (or arrays or Series) representing one or more
+      datapoints ("column" format)
     * Dict representing a single datapoint
+
+    If a schema is given, the data is converted directly to a DataFrame with
+    those columns and dtypes, without having to infer its format or types.
+    This is much faster for small inputs (e.g. a single record when serving
+    predictions).  With a schema, the data can also be a NumPy array with one
+    row per datapoint and the columns in the order of the schema.  Only the
+    columns in the schema are kept, and missing values are filled in with
+    their defaults.
+
+    Parameters
+    ----------
+    schema : Optional[Dict[str, Any]]
+        Dict whose keys are the column names, and values are the NumPy dtype
+        of each column (e.g. "float64" or "object").  Default is to infer the
+        columns and dtypes from the data.
+    defaults : Optional[Dict[str, Any]]
+        Values to use for columns which are missing from the data when using
+        a schema.  Default for columns without a default is None (which is
+        NaN for float columns).  Integer and boolean columns can't hold
+        missing values, so they must have a default.
     """
 
     draw = square_box_json_icon
+    mutates_inputs = False
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Any]] = None,
+        defaults: Optional[Dict[str, Any]] = None,
+    ):
+        self.defaults = {} if defaults is None else defaults
+        if schema is None:
+            self.schema = None
+            return
+        self.schema = {c: np.dtype(d) for c, d in schema.items()}
+        for column, dtype in self.schema.items():
+            if dtype.kind in "biu" and self.defaults.get(column) is None:
+                raise ValueError(
+                    f"Column {column!r} has dtype {dtype}, which can't hold "
+                    "missing values, so must have a default"
+                )
+
+        # Group the columns by dtype, so each dtype can be created at once
+        self._columns = pd.Index(self.schema)
+        self._dtype_columns = {}
+        for column, dtype in self.schema.items():
+            self._dtype_columns.setdefault(dtype, []).append(column)
+        self._dtype_positions = {
+            dtype: [self._columns.get_loc(c) for c in columns]
+            for dtype, columns in self._dtype_columns.items()
+        }
+        self._dtype_index = {
+            dtype: pd.Index(columns)
+            for dtype, columns in self._dtype_columns.items()
+        }
 
     def run(self, data, format="auto"):
         """Convert data to DataFrame"""
@@ -33,6 +89,10 @@ class Input(Node):
         ]:
             raise ValueError("Invalid format")
 
+        # Use the schema if there is one
+        if format == "auto" and getattr(self, "schema", None) is not None:
+            return self.from_schema(data)
+
         # Convert the data
         if format == "dataframe" or (
             format == "auto" and isinstance(data, pd.DataFrame)
@@ -56,3 +116,78 @@ class Input(Node):
             return pd.DataFrame.from_dict(data)
         else:  # assume just one record
             return pd.DataFrame.from_records([data])
+
+    def from_schema(self, data) -> pd.DataFrame:
+        """Convert data to a DataFrame with the columns and dtypes of the
+        schema"""
+
+        # Create a 2D array for each dtype
+        if isinstance(data, pd.DataFrame):
+            return self.apply_schema(data)
+        elif isinstance(data, pd.Series):
+            data = data.to_dict()
+        if isinstance(data, np.ndarray):  # one row per datapoint
+            data = np.atleast_2d(data)
+            blocks = {
+                dtype: data[:, positions].astype(dtype, copy=False)
+                for dtype, positions in self._dtype_positions.items()
+            }
+        elif (
+            isinstance(data, dict)
+            and len(data) > 0
+            and all(
+                isinstance(v, (list, np.ndarray, pd.Series))
+                for v in data.values()
+            )
+        ):  # "column" format
+            n_rows = len(next(iter(data.values())))
+            blocks = {
+                dtype: np.array(
+                    [
+                        np.asarray(
+                            data.get(c, [self.defaults.get(c)] * n_rows)
+                        )
+                        for c in columns
+                    ],
+                    dtype=dtype,
+                ).T
+                for dtype, columns in self._dtype_columns.items()
+            }
+        else:  # one record or a list of records
+            records = [data] if isinstance(data, dict) else data
+            blocks = {
+                dtype: np.array(
+                    [
+                        [r.get(c, self.defaults.get(c)) for c in columns]
+                        for r in records
+                    ],
+                    dtype=dtype,
+                )
+                for dtype, columns in self._dtype_columns.items()
+            }
+
+        # Convert to a DataFrame with the columns in the schema's order
+        frames = [
+            pd.DataFrame(
+                blocks[dtype].reshape(-1, len(columns)),
+                columns=columns,
+                copy=False,
+            )
+            for dtype, columns in self._dtype_index.items()
+        ]
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, axis=1).reindex(columns=self._columns)
+
+    def apply_schema(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Get the columns of a DataFrame which are in the schema, with their
+        dtypes (filling in missing columns with their defaults)"""
+        if data.columns.equals(self._columns) and list(data.dtypes) == list(
+            self.schema.values()
+        ):
+            return data
+        df = data.reindex(columns=self._columns)
+        for column in self._columns.difference(data.columns):
+            if self.defaults.get(column) is not None:
+                df[column] = self.defaults[column]
+        return df.astype(self.schema)
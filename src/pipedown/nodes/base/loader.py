@@ -6,3 +6,4 @@ from .node import Node
 class Loader(Node):
 
     draw = square_box_database_icon
+    streamable = False
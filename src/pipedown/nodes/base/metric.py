@@ -8,6 +8,8 @@ from .node import Node
 class Metric(Node):
 
     draw = rounded_box_metric_icon
+    mutates_inputs = False
+    streamable = False
 
     @abstractmethod
     def run(self, y_pred, y_true):
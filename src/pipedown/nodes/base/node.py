@@ -12,6 +12,24 @@ class Node(BaseNode):
 
     draw = rounded_box_fn_icon
 
+    # Whether fit() or run() modify their input data in place.  Nodes which
+    # don't can be passed their parents' outputs without copying them.
+    mutates_inputs = True
+
+    # Whether run() processes each row of its input independently, so that
+    # running it on chunks of the data gives the same outputs (in chunks) as
+    # running it on all the data at once.
+    streamable = True
+
+    # Whether the node's outputs don't depend on the data it was fit on, and
+    # run() processes each row using only that row's values (not e.g. the
+    # mean of a column), so cross-validation can run it once on all the data
+    # instead of on every fold.
+    stateless = False
+
+    # Nodes which can continue fitting from their current state on more data
+    # can also define partial_fit(), which is called instead of fit() when
+    # warm-starting (see DAG.fit).
     def fit(self, *args, **kwargs):
         pass
 
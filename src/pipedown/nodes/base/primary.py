@@ -30,6 +30,7 @@ class Primary(Node):
     """
 
     draw = square_box_highlight
+    mutates_inputs = False
 
     def __init__(self, x: List[str], y: str):
         self.x = x
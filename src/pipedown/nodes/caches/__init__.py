@@ -1,3 +1,4 @@
 from .feather_cache import FeatherCache
 from .in_memory_cache import InMemoryCache
+from .parquet_cache import ParquetCache
 from .pickle_cache import PickleCache
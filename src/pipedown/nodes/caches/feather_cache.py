@@ -1,16 +1,17 @@
-import os
 import uuid
 from typing import Optional
 
 import pandas as pd
 
-from pipedown.nodes.base import Cache
+from pipedown.nodes.base import FileCache
 from pipedown.utils.urls import get_node_url
 
 
-class FeatherCache(Cache):
+class FeatherCache(FileCache):
     """Cache data in a feather file.
 
+    When cross-validating, the index of each fold's data is cached too.
+
     Note that this node requires the following packages:
 
     * [pyarrow](https://pypi.org/project/pyarrow/)
@@ -26,16 +27,30 @@ class FeatherCache(Cache):
 
     def fit(self, data: Optional[pd.DataFrame] = None) -> None:
         if not self.is_cached():
-            data.reset_index(drop=True).to_feather(self.filename)
+            self.write(data, self.get_cache_key())
 
     def run(self, data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
-        if self.is_cached():
-            return pd.read_feather(self.filename)
+        key = self.get_cache_key()
+        if self.is_caching_validation_data() and not self.has_data(key):
+            self.write(data, key)
+            return data
+        elif self.is_cached():
+            return self.read(key)
         else:
             return data
 
-    def is_cached(self) -> bool:
-        return os.path.exists(self.filename) and os.path.isfile(self.filename)
+    def write(self, data: pd.DataFrame, key: Optional[str] = None) -> None:
+        """Write data to the file for some key"""
+        if key is None:
+            data.reset_index(drop=True).to_feather(self.filename)
+        else:
+            data.rename_axis("__index__").reset_index().to_feather(
+                self.get_filename(key)
+            )
 
-    def clear_cache(self) -> None:
-        os.remove(self.filename)
+    def read(self, key: Optional[str] = None) -> pd.DataFrame:
+        """Read the data from the file for some key"""
+        if key is None:
+            return pd.read_feather(self.filename)
+        data = pd.read_feather(self.get_filename(key))
+        return data.set_index("__index__").rename_axis(None)
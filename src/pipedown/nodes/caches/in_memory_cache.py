@@ -7,26 +7,44 @@ from pipedown.utils.urls import get_node_url
 
 
 class InMemoryCache(Cache):
-    """Cache data in memory"""
+    """Cache data in memory
+
+    When cross-validating, the data for each fold is cached separately.
+    """
 
     CODE_URL = get_node_url("caches/in_memory_cache.py")
 
     def __init__(self):
         self._data = None
+        self._fold_data = {}
 
     def fit(self, data: Optional[pd.DataFrame] = None) -> None:
-        if self._data is None:
+        key = self.get_cache_key()
+        if key is not None:
+            if not self.is_cached():
+                self._fold_data[key] = data
+        elif self._data is None:
             self._data = data
 
     def run(self, data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
-        if self.is_cached():
-            return self._data
+        key = self.get_cache_key()
+        if self.is_caching_validation_data() and key not in self._fold_data:
+            self._fold_data[key] = data
+            return data
+        elif self.is_cached():
+            return self._data if key is None else self._fold_data[key]
         else:
             return data
 
     def is_cached(self) -> bool:
-        return self._data is not None
+        if self.cv_context is None:
+            return self._data is not None
+        return all(
+            self.get_cache_key(mode) in self._fold_data
+            for mode in ("train", "test")
+        )
 
     def clear_cache(self) -> None:
         del self._data
         self._data = None
+        self._fold_data = {}
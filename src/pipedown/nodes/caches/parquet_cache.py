@@ -0,0 +1,232 @@
+import json
+import operator
+import uuid
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from pipedown.nodes.base import FileCache
+from pipedown.nodes.filters import FeatureFilter
+from pipedown.utils.urls import get_node_url
+
+# Column the target is stored in, and metadata key for the target's name
+Y_COLUMN = "__y__"
+Y_NAME_KEY = b"pipedown.y_name"
+
+# Operators which can be used in filters
+FILTER_OPS = {
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda field, value: field.isin(value),
+    "not in": lambda field, value: ~field.isin(value),
+}
+
+
+class ParquetCache(FileCache):
+    """Cache data in a parquet file.
+
+    Unlike :class:`.FeatherCache`, the index is kept, the data is
+    compressed, and reads can be limited to some of the columns and to the
+    row groups which match some filters.  If `columns` isn't set and all the
+    cache's children are :class:`.FeatureFilter` nodes, only the columns
+    they use are read.  The cache can be passed features and (optionally) a
+    target, in which case it returns both.
+
+    Note that this node requires the following packages:
+
+    * [pyarrow](https://pypi.org/project/pyarrow/)
+
+    Parameters
+    ----------
+    filename : Optional[str]
+        File to cache the data in.  Default is a new file in the current
+        directory.
+    compression : str
+        Compression codec to use, e.g. 'zstd', 'snappy', 'gzip', or 'none'.
+        Default = 'zstd'
+    compression_level : Optional[int]
+        Compression level (for codecs which have one).  Default is the
+        codec's default.
+    row_group_size : Optional[int]
+        Maximum number of rows in each row group.  Smaller row groups let
+        `filters` skip more of the data, but compress less well.  Default is
+        pyarrow's default.
+    columns : Optional[List[str]]
+        Columns to read from the cache.  Default is to read the columns used
+        by the cache's children if they're all FeatureFilters, otherwise all
+        the columns.
+    filters : Optional[List[Tuple]]
+        Only return rows which match these filters, in the format of
+        ``pyarrow.parquet.read_table``, e.g. ``[("year", ">=", 2020)]``.  When
+        reading from the cache, row groups whose statistics don't match are
+        skipped.  Can't be used on a cache downstream of the node being
+        cross-validated on, since each fold's outputs must have a row for
+        every validation row.  Default is to return all the rows.
+
+    The columns and filters are applied the same way whether the data is
+    read from the cache or passed through it (before it is cached).
+    """
+
+    CODE_URL = get_node_url("caches/parquet_cache.py")
+
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+        row_group_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        filters: Optional[List[Tuple]] = None,
+    ):
+        if filename is not None:
+            self.filename = filename
+        else:
+            self.filename = f"ParquetCache-{uuid.uuid4()}.parquet"
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.columns = columns
+        self.filters = filters
+        self.reset_connections()
+
+    def fit(
+        self, X: Optional[pd.DataFrame] = None, y: Optional[pd.Series] = None
+    ) -> None:
+        self.check_filters()
+        if not self.is_cached():
+            self.write(X, y, self.get_cache_key())
+
+    def run(
+        self, X: Optional[pd.DataFrame] = None, y: Optional[pd.Series] = None
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.Series]]:
+        self.check_filters()
+        key = self.get_cache_key()
+        if self.is_caching_validation_data() and not self.has_data(key):
+            self.write(X, y, key)
+            return self.read(key)
+        elif self.is_cached():
+            return self.read(key)
+        elif X is None:
+            return X
+        table = to_table(X, y)
+        if self.filters is not None:
+            table = ds.dataset(table).to_table(
+                filter=get_filter_expression(self.filters)
+            )
+        columns = self.get_columns()
+        if columns is not None:
+            table = table.select(get_column_names(table.schema, columns))
+        return from_table(table)
+
+    def check_filters(self) -> None:
+        """Check filters aren't used while cross-validating"""
+        if self.filters is not None and self.cv_context is not None:
+            raise ValueError(
+                "Can't use filters in a ParquetCache downstream of the node "
+                "being cross-validated on"
+            )
+
+    def get_columns(self) -> Optional[List[str]]:
+        """Get the columns to read (or None to read all of them)"""
+        if self.columns is not None:
+            return self.columns
+        children = self.get_children()
+        if len(children) == 0 or not all(
+            isinstance(c, FeatureFilter) for c in children
+        ):
+            return None
+        columns = []
+        for child in sorted(children, key=lambda c: c.name):
+            columns += [f for f in child.features if f not in columns]
+        return columns
+
+    def write(
+        self,
+        X: pd.DataFrame,
+        y: Optional[pd.Series] = None,
+        key: Optional[str] = None,
+    ) -> None:
+        """Write data to the file for some key"""
+        pq.write_table(
+            to_table(X, y),
+            self.get_filename(key),
+            compression=self.compression,
+            compression_level=self.compression_level,
+            row_group_size=self.row_group_size,
+        )
+
+    def read(
+        self, key: Optional[str] = None
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.Series]]:
+        """Read the data from the file for some key"""
+        filename = self.get_filename(key)
+        columns = self.get_columns()
+        if columns is not None:
+            columns = get_column_names(pq.read_schema(filename), columns)
+        table = pq.read_table(
+            filename,
+            columns=columns,
+            filters=self.filters,
+            use_pandas_metadata=True,
+        )
+        return from_table(table)
+
+
+def to_table(X: pd.DataFrame, y: Optional[pd.Series] = None) -> pa.Table:
+    """Convert features (and optionally a target) to an arrow Table"""
+    table = pa.Table.from_pandas(X, preserve_index=True)
+    if y is None:
+        return table
+    table = table.append_column(Y_COLUMN, pa.Array.from_pandas(y))
+    return table.replace_schema_metadata(
+        {
+            **table.schema.metadata,
+            Y_NAME_KEY: json.dumps(y.name, default=str),
+        }
+    )
+
+
+def from_table(
+    table: pa.Table,
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.Series]]:
+    """Convert an arrow Table from :func:`to_table` back to features (and a
+    target, if it has one)"""
+    X = table.to_pandas()
+    if Y_COLUMN not in table.schema.names:
+        return X
+    y_name = json.loads(table.schema.metadata[Y_NAME_KEY])
+    return X, X.pop(Y_COLUMN).rename(y_name)
+
+
+def get_column_names(schema: pa.Schema, columns: List[str]) -> List[str]:
+    """Get the names of some columns, and of the target and index columns
+    (which are always kept), in a table's schema"""
+    index = schema.pandas_metadata["index_columns"]
+    keep = columns + [Y_COLUMN] + [c for c in index if isinstance(c, str)]
+    return [c for c in keep if c in schema.names]
+
+
+def get_filter_expression(filters: List) -> ds.Expression:
+    """Convert filters in the format of ``pyarrow.parquet.read_table`` to
+    an expression (like ``pyarrow.parquet.filters_to_expression``, which
+    needs pyarrow 10+)"""
+    if not isinstance(filters[0], list):
+        filters = [filters]
+    expression = None
+    for conjunction in filters:
+        term = None
+        for column, op, value in conjunction:
+            if op not in FILTER_OPS:
+                raise ValueError(f"Invalid filter operator {op!r}")
+            condition = FILTER_OPS[op](ds.field(column), value)
+            term = condition if term is None else term & condition
+        expression = term if expression is None else expression | term
+    return expression
@@ -1,11 +1,11 @@
-import os
 import pickle
+from typing import Optional
 
-from pipedown.nodes.base import Cache
+from pipedown.nodes.base import FileCache
 from pipedown.utils.urls import get_node_url
 
 
-class PickleCache(Cache):
+class PickleCache(FileCache):
     """Cache data in a pickle file"""
 
     CODE_URL = get_node_url("caches/feather_cache.py")
@@ -14,13 +14,18 @@ class PickleCache(Cache):
         self.filename = filename
 
     def fit(self, *args):
-        if len(args) > 0:
-            with open(self.filename, "wb") as fid:
-                pickle.dump(args, fid)
+        if len(args) > 0 and not (
+            self.cv_context is not None and self.is_cached()
+        ):
+            self.write(args, self.get_cache_key())
 
     def run(self, *args):
-        if self.is_cached():
-            with open(self.filename, "rb") as fid:
+        key = self.get_cache_key()
+        if self.is_caching_validation_data() and not self.has_data(key):
+            self.write(args, key)
+            return args
+        elif self.is_cached():
+            with open(self.get_filename(key), "rb") as fid:
                 args_out = pickle.load(fid)
             if isinstance(args_out, tuple) and len(args_out) == 1:
                 return args_out[0]
@@ -29,8 +34,7 @@ class PickleCache(Cache):
         else:
             return args
 
-    def is_cached(self) -> bool:
-        return os.path.exists(self.filename) and os.path.isfile(self.filename)
-
-    def clear_cache(self) -> None:
-        os.remove(self.filename)
+    def write(self, args: tuple, key: Optional[str] = None) -> None:
+        """Write data to the file for some key"""
+        with open(self.get_filename(key), "wb") as fid:
+            pickle.dump(args, fid)
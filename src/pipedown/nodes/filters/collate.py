@@ -9,6 +9,8 @@ class Collate(Node):
     """Collate multiple data streams into a single one"""
 
     CODE_URL = get_node_url("filters/collate.py")
+    mutates_inputs = False
+    streamable = False
 
     def run(self, *args):
 
@@ -10,6 +10,8 @@ class FeatureFilter(Node):
     """Filter features / fields down to a specific subset"""
 
     CODE_URL = get_node_url("filters/feature_filter.py")
+    mutates_inputs = False
+    stateless = True
 
     def __init__(self, features: List[str]):
         self.features = features
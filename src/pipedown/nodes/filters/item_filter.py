@@ -11,6 +11,7 @@ class ItemFilter(Node):
     """Filter datapoints down to a subset matching some condition"""
 
     CODE_URL = get_node_url("filters/item_filter.py")
+    mutates_inputs = False
 
     def __init__(self, filter_function: Callable):
         self.filter_function = filter_function
@@ -45,6 +45,7 @@ class CatBoostRegressorModel(Model):
     """
 
     CODE_URL = get_node_url("models/catboost_regressor_model.py")
+    mutates_inputs = False
 
     def __init__(self, **kwargs):
         self.model = CatBoostRegressor(**kwargs)
@@ -52,5 +53,11 @@ class CatBoostRegressorModel(Model):
     def fit(self, X: pd.DataFrame, y: Optional[pd.Series]) -> None:
         self.model = self.model.fit(X, y)
 
+    def partial_fit(self, X: pd.DataFrame, y: Optional[pd.Series]) -> None:
+        """Continue fitting the model (adding more trees) on new data"""
+        if not self.model.is_fitted():
+            return self.fit(X, y)
+        self.model = self.model.fit(X, y, init_model=self.model)
+
     def predict(self, X: pd.DataFrame) -> pd.Series:
         return pd.Series(data=self.model.predict(X), index=X.index)
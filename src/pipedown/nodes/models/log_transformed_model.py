@@ -36,6 +36,10 @@ class LogTransformedModel(Model):
         self._mean = None
         self._std = None
 
+    @property
+    def mutates_inputs(self):
+        return self.base_model.mutates_inputs
+
     def fit(self, X: pd.DataFrame, y: pd.Series) -> None:
         log_y = np.log(y)
         self._mean = np.nanmean(log_y)
@@ -22,6 +22,7 @@ class NullFallback(Node):
     """
 
     CODE_URL = get_node_url("transforms/null_fallback.py")
+    stateless = True
 
     def __init__(self, fallback_list: List[Tuple[str, str]], n: int = 1):
         super().__init__()
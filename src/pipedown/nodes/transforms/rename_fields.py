@@ -18,6 +18,7 @@ class RenameFields(Node):
     """
 
     CODE_URL = get_node_url("transforms/rename_fields.py")
+    stateless = True
 
     def __init__(self, field_map: Dict[str, str]):
         self.field_map = field_map
@@ -0,0 +1,74 @@
+import hashlib
+from typing import NamedTuple, Optional
+
+import cloudpickle
+
+# Prefix of the keys of data cached for a fold of cross-validation
+KEY_PREFIX = "cv-"
+
+
+class CVContext(NamedTuple):
+    """Fold of cross-validation which a node is being fit or run on
+
+    Cache nodes downstream of the node being cross-validated on are given a
+    context for each fold, so that they store separate data for each fold
+    (and for the training and validation data of each fold), instead of
+    returning the first fold's data for every fold.
+
+    Attributes
+    ----------
+    fingerprint : str
+        Fingerprint of the (set up) splitter, and so of which rows are in
+        each fold (see :func:`get_cv_fingerprint`).
+    fold : int
+        Index of the fold
+    mode : str {'train' or 'test'}
+        Whether the node is being fit and run on the fold's training data
+        ('train') or run on its validation data ('test').
+    """
+
+    fingerprint: str
+    fold: int
+    mode: str = "train"
+
+    def get_key(self, mode: Optional[str] = None) -> str:
+        """Get a key for the data for this fold
+
+        Parameters
+        ----------
+        mode : Optional[str]
+            Mode to get the key for.  Default is the context's mode.
+
+        Returns
+        -------
+        str
+            Key, which can be used in a filename
+        """
+        mode = self.mode if mode is None else mode
+        return f"{KEY_PREFIX}{self.fingerprint[:16]}-{self.fold}-{mode}"
+
+
+def get_cv_fingerprint(splitter, incremental: bool = False) -> str:
+    """Get a fingerprint of a set up splitter
+
+    Splitters which split the data in the same way (e.g. the same type of
+    splitter, with the same parameters, set up on data with the same number
+    of rows) have the same fingerprint.
+
+    Parameters
+    ----------
+    splitter : pipedown.cross_validation.splitters.CrossValidationSplitter
+        The splitter, which must have been set up.
+    incremental : bool
+        Whether each fold after the first is only fit on the training rows
+        which weren't in the previous fold.
+
+    Returns
+    -------
+    str
+        The fingerprint
+    """
+    fingerprint = hashlib.sha256(cloudpickle.dumps(splitter))
+    if incremental:
+        fingerprint.update(b"incremental")
+    return fingerprint.hexdigest()
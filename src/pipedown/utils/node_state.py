@@ -0,0 +1,13 @@
+from typing import Any, Dict
+
+CONNECTIONS = ("_parents", "_children")
+
+
+def get_node_state(node) -> Dict[str, Any]:
+    """Get a node's attributes, excluding its connections to other nodes"""
+    return {k: v for k, v in node.__dict__.items() if k not in CONNECTIONS}
+
+
+def set_node_state(node, state: Dict[str, Any]) -> None:
+    """Update a node's attributes, e.g. after it was fit somewhere else"""
+    node.__dict__.update(state)
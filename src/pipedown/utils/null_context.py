@@ -0,0 +1,10 @@
+from contextlib import contextmanager
+
+
+@contextmanager
+def null_context():
+    """Context manager which does nothing (and gives None)
+
+    Used instead of ``contextlib.nullcontext``, which needs Python 3.7+.
+    """
+    yield
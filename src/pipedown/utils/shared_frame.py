@@ -0,0 +1,83 @@
+import os
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+# Kinds of numpy dtypes which can be stored in a memory-mapped array
+MEMMAP_KINDS = "biufcmM"
+
+
+class SharedFrame:
+    """A DataFrame or Series stored in memory-mapped files, so that several
+    processes can share one copy of it.
+
+    Columns with a plain numpy dtype are written to one Fortran-ordered
+    ``.npy`` file per dtype, and loaded as read-only memory maps, without
+    copying.  Any other columns (object, categorical, etc), and the index,
+    are kept on this object and so are pickled along with it.
+
+    Parameters
+    ----------
+    data : Union[pd.DataFrame, pd.Series]
+        Data to share
+    directory : str
+        Directory in which to write the memory-mapped files.  Use a
+        directory on a RAM-backed filesystem (e.g. ``/dev/shm`` on Linux) to
+        keep the data in shared memory.
+    """
+
+    def __init__(self, data: Union[pd.DataFrame, pd.Series], directory: str):
+        self.is_series = isinstance(data, pd.Series)
+        df = data.to_frame() if self.is_series else data
+        self.name = data.name if self.is_series else None
+        self.columns = df.columns
+        self.index = df.index
+        self.dtypes = list(df.dtypes)
+
+        # Write columns with numpy dtypes to a memory-mapped file per dtype
+        self.files = {}  # dtype -> (filename, column positions)
+        self.other = {}  # column position -> pd.Series
+        groups = {}
+        for i, dtype in enumerate(self.dtypes):
+            if isinstance(dtype, np.dtype) and dtype.kind in MEMMAP_KINDS:
+                groups.setdefault(dtype, []).append(i)
+            else:
+                self.other[i] = df.iloc[:, i]
+        for j, (dtype, positions) in enumerate(groups.items()):
+            filename = os.path.join(directory, f"{id(self)}_{j}.npy")
+            arr = np.lib.format.open_memmap(
+                filename,
+                mode="w+",
+                dtype=dtype,
+                shape=(df.shape[0], len(positions)),
+                fortran_order=True,
+            )
+            for k, i in enumerate(positions):
+                arr[:, k] = df.iloc[:, i].values
+            arr.flush()
+            del arr
+            self.files[dtype] = (filename, positions)
+
+    def load(self) -> Union[pd.DataFrame, pd.Series]:
+        """Load the data, backed by (read-only) memory maps
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series]
+            The shared data
+        """
+        columns = {i: series.values for i, series in self.other.items()}
+        for filename, positions in self.files.values():
+            arr = np.asarray(np.load(filename, mmap_mode="r"))
+            for k, i in enumerate(positions):
+                columns[i] = arr[:, k]
+        df = pd.DataFrame(
+            {i: columns[i] for i in range(len(self.dtypes))},
+            index=self.index,
+            copy=False,
+        )
+        df.columns = self.columns
+        if self.is_series:
+            return df.iloc[:, 0].rename(self.name)
+        return df
@@ -0,0 +1,66 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional
+
+# Trace events are recorded to a per-thread list, so code which doesn't have
+# access to the pipedown.dag.Profiler (e.g. a node running in a worker
+# process) can still record them
+_recording = threading.local()
+
+
+def set_trace_events(trace_events: Optional[List]) -> Optional[List]:
+    """Set the list to record this thread's trace events to
+
+    Returns the previous list (or None if events weren't being recorded).
+    """
+    previous = getattr(_recording, "trace_events", None)
+    _recording.trace_events = trace_events
+    return previous
+
+
+@contextmanager
+def recording(trace_events: List):
+    """Record this thread's trace events to a list within a context"""
+    previous = set_trace_events(trace_events)
+    try:
+        yield
+    finally:
+        set_trace_events(previous)
+
+
+@contextmanager
+def span(name: str, category: str, **args):
+    """Record a span of time as a trace event, if events are being recorded
+
+    Parameters
+    ----------
+    name : str
+        Name of the span (e.g. the node's name)
+    category : str
+        What was happening (e.g. 'fit' or 'run')
+    **args
+        Any other info to show for the span
+    """
+    trace_events = getattr(_recording, "trace_events", None)
+    if trace_events is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        trace_events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",  # complete event
+                "ts": 1e6 * start,
+                "dur": 1e6 * (end - start),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+        )
@@ -0,0 +1,134 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.implementations import ProcessPool, Sequential
+from pipedown.cross_validation.splitters import RandomSplitter
+from pipedown.dag import DAG, Profiler
+from pipedown.nodes.base import Input, Model, Node, Primary
+from pipedown.nodes.metrics import MeanSquaredError
+
+
+class MyNode(Node):
+    def fit(self, X, y):
+        self.x_mean = X.mean()
+
+    def run(self, X, y):
+        return X + self.x_mean, y
+
+
+class MyModel(Model):
+    def fit(self, X, y):
+        self.noise = np.random.randn()
+        self.mean = y.mean()
+
+    def predict(self, X):
+        return X["a"] * 0 + self.mean + self.noise
+
+
+def test_process_pool():
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "my_node1": MyNode(),
+                "my_node2": MyNode(),
+                "my_model": MyModel(),
+            }
+
+        def edges(self):
+            return {
+                "my_node2": "my_node1",
+                "my_model": "my_node2",
+            }
+
+    X = pd.DataFrame({"a": np.random.randn(100), "b": np.random.randn(100)})
+    y = pd.Series(np.random.randn(100))
+    splitter = RandomSplitter(n_folds=4)
+
+    # Should give the same folds as sequential (apart from random noise)
+    outputs = ProcessPool(max_workers=2, random_seed=1).run(
+        MyDAG(), "my_node1", X, y, ["my_model"], splitter
+    )
+    np.random.seed(1)
+    expected = Sequential().run(
+        MyDAG(), "my_node1", X, y, ["my_model"], splitter
+    )
+    assert len(outputs) == 4
+    for (y_pred, y_true), (expected_pred, expected_true) in zip(
+        outputs, expected
+    ):
+        pd.testing.assert_series_equal(y_true, expected_true)
+        pd.testing.assert_index_equal(y_pred.index, expected_pred.index)
+
+    # Folds should be deterministic w/ a random seed
+    again = ProcessPool(max_workers=3, random_seed=1, memmap=False).run(
+        MyDAG(), "my_node1", X, y, ["my_model"], splitter
+    )
+    for (y_pred, _), (y_pred_again, _) in zip(outputs, again):
+        pd.testing.assert_series_equal(y_pred, y_pred_again)
+
+
+def test_process_pool_cv_metric():
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a", "b"], "c"),
+                "my_node": MyNode(),
+                "my_model": MyModel(),
+                "mse": MeanSquaredError(),
+            }
+
+        def edges(self):
+            return {
+                "primary": {"test": "input", "train": "input"},
+                "my_node": "primary",
+                "my_model": "my_node",
+                "mse": "my_model",
+            }
+
+    df = pd.DataFrame(
+        {
+            "a": np.random.randn(100),
+            "b": np.random.randn(100),
+            "c": np.random.randn(100),
+        }
+    )
+    profiler = Profiler(trace_memory=False)
+    metrics = MyDAG().cv_metric(
+        {"input": df},
+        cv_splitter=RandomSplitter(n_folds=3),
+        cv_implementation=ProcessPool(),
+        profiler=profiler,
+    )
+    assert isinstance(metrics, pd.DataFrame)
+    assert metrics.shape[0] == 3
+    assert metrics["fold"].tolist() == [0, 1, 2]
+
+    # Profiling results from the workers should be collected
+    report = profiler.get_report()
+    assert (report["node"] == "my_model").sum() == 6
+    folds = [e for e in profiler.trace_events if e["cat"] == "cv"]
+    assert len(folds) == 3
+    assert os.getpid() not in {e["pid"] for e in folds}
+
+
+def test_process_pool_node_states():
+    class MyDAG(DAG):
+        def nodes(self):
+            return {"my_node": MyNode(), "my_model": MyModel()}
+
+        def edges(self):
+            return {"my_model": "my_node"}
+
+    X = pd.DataFrame({"a": np.random.randn(30), "b": np.random.randn(30)})
+    y = pd.Series(np.random.randn(30))
+    splitter = RandomSplitter(n_folds=3)
+    results = ProcessPool(max_workers=2).run(
+        MyDAG(), "my_node", X, y, "my_model", splitter, return_node_states=True
+    )
+    assert len(results) == 3
+    for i, (y_pred, node_states) in enumerate(results):
+        _, y_train, _, _ = splitter.get_fold(X, y, i)
+        assert node_states["my_model"]["mean"] == y_train.mean()
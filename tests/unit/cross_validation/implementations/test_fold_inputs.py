@@ -0,0 +1,246 @@
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.implementations import ProcessPool, Sequential
+from pipedown.cross_validation.implementations.fold_inputs import (
+    get_stateless_nodes,
+    is_stateless,
+)
+from pipedown.cross_validation.splitters import RandomSplitter
+from pipedown.dag import DAG
+from pipedown.nodes.base import Input, Model, Node, Primary
+from pipedown.nodes.filters import FeatureFilter, ItemFilter
+from pipedown.nodes.transforms import NullFallback
+
+run_counts = {}
+
+
+class Counted(Node):
+    """Stateless node which counts how many times it's run"""
+
+    stateless = True
+
+    def __init__(self, key):
+        self.key = key
+
+    def run(self, X, y):
+        run_counts[self.key] = run_counts.get(self.key, 0) + 1
+        return X * 2, y
+
+
+class Scaler(Node):
+    def fit(self, X, y):
+        self.mean = X.mean()
+
+    def run(self, X, y):
+        return X - self.mean, y
+
+
+class MarkedScaler(Scaler):
+    stateless = True
+
+
+class Centerer(Node):
+    """Doesn't need to be fit, but isn't stateless"""
+
+    def run(self, X, y):
+        return X - X.mean(), y
+
+
+class PositiveFilter(ItemFilter):
+    stateless = True
+
+    def __init__(self):
+        super().__init__(lambda X: X["a"] > -1)
+
+
+class MyModel(Model):
+    def fit(self, X, y):
+        self.coef = (X["a"] * y).sum() / (X["a"] ** 2).sum()
+
+    def predict(self, X):
+        return X["a"] * self.coef
+
+
+class MyDAG(DAG):
+    def nodes(self):
+        return {
+            "input": Input(),
+            "primary": Primary(["a", "b"], "c"),
+            "features": FeatureFilter(["a"]),
+            "double": Counted("double"),
+            "positive": PositiveFilter(),
+            "scaler": Scaler(),
+            "model": MyModel(),
+        }
+
+    def edges(self):
+        return {
+            "primary": "input",
+            "features": "primary",
+            "double": "features",
+            "positive": "double",
+            "scaler": "positive",
+            "model": "scaler",
+        }
+
+
+class NullCounter(Model):
+    """Predicts whether each row's "a" is missing"""
+
+    def fit(self, X, y):
+        pass
+
+    def predict(self, X):
+        return X["a"].isnull().astype(float)
+
+
+class SiblingDAG(DAG):
+    def nodes(self):
+        return {
+            "input": Input(),
+            "primary": Primary(["a", "b"], "c"),
+            "fallback": NullFallback([("a", "b")]),
+            "m1": NullCounter(),
+            "m2": NullCounter(),
+        }
+
+    def edges(self):
+        return {
+            "primary": "input",
+            "fallback": "primary",
+            "m1": "fallback",
+            "m2": "primary",
+        }
+
+
+def get_df(n=100):
+    return pd.DataFrame(
+        {
+            "a": np.random.randn(n),
+            "b": np.random.randn(n),
+            "c": np.random.randn(n),
+        },
+        index=np.arange(n) * 3,
+    )
+
+
+def test_is_stateless():
+    assert is_stateless(FeatureFilter(["a"]))
+    assert is_stateless(Counted("a"))
+    assert not is_stateless(Centerer())
+    assert not is_stateless(ItemFilter(lambda X: X["a"] > -1))
+    assert not is_stateless(Scaler())
+    assert is_stateless(MarkedScaler())
+    assert not is_stateless(MyModel())
+
+
+def test_get_stateless_nodes():
+    dag = MyDAG()
+    dag.instantiate_dag("train")
+    assert get_stateless_nodes(dag, "primary", "model") == {
+        "features",
+        "double",
+        "positive",
+    }
+
+    # Output nodes should be run on each fold
+    assert get_stateless_nodes(dag, "primary", "double") == {"features"}
+
+    # As should nodes which aren't marked stateless
+    class MyDAG4(MyDAG):
+        def nodes(self):
+            return {**super().nodes(), "double": Centerer()}
+
+    dag = MyDAG4()
+    dag.instantiate_dag("train")
+    assert get_stateless_nodes(dag, "primary", "model") == {"features"}
+
+    # And nodes downstream of stateful nodes
+    class MyDAG2(MyDAG):
+        def nodes(self):
+            return {**super().nodes(), "scaler2": MarkedScaler()}
+
+        def edges(self):
+            return {**super().edges(), "scaler": "features"}
+
+    dag = MyDAG2()
+    dag.instantiate_dag("train")
+    assert get_stateless_nodes(dag, "primary", "model") == {"features"}
+
+    # Or nodes whose children need the outputs of nodes run on each fold
+    class MyDAG3(MyDAG):
+        def nodes(self):
+            return {**super().nodes(), "scaler2": Scaler()}
+
+        def edges(self):
+            return {
+                **super().edges(),
+                "scaler2": "primary",
+                "model": ["positive", "scaler2"],
+            }
+
+    dag = MyDAG3()
+    dag.instantiate_dag("train")
+    assert get_stateless_nodes(dag, "primary", "model") == {
+        "features",
+        "double",
+    }
+
+
+def test_reuse_stateless():
+    df = get_df()
+    X, y = df[["a", "b"]], df["c"]
+    splitter = RandomSplitter(n_folds=4)
+
+    # Stateless nodes should only be run once
+    run_counts.clear()
+    reused = Sequential().run(MyDAG(), "primary", X, y, "model", splitter)
+    assert run_counts["double"] == 1
+
+    # But the results should be the same as running them on every fold
+    run_counts.clear()
+    not_reused = Sequential(reuse_stateless=False).run(
+        MyDAG(), "primary", X, y, "model", splitter
+    )
+    assert run_counts["double"] == 4 * 2
+    assert len(reused) == 4
+    for (y_pred, y_true), (expected_pred, expected_true) in zip(
+        reused, not_reused
+    ):
+        pd.testing.assert_series_equal(y_pred, expected_pred)
+        pd.testing.assert_series_equal(y_true, expected_true)
+
+    # Also when running folds in other processes
+    in_pool = ProcessPool(max_workers=2).run(
+        MyDAG(), "primary", X, y, "model", splitter
+    )
+    for (y_pred, y_true), (expected_pred, expected_true) in zip(
+        in_pool, not_reused
+    ):
+        pd.testing.assert_series_equal(y_pred, expected_pred)
+        pd.testing.assert_series_equal(y_true, expected_true)
+
+
+def test_reuse_stateless_doesnt_modify_inputs():
+    df = get_df()
+    df.loc[df.index[:10], "a"] = np.nan
+    X, y = df[["a", "b"]], df["c"]
+    splitter = RandomSplitter(n_folds=4)
+
+    # Nodes which modify their inputs shouldn't change the data passed to
+    # their siblings
+    for implementation in [Sequential, ProcessPool]:
+        results = {}
+        for reuse_stateless in [True, False]:
+            folds = implementation(reuse_stateless=reuse_stateless).run(
+                SiblingDAG(), "primary", X, y, ["m1", "m2"], splitter
+            )
+            results[reuse_stateless] = folds
+            assert sum(f["m1"][0].sum() for f in folds) == 0
+            assert sum(f["m2"][0].sum() for f in folds) == 10
+        for reused, not_reused in zip(results[True], results[False]):
+            for name in ["m1", "m2"]:
+                for output, expected in zip(reused[name], not_reused[name]):
+                    pd.testing.assert_series_equal(output, expected)
+    assert X["a"].isnull().sum() == 10
@@ -1,10 +1,16 @@
 import numpy as np
 import pandas as pd
+import pytest
 
 from pipedown.cross_validation.implementations import Sequential
-from pipedown.cross_validation.splitters import RandomSplitter
+from pipedown.cross_validation.splitters import (
+    OutOfTimeSplitter,
+    RandomSplitter,
+)
 from pipedown.dag import DAG
-from pipedown.nodes.base import Node
+from pipedown.nodes.base import Model, Node
+from pipedown.nodes.caches import PickleCache
+from pipedown.nodes.filters import FeatureFilter
 
 
 def test_sequential():
@@ -67,12 +73,267 @@ def test_sequential():
 
     # Check it ran the nodes in the correct order
     # (ran nodes twice, once during dag.fit on training data,
-    # and again during fit.run on val data)
+    # and again during fit.run on val data, except the output node,
+    # which is only fit during dag.fit)
     assert len(fit_list) == 10
-    assert len(run_list) == 20
+    assert len(run_list) == 15
     fit_order = ["b", "c"] * 5
     for i in range(len(fit_order)):
         assert fit_list[i] == fit_order[i]
-    run_order = ["b", "c"] * 10
+    run_order = ["b", "b", "c"] * 5
     for i in range(len(run_order)):
         assert run_list[i] == run_order[i]
+
+
+def test_sequential_fused():
+
+    calls = []
+
+    class MyNode(Node):
+        def __init__(self, name):
+            self._name = name
+
+        def fit(self, X, y):
+            calls.append(("fit", self._name, X.shape[0]))
+            self.x_mean = X.mean()
+
+        def run(self, X, y):
+            calls.append(("run", self._name, X.shape[0]))
+            return X + self.x_mean, y
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "my_node1": MyNode("a"),
+                "my_node2": MyNode("b"),
+                "my_node3": MyNode("c"),
+            }
+
+        def edges(self):
+            return {
+                "my_node2": "my_node1",
+                "my_node3": "my_node2",
+            }
+
+    X = pd.DataFrame({"a": np.random.randn(10), "b": np.random.randn(10)})
+    y = pd.Series(np.random.randn(10))
+    splitter = RandomSplitter(n_folds=5)
+
+    # Fused and unfused should give the same outputs
+    fused = Sequential(fused=True).run(
+        MyDAG(), "my_node1", X, y, ["my_node3"], splitter
+    )
+    fused_calls = calls.copy()
+    calls.clear()
+    unfused = Sequential(fused=False).run(
+        MyDAG(), "my_node1", X, y, ["my_node3"], splitter
+    )
+    for (x_fused, y_fused), (x_unfused, y_unfused) in zip(fused, unfused):
+        pd.testing.assert_frame_equal(x_fused, x_unfused)
+        pd.testing.assert_series_equal(y_fused, y_unfused)
+
+    # But fused should run each node on the validation data right after
+    # fitting it
+    assert calls[:5] == [
+        ("fit", "b", 8),
+        ("run", "b", 8),
+        ("fit", "c", 8),
+        ("run", "b", 2),
+        ("run", "c", 2),
+    ]
+    assert fused_calls[:5] == [
+        ("fit", "b", 8),
+        ("run", "b", 8),
+        ("run", "b", 2),
+        ("fit", "c", 8),
+        ("run", "c", 2),
+    ]
+
+
+def test_sequential_in_place():
+    """Nodes which modify their inputs in place shouldn't change the data,
+    whether or not the splitter returns fold indices"""
+
+    class InPlaceNode(Node):
+        def fit(self, X, y):
+            pass
+
+        def run(self, X, y):
+            X["a"] = 0.0
+            return X, y
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {"my_node1": InPlaceNode(), "my_node2": InPlaceNode()}
+
+        def edges(self):
+            return {"my_node2": "my_node1"}
+
+    class SliceSplitter(RandomSplitter):
+        """Splitter which returns views of the data and no indices"""
+
+        def get_fold(self, X, y, i):
+            return X.iloc[:5], y.iloc[:5], X.iloc[5:], y.iloc[5:]
+
+        def get_fold_indices(self, X, y, i):
+            raise NotImplementedError
+
+    X = pd.DataFrame({"a": np.random.randn(10), "b": np.random.randn(10)})
+    y = pd.Series(np.random.randn(10))
+    X_orig = X.copy()
+    for splitter in [RandomSplitter(n_folds=2), SliceSplitter(n_folds=2)]:
+        outputs = Sequential().run(
+            MyDAG(), "my_node1", X, y, ["my_node2"], splitter
+        )
+        assert (outputs[0][0]["a"] == 0).all()
+        pd.testing.assert_frame_equal(X, X_orig)
+
+
+class MyNode(Node):
+    def __init__(self, name):
+        self._name = name
+
+    def fit(self, X, y):
+        self.x_mean = X.mean()
+
+    def run(self, X, y):
+        return X, y
+
+
+def test_sequential_incremental():
+
+    fits = []
+
+    class MeanModel(Model):
+        def fit(self, X, y):
+            fits.append(("fit", X.shape[0]))
+            self.total = y.sum()
+            self.count = y.shape[0]
+
+        def partial_fit(self, X, y):
+            fits.append(("partial_fit", X.shape[0]))
+            self.total += y.sum()
+            self.count += y.shape[0]
+
+        def predict(self, X):
+            return pd.Series(self.total / self.count, index=X.index)
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "my_node": MyNode("a"),
+                "features": FeatureFilter(["a"]),
+                "model": MeanModel(),
+            }
+
+        def edges(self):
+            return {"features": "my_node", "model": "features"}
+
+    X = pd.DataFrame({"a": np.random.randn(40), "time": np.arange(40) % 8})
+    y = pd.Series(np.random.randn(40))
+    splitter = OutOfTimeSplitter("time", n_folds=4)
+
+    # Should only fit on the new data each fold
+    incremental = Sequential(incremental=True).run(
+        MyDAG(), "my_node", X, y, "model", splitter
+    )
+    assert fits == [("fit", 10), ("partial_fit", 10), ("partial_fit", 10)]
+
+    # But get the same predictions as refitting on all the data
+    fits.clear()
+    refit = Sequential().run(MyDAG(), "my_node", X, y, "model", splitter)
+    assert fits == [("fit", 10), ("fit", 20), ("fit", 30)]
+    for (y_pred, y_true), (refit_pred, refit_true) in zip(incremental, refit):
+        pd.testing.assert_series_equal(y_pred, refit_pred)
+        pd.testing.assert_series_equal(y_true, refit_true)
+
+    # Stateful nodes need a partial_fit method
+    class MyDAG2(MyDAG):
+        def edges(self):
+            return {"features": "my_node", "model": "features"}
+
+        def nodes(self):
+            return {**super().nodes(), "features": MyNode("b")}
+
+    with pytest.raises(ValueError):
+        Sequential(incremental=True).run(
+            MyDAG2(), "my_node", X, y, "model", splitter
+        )
+
+    # And a splitter which supports incremental folds
+    with pytest.raises(NotImplementedError):
+        Sequential(incremental=True).run(
+            MyDAG(), "my_node", X, y, "model", RandomSplitter(n_folds=4)
+        )
+
+
+def test_sequential_caches_each_fold(tmp_path):
+
+    fits = []
+
+    class Featurizer(Node):
+        def fit(self, X, y):
+            fits.append(X.shape[0])
+            self.x_mean = X.mean()
+
+        def run(self, X, y):
+            return X - self.x_mean, y
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "my_node": MyNode("a"),
+                "featurizer": Featurizer(),
+                "cache": PickleCache(str(tmp_path / "cache.pkl")),
+                "features": FeatureFilter(["a"]),
+            }
+
+        def edges(self):
+            return {
+                "featurizer": "my_node",
+                "cache": "featurizer",
+                "features": "cache",
+            }
+
+    X = pd.DataFrame({"a": np.random.randn(10)})
+    y = pd.Series(np.random.randn(10))
+    expected = Sequential().run(
+        MyDAG(), "my_node", X, y, "featurizer", RandomSplitter(n_folds=2)
+    )
+
+    # Should cache the training and validation data for each fold
+    fits.clear()
+    my_dag = MyDAG()
+    outputs = Sequential().run(
+        my_dag, "my_node", X, y, "features", RandomSplitter(n_folds=2)
+    )
+    assert fits == [5, 5]
+    assert len(list(tmp_path.iterdir())) == 4
+    assert my_dag.get_node("cache").cv_context is None
+    assert not my_dag.get_node("cache").is_cached()
+    for (x_val, y_val), (x_exp, y_exp) in zip(outputs, expected):
+        pd.testing.assert_frame_equal(x_val, x_exp)
+        pd.testing.assert_series_equal(y_val, y_exp)
+
+    # And re-use them when cross-validating again with the same splitter
+    fits.clear()
+    cached = Sequential().run(
+        MyDAG(), "my_node", X, y, "features", RandomSplitter(n_folds=2)
+    )
+    assert fits == []
+    for (x_val, y_val), (x_exp, y_exp) in zip(cached, expected):
+        pd.testing.assert_frame_equal(x_val, x_exp)
+        pd.testing.assert_series_equal(y_val, y_exp)
+
+    # But not with a different one
+    Sequential().run(
+        MyDAG(),
+        "my_node",
+        X,
+        y,
+        "features",
+        RandomSplitter(n_folds=2, random_seed=1),
+    )
+    assert fits == [5, 5]
+    my_dag.clear_caches()
+    assert len(list(tmp_path.iterdir())) == 0
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipedown.cross_validation.splitters import OutOfTimeSplitter
+
+
+def test_out_of_time_splitter():
+
+    # Times out of order, w/ 3 datapoints at each time
+    X = pd.DataFrame({"time": np.random.permutation(np.repeat(range(10), 3))})
+    X["a"] = np.random.randn(30)
+    y = pd.Series(np.random.randn(30))
+
+    ots = OutOfTimeSplitter("time", n_folds=4, start_fold=1)
+    ots.setup(X, y)
+    assert ots.get_n_folds() == 3
+
+    # Each fold should train on all the data before the validation data
+    last_val = None
+    for i in range(3):
+        x_train, y_train, x_val, y_val = ots.get_fold(X, y, i)
+        assert isinstance(x_train, pd.DataFrame)
+        assert isinstance(y_val, pd.Series)
+        assert x_train["time"].max() < x_val["time"].min()
+        assert x_train.shape[0] + x_val.shape[0] <= 30
+        assert x_train.index.is_monotonic_increasing
+        assert x_val.index.is_monotonic_increasing
+        if last_val is not None:
+            assert x_train["time"].max() == last_val["time"].max()
+        last_val = x_val
+
+    # Last fold should validate on the last quarter-ish of the data
+    assert set(x_val["time"]) == {7, 8, 9}
+    assert x_train.shape[0] == 21
+
+    # Incremental folds should only have the new training data
+    for i in range(1, 3):
+        ix_new, ix_val = ots.get_incremental_fold_indices(X, y, i)
+        ix_prev, _ = ots.get_fold_indices(X, y, i - 1)
+        ix_train, ix_val2 = ots.get_fold_indices(X, y, i)
+        assert sorted(ix_new.tolist() + ix_prev.tolist()) == ix_train.tolist()
+        assert ix_val.tolist() == ix_val2.tolist()
+
+
+def test_out_of_time_splitter_start_fold():
+    with pytest.raises(ValueError):
+        OutOfTimeSplitter("time", n_folds=3, start_fold=0)
+    with pytest.raises(ValueError):
+        OutOfTimeSplitter("time", n_folds=3, start_fold=3)
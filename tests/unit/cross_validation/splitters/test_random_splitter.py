@@ -82,3 +82,26 @@ def test_random_splitter_uneven():
     assert x_val.shape[1] == 3
     assert y_train.shape[0] == 8
     assert y_val.shape[0] == 4
+
+
+def test_random_splitter_fold_indices():
+
+    X = pd.DataFrame({"a": np.random.randn(13)}, index=np.arange(13) * 2)
+    y = pd.Series(np.random.randn(13), index=X.index)
+
+    rs = RandomSplitter(n_folds=4)
+    rs.setup(X, y)
+
+    # Each row should be in the validation set of exactly one fold
+    all_val = []
+    for i in range(4):
+        ix_train, ix_val = rs.get_fold_indices(X, y, i)
+        assert ix_train.shape[0] + ix_val.shape[0] == 13
+        assert len(set(ix_train) & set(ix_val)) == 0
+        all_val += ix_val.tolist()
+
+        # Should match get_fold
+        x_train, y_train, x_val, y_val = rs.get_fold(X, y, i)
+        pd.testing.assert_frame_equal(x_train, X.iloc[ix_train])
+        pd.testing.assert_series_equal(y_val, y.iloc[ix_val])
+    assert sorted(all_val) == list(range(13))
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.splitters import StratifiedSplitter
+
+
+def test_stratified_splitter():
+
+    X = pd.DataFrame()
+    X["a"] = np.random.randn(100)
+    X["b"] = ["x"] * 50 + ["y"] * 30 + ["z"] * 15 + [None] * 5
+    y = pd.Series(np.random.randn(100))
+
+    ss = StratifiedSplitter("b", n_folds=5)
+    ss.setup(X, y)
+    assert ss.get_n_folds() == 5
+
+    # Each datapoint should be validated on once
+    all_val = []
+    for i in range(5):
+        x_train, y_train, x_val, y_val = ss.get_fold(X, y, i)
+        assert isinstance(x_train, pd.DataFrame)
+        assert isinstance(x_val, pd.DataFrame)
+        assert isinstance(y_train, pd.Series)
+        assert isinstance(y_val, pd.Series)
+        assert x_train.shape[0] == 80
+        assert x_val.shape[0] == 20
+        assert x_train.index.is_monotonic_increasing
+        all_val += x_val.index.tolist()
+
+        # With the strata split evenly between folds
+        counts = x_val["b"].value_counts(dropna=False)
+        assert counts["x"] == 10
+        assert counts["y"] == 6
+        assert counts["z"] == 3
+        assert x_val["b"].isnull().sum() == 1
+    assert sorted(all_val) == list(range(100))
+
+    # Should be random, but reproducible
+    ss2 = StratifiedSplitter("b", n_folds=5)
+    ss2.setup(X, y)
+    ss3 = StratifiedSplitter("b", n_folds=5, random_seed=1)
+    ss3.setup(X, y)
+    assert ss.val_ix[0].tolist() == ss2.val_ix[0].tolist()
+    assert ss.val_ix[0].tolist() != ss3.val_ix[0].tolist()
+
+
+def test_stratified_splitter_binned_target():
+
+    X = pd.DataFrame({"a": np.random.randn(1000)})
+    y = pd.Series(np.random.exponential(size=1000))
+
+    ss = StratifiedSplitter(n_folds=4, n_bins=10)
+    ss.setup(X, y)
+
+    # Each fold should have the same number from each decile of y
+    deciles = pd.qcut(y, 10, labels=False)
+    for i in range(4):
+        ix_train, ix_val = ss.get_fold_indices(X, y, i)
+        assert ix_train.shape[0] == 750
+        assert ix_val.shape[0] == 250
+        counts = deciles.iloc[ix_val].value_counts()
+        assert counts.min() >= 24
+        assert counts.max() <= 26
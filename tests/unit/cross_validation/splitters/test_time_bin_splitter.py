@@ -1,5 +1,6 @@
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from pipedown.cross_validation.splitters import TimeBinSplitter
@@ -48,11 +49,15 @@ def test_time_bin_splitter():
     ]
     tbs = TimeBinSplitter(time_col="time", time_bins=time_bins)
 
-    # this shouldn't do anything, but shouldn't crash either
+    # Sort the times
     tbs.setup(X, y)
 
     assert tbs.get_n_folds() == 3
 
+    ix_train, ix_val = tbs.get_fold_indices(X, y, 1)
+    assert ix_train.tolist() == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert ix_val.tolist() == [8, 9]
+
     x_train, y_train, x_val, y_val = tbs.get_fold(X, y, 0)
     assert isinstance(x_train, pd.DataFrame)
     assert isinstance(x_val, pd.DataFrame)
@@ -178,3 +183,26 @@ def test_time_bin_splitter():
     assert x_val["b"].iloc[1] == 22
     assert y_val.iloc[0] == 31
     assert y_val.iloc[1] == 32
+
+
+def test_time_bin_splitter_unsorted():
+
+    # Times out of order, w/ some exactly on the bin edges
+    times = pd.to_datetime("2021-01-01") + pd.to_timedelta(
+        np.random.randint(0, 60, 200), unit="D"
+    )
+    X = pd.DataFrame({"a": np.arange(200), "time": times})
+    y = pd.Series(np.arange(200))
+    edges = pd.date_range("2021-01-01", periods=7, freq="10D")
+    time_bins = [
+        (edges[0], edges[i], edges[i], edges[i + 1]) for i in range(1, 6)
+    ]
+    tbs = TimeBinSplitter(time_col="time", time_bins=time_bins)
+    tbs.setup(X, y)
+
+    for i, (t0, t1, t2, t3) in enumerate(time_bins):
+        ix_train, ix_val = tbs.get_fold_indices(X, y, i)
+        in_train = (X["time"] > t0) & (X["time"] < t1)
+        in_val = (X["time"] > t2) & (X["time"] < t3)
+        assert ix_train.tolist() == np.flatnonzero(in_train).tolist()
+        assert ix_val.tolist() == np.flatnonzero(in_val).tolist()
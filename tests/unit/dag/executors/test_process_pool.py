@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipedown.dag import DAG
+from pipedown.dag.executors import ProcessPool
+from pipedown.nodes.base import Input, Node, Primary
+from pipedown.nodes.filters import Collate
+
+
+def test_process_pool():
+    class MyLoader(Node):
+        def run(self, *args):
+            df = pd.DataFrame()
+            df["a"] = np.arange(10.0)
+            df["b"] = np.arange(10.0) * 2
+            df["c"] = np.arange(10.0) * 3
+            return df
+
+    class MyNode(Node):
+        def __init__(self, add):
+            self.add = add
+            self.pid = None
+
+        def fit(self, X, y):
+            self.pid = os.getpid()
+            self.x_mean = X.mean()
+
+        def run(self, X, y):
+            X["a"] = X["a"] + self.x_mean["a"] + self.add
+            return X, y
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "loader": MyLoader(),
+                "primary": Primary(["a", "b"], "c"),
+                "my_node1": MyNode(1),
+                "my_node2": MyNode(2),
+                "collate": Collate(),
+            }
+
+        def edges(self):
+            return {
+                "primary": {"test": "input", "train": "loader"},
+                "my_node1": "primary",
+                "my_node2": "primary",
+                "collate": ["my_node1", "my_node2"],
+            }
+
+    # Fit sequentially
+    seq_dag = MyDAG()
+    seq_outputs = seq_dag.fit_run()
+
+    # Fit on a process pool
+    my_dag = MyDAG()
+    outputs = my_dag.fit_run(executor=ProcessPool(max_workers=2))
+    pd.testing.assert_frame_equal(outputs[0], seq_outputs[0])
+    pd.testing.assert_series_equal(outputs[1], seq_outputs[1])
+
+    # Nodes should have been fit in other processes, and the fitted state
+    # should have been copied back into this process
+    for name in ["my_node1", "my_node2"]:
+        node = my_dag.get_node(name)
+        assert node.pid is not None
+        assert node.pid != os.getpid()
+        assert node.x_mean["a"] == 4.5
+        assert node.x_mean["b"] == 9.0
+
+    # So running the fitted DAG in this process should work
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+    X, y = my_dag.run({"input": df})
+    assert y is None
+    assert X.shape[0] == 4
+    assert X["a"].tolist() == [6.5, 7.5, 7.5, 8.5]
@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from pipedown.dag import DAG
+from pipedown.dag.dag_tools import run_dag
+from pipedown.dag.executors import ThreadPool
+from pipedown.nodes.base import Input, Node, Primary
+from pipedown.nodes.filters import Collate, ItemFilter
+
+
+def test_thread_pool_runs_branches_in_parallel():
+    class MyLoader(Node):
+        def run(self, *args):
+            df = pd.DataFrame()
+            df["a"] = np.arange(10.0)
+            df["b"] = np.arange(10.0) * 2
+            df["c"] = np.arange(10.0) * 3
+            return df
+
+    class SlowNode(Node):
+        def __init__(self, add):
+            self.add = add
+
+        def fit(self, X, y):
+            time.sleep(0.2)
+            self.x_mean = X.mean()
+
+        def run(self, X, y):
+            X["a"] = X["a"] + self.x_mean["a"] + self.add
+            return X, y
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "loader": MyLoader(),
+                "primary": Primary(["a", "b"], "c"),
+                "slow1": SlowNode(1),
+                "slow2": SlowNode(2),
+                "slow3": SlowNode(3),
+                "slow4": SlowNode(4),
+            }
+
+        def edges(self):
+            return {
+                "primary": {"test": "input", "train": "loader"},
+                "slow1": "primary",
+                "slow2": "primary",
+                "slow3": "primary",
+                "slow4": "primary",
+            }
+
+    # Fit sequentially
+    my_dag = MyDAG()
+    t0 = time.perf_counter()
+    seq_outputs = my_dag.fit_run()
+    assert time.perf_counter() - t0 > 0.8
+
+    # Fit in parallel
+    my_dag = MyDAG()
+    t0 = time.perf_counter()
+    par_outputs = my_dag.fit_run(executor=ThreadPool(max_workers=4))
+    assert time.perf_counter() - t0 < 0.6
+
+    # Outputs should be the same
+    assert isinstance(par_outputs, dict)
+    assert len(par_outputs) == 4
+    for name in ["slow1", "slow2", "slow3", "slow4"]:
+        pd.testing.assert_frame_equal(
+            par_outputs[name][0], seq_outputs[name][0]
+        )
+        pd.testing.assert_series_equal(
+            par_outputs[name][1], seq_outputs[name][1]
+        )
+
+    # And running should work too
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+    outputs = my_dag.run({"input": df}, executor=ThreadPool())
+    for name, add in [("slow1", 1), ("slow2", 2), ("slow3", 3), ("slow4", 4)]:
+        assert outputs[name][0]["a"].iloc[0] == 1.0 + 4.5 + add
+        assert outputs[name][0]["a"].iloc[1] == 2.0 + 4.5 + add
+        assert outputs[name][1] is None
+
+
+def test_thread_pool_waits_for_readers_before_modifying():
+    class Source(Node):
+        def run(self):
+            return pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+
+    class SlowReader(Node):
+        mutates_inputs = False
+
+        def run(self, df):
+            time.sleep(0.2)
+            return df["a"].sum()
+
+    class Writer(Node):
+        def run(self, df):
+            df["a"] += 1
+            return df["a"].sum()
+
+    # s -> r
+    #   -> w
+    s = Source()
+    s.name = "s"
+    r = SlowReader()
+    r.name = "r"
+    w = Writer()
+    w.name = "w"
+    nodes = [s, r, w]
+    for n in nodes:
+        n.reset_connections()
+    for child in [r, w]:
+        child.set_parents(s)
+        s.add_children(child)
+
+    # The writer takes ownership of s's outputs, so it has to wait for the
+    # reader to be done with them
+    dag_outputs = run_dag({}, ["r", "w"], "train", nodes, ThreadPool())
+    assert dag_outputs["r"] == 6
+    assert dag_outputs["w"] == 9
+
+
+def test_thread_pool_same_as_sequential():
+    class MyModel(Node):
+        def __init__(self, add):
+            self._add = add
+
+        def run(self, X, y):
+            return X["a"] + X["b"] + self._add, y
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a", "b"], "c"),
+                "item_filter_1": ItemFilter(lambda x: x["a"] < 4),
+                "item_filter_2": ItemFilter(lambda x: x["a"] >= 4),
+                "my_model1": MyModel(1),
+                "my_model2": MyModel(2),
+                "my_model3": MyModel(3),
+                "collate": Collate(),
+            }
+
+        def edges(self):
+            return {
+                "primary": {"test": "input", "train": "input"},
+                "item_filter_1": "primary",
+                "item_filter_2": "primary",
+                "my_model1": "item_filter_1",
+                "my_model2": "item_filter_2",
+                "collate": ["my_model1", "my_model2"],
+                "my_model3": "primary",
+            }
+
+    df = pd.DataFrame()
+    df["a"] = [1, 2, 3, 4, 5, 6]
+    df["b"] = [7, 8, 9, 10, 11, 12]
+    df["c"] = [13, 14, 15, 16, 17, 18]
+    my_dag = MyDAG()
+    seq_outputs = my_dag.run({"input": df})
+    par_outputs = my_dag.run({"input": df}, executor=ThreadPool(2))
+    assert set(seq_outputs) == {"collate", "my_model3"}
+    assert set(par_outputs) == {"collate", "my_model3"}
+    for name in ["collate", "my_model3"]:
+        pd.testing.assert_series_equal(
+            par_outputs[name][0], seq_outputs[name][0]
+        )
@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipedown.dag import DAG, MicroBatcher
+from pipedown.nodes.base import Input, Model, Primary
+
+
+class MyModel(Model):
+    def __init__(self):
+        self.batch_sizes = []
+
+    def fit(self, X, y):
+        self.mean = y.mean()
+
+    def predict(self, X):
+        if (X["a"] < 0).any():
+            raise ValueError("Negative a")
+        self.batch_sizes.append(X.shape[0])
+        return X["a"] + self.mean
+
+
+class MyDAG(DAG):
+    def nodes(self):
+        return {
+            "input": Input(),
+            "primary": Primary(["a"], "b"),
+            "model": MyModel(),
+        }
+
+    def edges(self):
+        return {"primary": "input", "model": "primary"}
+
+
+def get_fitted_dag():
+    df = pd.DataFrame({"a": np.arange(100.0), "b": np.random.randn(100)})
+    my_dag = MyDAG()
+    my_dag.fit({"input": df}, "model")
+    return my_dag
+
+
+def test_micro_batcher_threads():
+
+    my_dag = get_fitted_dag()
+    records = [{"a": float(i), "b": 0.0} for i in range(100)]
+    expected = [my_dag.run({"input": r}, "model") for r in records]
+    my_dag.get_node("model").batch_sizes.clear()
+
+    # Requests from many threads should be batched together
+    with MicroBatcher(my_dag, "model", max_batch_size=16) as batcher:
+        with ThreadPoolExecutor(32) as pool:
+            outputs = list(pool.map(batcher.run, records))
+    batch_sizes = my_dag.get_node("model").batch_sizes
+    assert sum(batch_sizes) == 100
+    assert max(batch_sizes) <= 16
+    assert len(batch_sizes) < 100
+
+    # But each should get the same outputs as running it alone
+    for (y_pred, y_true), (expected_pred, _) in zip(outputs, expected):
+        pd.testing.assert_series_equal(y_pred, expected_pred)
+        assert y_true is None
+
+
+def test_micro_batcher_asyncio():
+
+    my_dag = get_fitted_dag()
+    my_dag.get_node("model").batch_sizes.clear()
+
+    async def run_requests(batcher):
+        return await asyncio.gather(
+            *(batcher.run_async({"a": float(i)}) for i in range(10))
+        )
+
+    with MicroBatcher(my_dag, "model", max_wait=0.1) as batcher:
+        outputs = asyncio.run(run_requests(batcher))
+    assert my_dag.get_node("model").batch_sizes == [10]
+    for i, (y_pred, _) in enumerate(outputs):
+        assert y_pred.iloc[0] == i + my_dag.get_node("model").mean
+
+    # Errors should be raised for each request in the batch
+    with MicroBatcher(my_dag, "model", max_wait=0.1) as batcher:
+        good = batcher.submit({"a": 1.0})
+        bad = batcher.submit({"a": -1.0})
+        with pytest.raises(ValueError):
+            bad.result()
+        with pytest.raises(ValueError):
+            good.result()
+
+
+def test_micro_batcher_asyncio_cancellation():
+
+    my_dag = get_fitted_dag()
+    my_dag.get_node("model").batch_sizes.clear()
+
+    async def time_out(batcher):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.run_async({"a": 1.0}), 0.01)
+
+    # Requests which were cancelled shouldn't stop later requests running
+    with MicroBatcher(my_dag, "model", max_wait=0.1) as batcher:
+        asyncio.run(time_out(batcher))
+        y_pred, _ = batcher.submit({"a": 2.0}).result(timeout=2)
+        assert y_pred.iloc[0] == 2.0 + my_dag.get_node("model").mean
+    assert my_dag.get_node("model").batch_sizes == [1]
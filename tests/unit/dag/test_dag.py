@@ -2,9 +2,11 @@ import os
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from pipedown.cross_validation.splitters import RandomSplitter
 from pipedown.dag import DAG
+from pipedown.dag.dag import collate_cv_predictions
 from pipedown.nodes.base import Input, Model, Node, Primary
 from pipedown.nodes.filters import Collate, ItemFilter
 from pipedown.nodes.metrics import MeanSquaredError
@@ -59,11 +61,9 @@ def test_dag_fit_run_and_fitrun():
     assert isinstance(fit_list, list)
     assert isinstance(run_list, list)
     assert len(fit_list) == 2
-    assert len(run_list) == 2
+    assert run_list == ["A"]  # output node is only fit
     assert "A" in fit_list
     assert "B" in fit_list
-    assert "A" in run_list
-    assert "B" in run_list
 
     # Run
     df = pd.DataFrame()
@@ -76,11 +76,11 @@ def test_dag_fit_run_and_fitrun():
     assert isinstance(fit_list, list)
     assert isinstance(run_list, list)
     assert len(fit_list) == 2
-    assert len(run_list) == 4
+    assert len(run_list) == 3
     assert "A" in fit_list
     assert "B" in fit_list
-    assert "A" in run_list[2:]
-    assert "B" in run_list[2:]
+    assert "A" in run_list[1:]
+    assert "B" in run_list[1:]
 
     # Fit run
     while len(fit_list) > 0:
@@ -280,6 +280,80 @@ def test_dag_eval_order_with_empty():
     assert xo["b"].iloc[3] == 41
 
 
+def test_dag_reuses_plans():
+
+    edges_calls = []
+
+    class MyNode(Node):
+        def __init__(self, add):
+            self._add = add
+
+        def run(self, X, y):
+            return X + self._add, y
+
+    class MyDAG(DAG):
+        def __init__(self):
+            self.last_node = "my_node2"
+
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a", "b"], "c"),
+                "my_node1": MyNode(1),
+                "my_node2": MyNode(2),
+                "my_node3": MyNode(3),
+            }
+
+        def edges(self):
+            edges_calls.append(1)
+            return {
+                "primary": {"test": "input", "train": "input"},
+                "my_node1": "primary",
+                "my_node2": "my_node1",
+                "my_node3": self.last_node,
+            }
+
+    df = pd.DataFrame()
+    df["a"] = [1, 2, 3]
+    df["b"] = [4, 5, 6]
+
+    # Plan should be compiled once and re-used for the same inputs/outputs
+    my_dag = MyDAG()
+    plan = my_dag.get_plan("test", {"input": df}, "my_node3")
+    assert [n.name for n in plan.eval_order] == [
+        "input",
+        "primary",
+        "my_node1",
+        "my_node2",
+        "my_node3",
+    ]
+    for _ in range(3):
+        xo, yo = my_dag.run({"input": df}, "my_node3")
+        assert my_dag.get_plan("test", {"input": df}, "my_node3") is plan
+        assert xo["a"].tolist() == [7, 8, 9]
+        assert yo is None
+
+    # But should only call edges() once per run (to check it hasn't changed)
+    while len(edges_calls) > 0:
+        edges_calls.pop()
+    my_dag.run({"input": df}, "my_node3")
+    assert len(edges_calls) == 1
+
+    # Different modes and outputs get different plans
+    assert my_dag.get_plan("train", {"input": df}, "my_node3") is not plan
+    plan2 = my_dag.get_plan("test", {"input": df}, "my_node2")
+    assert plan2 is not plan
+    assert len(plan2.eval_order) == 4
+
+    # Plans should be re-compiled if the edges change
+    my_dag.last_node = "my_node1"
+    new_plan = my_dag.get_plan("test", {"input": df}, "my_node3")
+    assert new_plan is not plan
+    assert len(new_plan.eval_order) == 4
+    xo, yo = my_dag.run({"input": df}, "my_node3")
+    assert xo["a"].tolist() == [5, 6, 7]
+
+
 def test_dag_get_and_save_html():
     class MyLoader(Node):
         def run(self, *args):
@@ -391,6 +465,39 @@ def test_cv_predict():
     assert predictions["my_model"].iloc[5] == 19
 
 
+def test_collate_cv_predictions():
+
+    # Folds are written into place by position
+    original_index = pd.Index(["a", "b", "c", "d", "e"])
+    folds = [[3, 0], [4, 1, 2]]
+    predictions = [
+        {
+            "m1": (
+                pd.Series([10.0 * i for i in ix], index=ix),
+                pd.Series(ix, index=ix),
+            ),
+            "m2": (
+                pd.Series(["x" if i < 2 else "y" for i in ix], index=ix),
+                pd.Series(ix, index=ix),
+            ),
+        }
+        for ix in folds
+    ]
+    df = collate_cv_predictions(predictions, ["m1", "m2"], original_index)
+    assert df.columns.tolist() == ["y_true", "m1", "m2"]
+    assert df.index.equals(original_index)
+    assert df["y_true"].tolist() == [0, 1, 2, 3, 4]
+    assert df["m1"].tolist() == [0.0, 10.0, 20.0, 30.0, 40.0]
+    assert df["m2"].tolist() == ["x", "x", "y", "y", "y"]
+
+    # Falls back to concatenating if the values can't be written in place
+    for p in predictions:
+        p["m2"] = (p["m2"][0].astype("category"), p["m2"][1])
+    df = collate_cv_predictions(predictions, ["m1", "m2"], original_index)
+    assert df["m2"].dtype == "category"
+    assert df["m2"].tolist() == ["x", "x", "y", "y", "y"]
+
+
 def test_cv_predict_with_cv_on():
 
     fit_list = []
@@ -460,12 +567,12 @@ def test_cv_predict_with_cv_on():
     assert isinstance(fit_list, list)
     assert isinstance(run_list, list)
     assert len(fit_list) == 5
-    assert len(run_list) == 9
+    assert len(run_list) == 7
     expected_fit_list = ["A", "B", "C", "B", "C"]
-    expected_run_list = ["A", "B", "C", "B", "C", "B", "C", "B", "C"]
+    expected_run_list = ["A", "B", "B", "C", "B", "B", "C"]
     for i in range(5):
         assert fit_list[i] == expected_fit_list[i]
-    for i in range(9):
+    for i in range(7):
         assert run_list[i] == expected_run_list[i]
 
 
@@ -551,6 +658,46 @@ def test_cv_predict_multiple_models():
 # TODO: cv_predict with custom cv_on
 
 
+def test_fit_skips_metrics():
+
+    predicts = []
+
+    class MyModel(Model):
+        def fit(self, X, y):
+            self.mean = y.mean()
+
+        def predict(self, X):
+            predicts.append(X.shape[0])
+            return pd.Series(self.mean, index=X.index)
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a"], "b"),
+                "model": MyModel(),
+                "mse": MeanSquaredError(),
+            }
+
+        def edges(self):
+            return {
+                "primary": {"train": "input", "test": "input"},
+                "model": "primary",
+                "mse": "model",
+            }
+
+    df = pd.DataFrame({"a": np.random.randn(10), "b": np.random.randn(10)})
+
+    # Model shouldn't predict on the training data just to feed the metric
+    my_dag = MyDAG()
+    my_dag.fit({"input": df})
+    assert predicts == []
+
+    # Or on each fold's training data when cross-validating
+    my_dag.cv_metric({"input": df}, cv_splitter=RandomSplitter(n_folds=2))
+    assert predicts == [5, 5]
+
+
 def test_cv_metric(is_close):
     class MyLoader(Node):
         def run(self, *args):
@@ -697,3 +844,107 @@ def test_cv_metric_multiple_metrics(is_close):
         metrics["metric_value"].iloc[2:].mean(),
         (2 * 2 + 1 + 0 + 1 + 2 * 2 + 3 * 3) / 6,
     )
+
+
+def test_cv_evaluate():
+
+    fits = []
+
+    class MyModel(Model):
+        def fit(self, X, y):
+            fits.append(X.shape[0])
+            self.mean = y.mean()
+
+        def predict(self, X):
+            return X["a"] + self.mean
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a", "b"], "c"),
+                "my_model": MyModel(),
+                "my_metric": MeanSquaredError(),
+            }
+
+        def edges(self):
+            return {
+                "primary": {"test": "input", "train": "input"},
+                "my_model": "primary",
+                "my_metric": "my_model",
+            }
+
+    df = pd.DataFrame(
+        {
+            "a": np.random.randn(12),
+            "b": np.random.randn(12),
+            "c": np.random.randn(12),
+        },
+        index=np.arange(12) + 100,
+    )
+    inputs = {"input": df}
+    cv_splitter = RandomSplitter(n_folds=3)
+
+    # Should give the same results as cv_predict and cv_metric
+    predictions, metrics, node_states = MyDAG().cv_evaluate(
+        inputs, cv_splitter=cv_splitter, return_node_states=True
+    )
+    assert len(fits) == 3  # only fit the model once for each fold
+    pd.testing.assert_frame_equal(
+        predictions, MyDAG().cv_predict(inputs, cv_splitter=cv_splitter)
+    )
+    pd.testing.assert_frame_equal(
+        metrics, MyDAG().cv_metric(inputs, cv_splitter=cv_splitter)
+    )
+
+    # Should return the state of the model after fitting on each fold
+    assert len(node_states) == 3
+    assert set(node_states[0]) == {"my_model", "my_metric"}
+    means = [s["my_model"]["mean"] for s in node_states]
+    assert len(set(means)) == 3
+    for i, mean in enumerate(means):
+        _, y_train, _, _ = cv_splitter.get_fold(df[["a", "b"]], df["c"], i)
+        assert mean == y_train.mean()
+
+
+def test_dag_run_stream():
+    class MyModel(Model):
+        def fit(self, X, y):
+            self.mean = y.mean()
+
+        def predict(self, X):
+            return X["a"] + self.mean
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a"], "b"),
+                "model": MyModel(),
+                "collate": Collate(),
+            }
+
+        def edges(self):
+            return {
+                "primary": "input",
+                "model": "primary",
+                "collate": "model",
+            }
+
+    df = pd.DataFrame({"a": np.random.randn(100), "b": np.random.randn(100)})
+    my_dag = MyDAG()
+    my_dag.fit({"input": df}, "model")
+
+    # Should give the same predictions as running on all the data
+    chunks = (df.iloc[i : i + 30] for i in range(0, 100, 30))
+    outputs = my_dag.run_stream(chunks, "model")
+    predictions = [y_pred for y_pred, _ in outputs]
+    assert len(predictions) == 4
+    assert predictions[0].shape[0] == 30
+    assert predictions[-1].shape[0] == 10
+    expected, _ = my_dag.run({"input": df}, "model")
+    pd.testing.assert_series_equal(pd.concat(predictions), expected)
+
+    # Should reject nodes which can't be run on chunks before running any
+    with pytest.raises(ValueError):
+        my_dag.run_stream(chunks, "collate")
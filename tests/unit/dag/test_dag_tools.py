@@ -1,3 +1,5 @@
+import tracemalloc
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -985,3 +987,161 @@ def test_walk_ends_at_cache():
     assert order.index(f) > order.index(cache)
     assert order.index(cache) > order.index(c)
     assert order.index(cache) > order.index(e)
+
+
+def test_run_dag_releases_outputs():
+
+    n = 1_000_000  # each source outputs an 8MB array
+    n_sources = 10
+
+    class Source(Node):
+        def run(self):
+            return np.ones(n)
+
+    class Reducer(Node):
+        def run(self, x):
+            return x.sum()
+
+    # s0 -> r0a     s1 -> r1a     ...
+    #    \              \
+    #     -> r0b         -> r1b
+    nodes = []
+    for i in range(n_sources):
+        source = Source()
+        source.name = f"s{i}"
+        nodes.append(source)
+        for suffix in ["a", "b"]:
+            reducer = Reducer()
+            reducer.name = f"r{i}{suffix}"
+            nodes.append(reducer)
+    for node in nodes:
+        node.reset_connections()
+    for i in range(n_sources):
+        source = nodes[3 * i]
+        for reducer in nodes[3 * i + 1 : 3 * i + 3]:
+            reducer.set_parents(source)
+            source.add_children(reducer)
+
+    # Each source's array should be released once both reducers have run,
+    # so peak memory should not scale with the number of sources
+    tracemalloc.start()
+    dag_outputs = run_dag({}, [], "train", nodes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert isinstance(dag_outputs, dict)
+    assert len(dag_outputs) == 2 * n_sources
+    for value in dag_outputs.values():
+        assert value == n
+    assert peak < 4 * 8 * n
+
+    # Unlike when the sources' arrays are kept (because they're outputs too)
+    tracemalloc.start()
+    dag_outputs = run_dag({}, [node.name for node in nodes], "train", nodes)
+    _, kept_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(dag_outputs) == 3 * n_sources
+    assert kept_peak > n_sources * 8 * n
+    assert peak < kept_peak / 3
+
+
+def test_run_dag_copies_only_when_needed():
+
+    received = {}
+
+    class Source(Node):
+        def run(self):
+            received[self.name] = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+            return received[self.name]
+
+    class Reader(Node):
+        mutates_inputs = False
+
+        def run(self, df):
+            received[self.name] = df
+            return df["a"].sum()
+
+    class Viewer(Node):
+        mutates_inputs = False
+
+        def run(self, df):
+            received[self.name] = df
+            return df
+
+    class Writer(Node):
+        def run(self, df):
+            received[self.name] = df
+            df["a"] += 1
+            return df["a"].sum()
+
+    def connect(parent, children):
+        for child in children:
+            child.set_parents(parent)
+            parent.add_children(child)
+
+    # s -> w1
+    #   -> w2
+    s = Source()
+    s.name = "s"
+    w1 = Writer()
+    w1.name = "w1"
+    w2 = Writer()
+    w2.name = "w2"
+    nodes = [s, w1, w2]
+    for n in nodes:
+        n.reset_connections()
+    connect(s, [w1, w2])
+
+    # The last writer takes ownership of the data, earlier writers get copies
+    dag_outputs = run_dag({}, [], "train", nodes)
+    assert dag_outputs["w1"] == 9
+    assert dag_outputs["w2"] == 9
+    assert received["w1"] is not received["s"]
+    assert received["w2"] is received["s"]
+
+    # s -> r1
+    #   -> w1
+    #   -> w2
+    r1 = Reader()
+    r1.name = "r1"
+    nodes = [s, r1, w1, w2]
+    for n in nodes:
+        n.reset_connections()
+    connect(s, [r1, w1, w2])
+
+    # Readers share the data, but their outputs could be views of it and are
+    # returned, so no writer can take ownership of it
+    dag_outputs = run_dag({}, [], "train", nodes)
+    assert dag_outputs["r1"] == 6
+    assert dag_outputs["w1"] == 9
+    assert dag_outputs["w2"] == 9
+    assert received["r1"] is received["s"]
+    assert received["w1"] is not received["s"]
+    assert received["w2"] is not received["s"]
+
+    # s -> v -> w3
+    #   -> w4
+    v = Viewer()
+    v.name = "v"
+    w3 = Writer()
+    w3.name = "w3"
+    w4 = Writer()
+    w4.name = "w4"
+    nodes = [s, v, w3, w4]
+    for n in nodes:
+        n.reset_connections()
+    connect(s, [v, w4])
+    connect(v, [w3])
+
+    # v's outputs are a view of s's outputs, which are still needed by w4,
+    # so w3 has to get a copy
+    dag_outputs = run_dag({}, ["w3", "w4"], "train", nodes)
+    assert dag_outputs["w3"] == 9
+    assert dag_outputs["w4"] == 9
+    assert received["v"] is received["s"]
+    assert received["w3"] is not received["s"]
+    assert received["w4"] is received["s"]
+
+    # Outputs of output nodes should not be modified by downstream nodes
+    dag_outputs = run_dag({}, ["v", "w3"], "train", nodes)
+    assert dag_outputs["w3"] == 9
+    assert dag_outputs["v"]["a"].sum() == 6
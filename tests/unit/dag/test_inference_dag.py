@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from pipedown.dag import DAG, InferenceDAG, load_dag
+from pipedown.nodes.base import Input, Loader, Model, Node, Primary
+from pipedown.nodes.caches.in_memory_cache import InMemoryCache
+from pipedown.nodes.caches.pickle_cache import PickleCache
+from pipedown.nodes.metrics import MeanSquaredError
+
+
+def test_get_inference_dag():
+    class MyLoader(Loader):
+        def run(self):
+            return pd.DataFrame(
+                {"a": np.random.randn(10000), "b": np.random.randn(10000)}
+            )
+
+    class AddOne(Node):
+        def run(self, X, y):
+            return X + 1, y
+
+    class MyModel(Model):
+        def fit(self, X, y):
+            self.mean = y.mean()
+
+        def predict(self, X):
+            return X["a"] + self.mean
+
+    class MyDAG(DAG):
+        def __init__(self):
+            self.training_data = np.random.randn(10000)
+
+        def nodes(self):
+            return {
+                "input": Input(),
+                "loader": MyLoader(),
+                "cache": InMemoryCache(),
+                "primary": Primary(["a"], "b"),
+                "add_one": AddOne(),
+                "feature_cache": PickleCache("test_feature_cache.pkl"),
+                "model": MyModel(),
+                "other_model": MyModel(),
+                "mse": MeanSquaredError(),
+            }
+
+        def edges(self):
+            return {
+                "cache": "loader",
+                "primary": {"test": "input", "train": "cache"},
+                "add_one": "primary",
+                "feature_cache": "add_one",
+                "model": "feature_cache",
+                "other_model": "primary",
+                "mse": "model",
+            }
+
+    my_dag = MyDAG()
+    my_dag.fit(outputs=["mse", "other_model"])
+    assert my_dag.get_node("cache").is_cached()
+
+    # Should only keep the nodes needed to run the model, w/o caches
+    inference_dag = my_dag.get_inference_dag("model")
+    assert isinstance(inference_dag, InferenceDAG)
+    assert list(inference_dag.get_node_dict()) == [
+        "input",
+        "primary",
+        "add_one",
+        "model",
+    ]
+    assert inference_dag.edges() == {
+        "primary": {"test": "input", "train": "input"},
+        "add_one": "primary",
+        "model": "add_one",
+    }
+
+    # Should run on the input data (and not the cached training data)
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+    expected = df["a"] + 1 + my_dag.get_node("model").mean
+    y_pred, _ = inference_dag.run({"input": df}, "model")
+    pd.testing.assert_series_equal(y_pred, expected)
+
+    # And the original DAG should still work
+    y_pred, _ = my_dag.run({"input": df}, "other_model")
+    assert y_pred.shape[0] == 3
+
+    # Default is to keep all the models
+    assert set(my_dag.get_inference_dag().get_node_dict()) == {
+        "input",
+        "primary",
+        "add_one",
+        "model",
+        "other_model",
+    }
+
+    # Saved inference DAG should be much smaller
+    my_dag.save("test_full_dag.pkl")
+    my_dag.save_inference_dag("test_inference_dag.pkl", "model")
+    full_size = os.path.getsize("test_full_dag.pkl")
+    inference_size = os.path.getsize("test_inference_dag.pkl")
+    assert inference_size < full_size / 10
+    loaded_dag = load_dag("test_inference_dag.pkl")
+    y_pred, _ = loaded_dag.run({"input": df}, "model")
+    pd.testing.assert_series_equal(y_pred, expected)
+    os.remove("test_full_dag.pkl")
+    os.remove("test_inference_dag.pkl")
+    os.remove("test_feature_cache.pkl")
@@ -0,0 +1,111 @@
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from pipedown.dag import DAG, MemoStore
+from pipedown.nodes.base import Input, Node
+
+
+def test_memo_store(tmp_path):
+
+    fit_list = []
+    run_list = []
+
+    class Scale(Node):
+        def __init__(self, name, factor):
+            self._name = name
+            self.factor = factor
+
+        def fit(self, X):
+            fit_list.append(self._name)
+            self.mean = X.mean()
+
+        def run(self, X):
+            run_list.append(self._name)
+            return self.factor * (X - self.mean)
+
+    class MyDAG(DAG):
+        def __init__(self, factor=2):
+            self.factor = factor
+
+        def nodes(self):
+            return {
+                "input": Input(),
+                "first": Scale("A", 3),
+                "second": Scale("B", self.factor),
+            }
+
+        def edges(self):
+            return {"first": "input", "second": "first"}
+
+    X = pd.DataFrame({"a": np.random.randn(10), "b": np.random.randn(10)})
+    memo = MemoStore(str(tmp_path))
+
+    # First fit should run and store everything
+    outputs = MyDAG().fit_run({"input": X}, "second", memo=memo)
+    assert fit_list == ["A", "B"]
+    assert run_list == ["A", "B"]
+    assert len(list(tmp_path.iterdir())) == 4
+
+    # A new DAG fit on the same data should load everything from the memo
+    fit_list.clear()
+    run_list.clear()
+    my_dag = MyDAG()
+    memo_outputs = my_dag.fit_run({"input": X}, "second", memo=memo)
+    assert fit_list == []
+    assert run_list == []
+    pd.testing.assert_frame_equal(outputs, memo_outputs)
+
+    # Including the nodes' fitted state
+    pd.testing.assert_frame_equal(my_dag.run({"input": X}, "second"), outputs)
+    assert my_dag.get_node("first").mean.equals(X.mean())
+
+    # Changing a node's parameters should only re-run that node
+    fit_list.clear()
+    run_list.clear()
+    outputs = MyDAG(4).fit_run({"input": X}, "second", memo=memo)
+    assert fit_list == ["B"]
+    assert run_list == ["B"]
+    pd.testing.assert_frame_equal(outputs, 2 * memo_outputs)
+
+    # And changing the input data should re-run everything
+    fit_list.clear()
+    run_list.clear()
+    MyDAG().fit_run({"input": 2 * X}, "second", memo=memo)
+    assert fit_list == ["A", "B"]
+    assert run_list == ["A", "B"]
+
+    # Clearing the memo should delete it
+    memo.clear()
+    assert not tmp_path.exists()
+
+
+def test_memo_store_data_fingerprint():
+    memo = MemoStore()
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    fingerprint = memo.get_data_fingerprint(df)
+
+    # Should only depend on the data
+    assert memo.get_data_fingerprint(df.copy()) == fingerprint
+    for other in [
+        df.astype({"a": float}),
+        df.astype({"b": "category"}),
+        df.rename(columns={"a": "c"}),
+        df.set_axis([5, 6]),
+        df.iloc[::-1],
+        df["a"],
+        (df,),
+    ]:
+        assert memo.get_data_fingerprint(other) != fingerprint
+    assert memo.get_data_fingerprint(
+        np.arange(6)[::2]
+    ) == memo.get_data_fingerprint(np.array([0, 2, 4]))
+
+    # Shouldn't copy large DataFrames to fingerprint them
+    X = pd.DataFrame({c: np.random.randn(1_000_000) for c in "abcd"})
+    tracemalloc.start()
+    memo.get_data_fingerprint(X)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 8 * 1_000_000
@@ -0,0 +1,213 @@
+import json
+import os
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from pipedown.cross_validation.splitters import RandomSplitter
+from pipedown.dag import DAG, Profiler
+from pipedown.dag.executors import ProcessPool, ThreadPool
+from pipedown.nodes.base import Input, Model, Node, Primary
+from pipedown.nodes.caches.pickle_cache import PickleCache
+
+
+class Slow(Node):
+    def run(self, X):
+        time.sleep(0.1)
+        return X.copy()
+
+
+class Allocate(Node):
+    def run(self, X):
+        X["new"] = np.zeros(X.shape[0])
+        X["big"] = np.random.randn(X.shape[0])
+        return X
+
+
+class MyDAG(DAG):
+    def nodes(self):
+        return {
+            "input": Input(),
+            "slow": Slow(),
+            "allocate": Allocate(),
+            "other": Allocate(),
+            "cache": PickleCache("profiling_test_cache.pkl"),
+        }
+
+    def edges(self):
+        return {
+            "slow": "input",
+            "allocate": "slow",
+            "other": "slow",
+            "cache": "allocate",
+        }
+
+
+def test_profiler():
+
+    if os.path.exists("profiling_test_cache.pkl"):
+        os.remove("profiling_test_cache.pkl")
+
+    X = pd.DataFrame({"a": np.random.randn(100000)})
+    profiler = Profiler()
+    my_dag = MyDAG()
+    my_dag.fit_run({"input": X}, ["other", "cache"], profiler=profiler)
+
+    # One row for each node run
+    report = profiler.get_report()
+    assert isinstance(report, pd.DataFrame)
+    assert report["node"].tolist() == [
+        "input",
+        "slow",
+        "other",
+        "allocate",
+        "cache",
+    ]
+    assert (report["mode"] == "train").all()
+
+    # Check the stats make sense
+    slow = report.set_index("node").loc["slow"]
+    allocate = report.set_index("node").loc["allocate"]
+    other = report.set_index("node").loc["other"]
+    assert slow["wall_time"] >= 0.1
+    assert slow["cpu_time"] < 0.1
+    assert slow["input_rows"] == 100000
+    assert slow["input_columns"] == 1
+    assert allocate["output_columns"] == 3
+    assert allocate["peak_memory"] >= 2 * 8 * 100000
+    assert other["copy_time"] > 0  # allocate needs slow's outputs too
+    assert allocate["copy_time"] == 0  # but can then take them
+    assert not report["cached"].any()
+    assert not report["memoized"].any()
+
+    # Second run should read from the cache
+    my_dag.run({"input": X}, "cache", profiler=profiler)
+    report = profiler.get_report()
+    assert report.shape[0] == 6
+    assert report["cached"].tolist() == [False] * 5 + [True]
+    assert report["mode"].iloc[-1] == "test"
+
+    # Should be able to export to json
+    records = json.loads(profiler.to_json())
+    assert len(records) == 6
+    assert records[1]["node"] == "slow"
+
+    # And profile nodes run in other processes
+    profiler.clear()
+    MyDAG().fit_run({"input": X}, "allocate", ProcessPool(), profiler=profiler)
+    report = profiler.get_report().set_index("node")
+    assert report.shape[0] == 3
+    assert report.loc["slow", "wall_time"] >= 0.1
+    assert report.loc["allocate", "peak_memory"] >= 2 * 8 * 100000
+
+    # Clean up
+    os.remove("profiling_test_cache.pkl")
+
+
+def test_profiler_without_reset_peak(monkeypatch):
+
+    # Before Python 3.9, should record the memory still allocated instead
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    X = pd.DataFrame({"a": np.random.randn(100000)})
+    profiler = Profiler()
+    MyDAG().fit_run({"input": X}, "allocate", profiler=profiler)
+    report = profiler.get_report().set_index("node")
+    assert report.loc["allocate", "peak_memory"] >= 2 * 8 * 100000
+
+
+def test_profiler_memory_in_threads():
+    class SlowAllocate(Node):
+        mutates_inputs = False
+
+        def run(self, X):
+            time.sleep(0.2)
+            return X.assign(big=np.random.randn(X.shape[0]))
+
+    class ParallelDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "slow": Slow(),
+                "a": SlowAllocate(),
+                "b": SlowAllocate(),
+            }
+
+        def edges(self):
+            return {"slow": "input", "a": "slow", "b": "slow"}
+
+    # Peak memory of nodes which ran at the same time can't be measured
+    X = pd.DataFrame({"a": np.random.randn(100000)})
+    profiler = Profiler()
+    ParallelDAG().fit_run(
+        {"input": X}, ["a", "b"], ThreadPool(2), profiler=profiler
+    )
+    report = profiler.get_report().set_index("node")
+    assert report.loc["slow", "peak_memory"] > 0
+    assert report.loc[["a", "b"], "peak_memory"].isnull().all()
+
+
+def test_profiler_chrome_trace(tmp_path):
+    class SlowXY(Node):
+        stateless = True
+
+        def run(self, X, y):
+            time.sleep(0.1)
+            return X, y
+
+    class MyModel(Model):
+        def fit(self, X, y):
+            self.mean = y.mean()
+
+        def predict(self, X):
+            return pd.Series(self.mean, index=X.index)
+
+    class MyCVDAG(DAG):
+        def nodes(self):
+            return {
+                "input": Input(),
+                "primary": Primary(["a"], "b"),
+                "slow": SlowXY(),
+                "model": MyModel(),
+            }
+
+        def edges(self):
+            return {"primary": "input", "slow": "primary", "model": "slow"}
+
+    df = pd.DataFrame({"a": np.random.randn(10), "b": np.random.randn(10)})
+    profiler = Profiler(trace_memory=False)
+    MyCVDAG().cv_predict(
+        {"input": df},
+        "model",
+        cv_splitter=RandomSplitter(n_folds=3),
+        profiler=profiler,
+    )
+
+    # Should be able to load the trace
+    filename = os.path.join(tmp_path, "trace.json")
+    profiler.to_chrome_trace(filename)
+    with open(filename, "r") as fid:
+        trace = json.load(fid)
+    events = trace["traceEvents"]
+    assert all(e["ph"] == "X" for e in events)
+
+    # Should have spans for each fold, and fitting and running each node
+    folds = [e for e in events if e["cat"] == "cv"]
+    assert [e["name"] for e in folds] == ["fold 0", "fold 1", "fold 2"]
+    model_fits = [
+        e for e in events if e == {**e, "name": "model", "cat": "fit"}
+    ]
+    assert len(model_fits) == 3
+    for fold, fit in zip(folds, model_fits):
+        assert fold["ts"] <= fit["ts"]
+        assert fit["ts"] + fit["dur"] <= fold["ts"] + fold["dur"]
+    slow_runs = [e for e in events if e == {**e, "name": "slow", "cat": "run"}]
+    assert all(e["dur"] >= 1e5 for e in slow_runs)
+
+    # Slow node is stateless, so should be run once before all the folds
+    assert len(slow_runs) == 1
+    precompute = [e for e in events if e["cat"] == "cv precompute"]
+    assert len(precompute) == 1
+    assert precompute[0]["ts"] <= slow_runs[0]["ts"]
+    assert slow_runs[0]["ts"] + slow_runs[0]["dur"] <= folds[0]["ts"]
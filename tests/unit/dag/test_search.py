@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipedown.cross_validation.splitters import RandomSplitter
+from pipedown.dag import DAG
+from pipedown.nodes.base import Input, Model, Primary
+from pipedown.nodes.caches import PickleCache
+from pipedown.nodes.filters import FeatureFilter
+from pipedown.nodes.metrics import MeanSquaredError
+
+
+class ScaledModel(Model):
+    def __init__(self, coef=1.0):
+        self.coef = coef
+
+    def fit(self, X, y):
+        pass
+
+    def predict(self, X):
+        return X["a"] * self.coef
+
+
+class MyDAG(DAG):
+    def nodes(self):
+        return {
+            "input": Input(),
+            "primary": Primary(["a", "b"], "y"),
+            "features": FeatureFilter(["a"]),
+            "model": ScaledModel(),
+            "mse": MeanSquaredError(),
+        }
+
+    def edges(self):
+        return {
+            "primary": {"test": "input", "train": "input"},
+            "features": "primary",
+            "model": "features",
+            "mse": "model",
+        }
+
+
+def get_df(n=900):
+    df = pd.DataFrame({"a": np.random.randn(n), "b": np.random.randn(n)})
+    df["y"] = 2.0 * df["a"] + 0.1 * np.random.randn(n)
+    return df
+
+
+def test_cv_search():
+    dag = MyDAG()
+    coefs = [0.0, 1.0, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0]
+    candidates = [{"model": ScaledModel(c)} for c in coefs]
+    best, results = dag.cv_search(
+        candidates, {"input": get_df()}, cv_splitter=RandomSplitter(3)
+    )
+
+    # Should find the best candidate
+    assert best is candidates[3]
+
+    # And only evaluate the best third of them on more data each round
+    assert results["rung"].value_counts().sort_index().tolist() == [9, 3, 1]
+    assert results.groupby("rung")["n_rows"].first().tolist() == [
+        100,
+        300,
+        900,
+    ]
+    assert set(results.loc[results["rung"] == 1, "candidate"]) == {2, 3, 4}
+
+    # Shouldn't change the DAG
+    assert dag.get_node("model").coef == 1.0
+
+
+def test_cv_search_greater_is_better():
+    candidates = [{"model": ScaledModel(c)} for c in [0.0, 2.0, 4.0]]
+    best, results = MyDAG().cv_search(
+        candidates,
+        {"input": get_df()},
+        greater_is_better=True,
+        cv_splitter=RandomSplitter(3),
+    )
+    assert best is not candidates[1]
+    assert results.shape[0] == 4
+
+
+def test_cv_search_in_parallel():
+    df = get_df()
+    candidates = [{"model": ScaledModel(c)} for c in [0.0, 1.0, 2.0, 3.0]]
+    _, results = MyDAG().cv_search(
+        candidates, {"input": df}, cv_splitter=RandomSplitter(3)
+    )
+    _, parallel_results = MyDAG().cv_search(
+        candidates,
+        {"input": df},
+        cv_splitter=RandomSplitter(3),
+        max_workers=2,
+    )
+    pd.testing.assert_frame_equal(results, parallel_results)
+
+
+def test_cv_search_invalid_candidates():
+    with pytest.raises(ValueError):
+        MyDAG().cv_search([{"primary": Primary(["a"], "y")}])
+    with pytest.raises(ValueError):
+        MyDAG().cv_search([{"not_a_node": ScaledModel()}])
+    with pytest.raises(ValueError):
+        MyDAG().cv_search([])
+
+
+def test_cv_search_rejects_candidates_upstream_of_caches(tmp_path):
+    class CachedDAG(MyDAG):
+        def nodes(self):
+            cache = PickleCache(str(tmp_path / "cache.pkl"))
+            return {**super().nodes(), "cache": cache}
+
+        def edges(self):
+            return {**super().edges(), "cache": "features", "model": "cache"}
+
+    with pytest.raises(ValueError):
+        CachedDAG().cv_search(
+            [{"features": FeatureFilter(["b"])}], {"input": get_df()}
+        )
+
+    # But can replace nodes downstream of them
+    candidates = [{"model": ScaledModel(c)} for c in [0.0, 2.0, 4.0]]
+    best, _ = CachedDAG().cv_search(
+        candidates, {"input": get_df()}, cv_splitter=RandomSplitter(3)
+    )
+    assert best is candidates[1]
+
+
+def test_cv_search_ranks_nan_scores_last():
+    class NaNModel(ScaledModel):
+        def predict(self, X):
+            return X["a"] * np.nan
+
+    # Failed candidates shouldn't be kept whether greater is better or not
+    for greater_is_better in [True, False]:
+        candidates = [{"model": NaNModel()}] + [
+            {"model": ScaledModel(c)} for c in [1.0, 2.0, 3.0]
+        ]
+        _, results = MyDAG().cv_search(
+            candidates,
+            {"input": get_df()},
+            greater_is_better=greater_is_better,
+            reduction_factor=2,
+            cv_splitter=RandomSplitter(3),
+        )
+        assert results["metric_value"].isnull().sum() == 1
+        assert 0 not in set(results.loc[results["rung"] > 0, "candidate"])
+
+
+def test_replace_nodes():
+    dag = MyDAG()
+    original = dag.get_node("model")
+    model = ScaledModel(2.0)
+    dag.replace_nodes({"model": model})
+    assert dag.get_node("model") is model
+    assert model.name == "model"
+    assert list(dag.get_node("features").get_children()) == [model]
+    assert original.coef == 1.0
+    with pytest.raises(ValueError):
+        dag.replace_nodes({"not_a_node": ScaledModel()})
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -147,3 +148,61 @@ def test_input():
     assert dfo.iloc[0, 0] == 1
     assert dfo.iloc[0, 1] == "c"
     assert dfo.iloc[0, 2] == 1.0
+
+
+def test_input_schema():
+
+    node = Input(
+        schema={"a": "float64", "b": "object", "c": "int64"},
+        defaults={"c": 0},
+    )
+    expected = pd.DataFrame(
+        {
+            "a": np.array([1.0, 2.0]),
+            "b": np.array(["x", None], dtype=object),
+            "c": np.array([3, 0]),
+        }
+    )
+
+    # list of records, filling missing values w/ defaults
+    dfo = node.run([{"a": 1, "b": "x", "c": 3, "d": 4}, {"a": 2}])
+    pd.testing.assert_frame_equal(dfo, expected)
+
+    # single record
+    dfo = node.run({"c": 3, "b": "x", "a": 1})
+    pd.testing.assert_frame_equal(dfo, expected.iloc[:1])
+
+    # series
+    dfo = node.run(pd.Series({"a": 1.0, "b": "x", "c": 3}))
+    pd.testing.assert_frame_equal(dfo, expected.iloc[:1])
+
+    # columns
+    dfo = node.run({"a": [1, 2], "b": ["x", None], "c": [3, 0]})
+    pd.testing.assert_frame_equal(dfo, expected)
+
+    # numpy array, w/ columns in the schema's order
+    dfo = node.run(np.array([[1.0, "x", 3], [2.0, None, 0]], dtype=object))
+    pd.testing.assert_frame_equal(dfo, expected)
+    dfo = node.run(np.array([1.0, "x", 3], dtype=object))
+    pd.testing.assert_frame_equal(dfo, expected.iloc[:1])
+
+    # columns as Series
+    dfo = node.run({"a": pd.Series([1.0, 2.0]), "b": pd.Series(["x", None])})
+    pd.testing.assert_frame_equal(dfo, expected.assign(c=[0, 0]))
+
+    # dataframes with the schema's columns and dtypes are passed through
+    assert node.run(expected) is expected
+
+    # others are converted to them
+    df = pd.DataFrame({"b": ["x", None], "a": [1, 2], "d": [5, 6]})
+    dfo = node.run(df)
+    pd.testing.assert_frame_equal(dfo, expected.assign(c=[0, 0]))
+
+    # integer and boolean columns must have defaults
+    with pytest.raises(ValueError):
+        Input(schema={"a": "float64", "c": "int64"})
+    with pytest.raises(ValueError):
+        Input(schema={"a": "float64", "d": "bool"}, defaults={"a": 0.0})
+    node = Input(schema={"a": "float64", "d": "bool"}, defaults={"d": True})
+    dfo = node.run({"a": 1.0})
+    assert dfo["d"].tolist() == [True]
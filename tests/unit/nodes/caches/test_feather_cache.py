@@ -3,6 +3,7 @@ import os
 import pandas as pd
 
 from pipedown.nodes.caches import FeatherCache
+from pipedown.utils.cv_context import CVContext
 
 
 def test_feather_cache():
@@ -73,3 +74,29 @@ def test_feather_cache():
     assert dfo.iloc[1, 1] == "bb"
     assert dfo.iloc[2, 1] == "cc"
     assert dfo.iloc[3, 1] == "dd"
+
+
+def test_feather_cache_cv_context(tmp_path):
+
+    fc = FeatherCache(str(tmp_path / "cache.feather"))
+    train = pd.DataFrame({"a": [1, 2, 3]}, index=[4, 0, 2])
+    val = pd.DataFrame({"a": [4, 5]}, index=[1, 3])
+
+    # Should cache training and validation data separately for each fold
+    fc.cv_context = CVContext("abc", 0)
+    assert not fc.is_cached()
+    fc.fit(train)
+    assert not fc.is_cached()
+    fc.cv_context = CVContext("abc", 0, "test")
+    pd.testing.assert_frame_equal(fc.run(val), val)
+    assert fc.is_cached()
+    pd.testing.assert_frame_equal(fc.run(), val)
+    fc.cv_context = CVContext("abc", 0, "train")
+    pd.testing.assert_frame_equal(fc.run(), train)
+    fc.cv_context = CVContext("abc", 1)
+    assert not fc.is_cached()
+    fc.cv_context = None
+    assert not fc.is_cached()
+
+    fc.clear_cache()
+    assert len(list(tmp_path.iterdir())) == 0
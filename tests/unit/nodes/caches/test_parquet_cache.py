@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from pipedown.dag import DAG
+from pipedown.nodes.base import Node
+from pipedown.nodes.caches import ParquetCache
+from pipedown.nodes.filters import FeatureFilter
+from pipedown.utils.cv_context import CVContext
+
+
+def test_parquet_cache(tmp_path):
+
+    filename = str(tmp_path / "cache.parquet")
+    pc = ParquetCache(filename, row_group_size=2)
+
+    df = pd.DataFrame(
+        {"a": [1, 2, 3, 4], "b": ["a", "b", "c", "d"]}, index=[7, 5, 3, 1]
+    )
+
+    assert not pc.is_cached()
+
+    # Should pass data through until it's cached
+    pd.testing.assert_frame_equal(pc.run(df), df)
+
+    pc.fit(df)
+    assert pc.is_cached()
+    assert pq.ParquetFile(filename).metadata.num_row_groups == 2
+    assert (
+        pq.ParquetFile(filename).metadata.row_group(0).column(0).compression
+        == "ZSTD"
+    )
+
+    # Should keep the index, and run fine when passed no args
+    pc.fit()
+    pd.testing.assert_frame_equal(pc.run(), df)
+
+    # Should only read some columns and rows
+    pc.columns = ["b"]
+    pc.filters = [("a", ">", 2)]
+    pd.testing.assert_frame_equal(pc.run(), df.loc[[3, 1], ["b"]])
+
+    # And select the same ones from data passed through it
+    pc.clear_cache()
+    pd.testing.assert_frame_equal(pc.run(df), df.loc[[3, 1], ["b"]])
+    pc.filters = [[("a", "in", [1, 2])], [("b", "==", df["b"].iloc[2])]]
+    pd.testing.assert_frame_equal(pc.run(df), df.iloc[:3][["b"]])
+    pc.fit(df)
+    pd.testing.assert_frame_equal(pc.run(), df.iloc[:3][["b"]])
+
+    # Can't filter rows while cross-validating
+    pc.cv_context = CVContext("abc", 0)
+    with pytest.raises(ValueError):
+        pc.fit(df)
+    pc.cv_context = None
+
+    pc.clear_cache()
+    assert not pc.is_cached()
+
+
+def test_parquet_cache_with_target(tmp_path):
+
+    pc = ParquetCache(str(tmp_path / "cache.parquet"), compression="snappy")
+    X = pd.DataFrame({"a": [1.0, 2.0, 3.0]}, index=[2, 0, 1])
+    y = pd.Series([4.0, 5.0, 6.0], index=[2, 0, 1], name="target")
+
+    pc.fit(X, y)
+    X_out, y_out = pc.run()
+    pd.testing.assert_frame_equal(X_out, X)
+    pd.testing.assert_series_equal(y_out, y)
+
+    # Should cache the training and validation data for each fold
+    pc.cv_context = CVContext("abc", 0)
+    assert not pc.is_cached()
+    pc.fit(X.iloc[:2], y.iloc[:2])
+    pc.cv_context = CVContext("abc", 0, "test")
+    X_out, y_out = pc.run(X.iloc[2:], y.iloc[2:])
+    pd.testing.assert_frame_equal(X_out, X.iloc[2:])
+    assert pc.is_cached()
+    pc.cv_context = CVContext("abc", 0, "train")
+    X_out, y_out = pc.run()
+    pd.testing.assert_series_equal(y_out, y.iloc[:2])
+
+    pc.clear_cache()
+    assert len(list(tmp_path.iterdir())) == 0
+
+
+def test_parquet_cache_reads_feature_filter_columns(tmp_path):
+    class MyLoader(Node):
+        def run(self):
+            X = pd.DataFrame(np.random.randn(10, 4), columns=list("abcd"))
+            return X, pd.Series(np.random.randn(10))
+
+    class MyDAG(DAG):
+        def nodes(self):
+            return {
+                "loader": MyLoader(),
+                "cache": ParquetCache(str(tmp_path / "cache.parquet")),
+                "features1": FeatureFilter(["c", "a"]),
+                "features2": FeatureFilter(["a"]),
+            }
+
+        def edges(self):
+            return {
+                "cache": "loader",
+                "features1": "cache",
+                "features2": "cache",
+            }
+
+    my_dag = MyDAG()
+    my_dag.fit(outputs=["features1", "features2"])
+
+    # Should only read the columns the feature filters use
+    X, y = my_dag.get_node("cache").run()
+    assert X.columns.tolist() == ["c", "a"]
+    assert y.shape[0] == 10
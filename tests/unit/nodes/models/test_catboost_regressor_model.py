@@ -30,3 +30,23 @@ def test_catboost_regressor_model():
     assert y_true is None
     assert isinstance(y_pred, pd.Series)
     assert y_pred.shape[0] == 4
+
+
+def test_catboost_regressor_model_partial_fit():
+
+    df = pd.DataFrame()
+    df["a"] = np.random.randn(20)
+    df["b"] = np.random.randn(20)
+    df["c"] = np.random.randn() * df["a"] + np.random.randn() * df["b"]
+
+    crm = CatBoostRegressorModel(verbose=False, thread_count=1, iterations=5)
+
+    # First partial fit should just fit
+    crm.partial_fit(df[["a", "b"]].iloc[:10], df["c"].iloc[:10])
+    assert crm.model.tree_count_ == 5
+
+    # And subsequent ones should add more trees
+    crm.partial_fit(df[["a", "b"]].iloc[10:], df["c"].iloc[10:])
+    assert crm.model.tree_count_ == 10
+    y_pred, _ = crm.run(df[["a", "b"]], None)
+    assert y_pred.shape[0] == 20
@@ -0,0 +1,45 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from pipedown.utils.shared_frame import SharedFrame
+
+
+def test_shared_frame(tmp_path):
+    df = pd.DataFrame(
+        {
+            "a": np.random.randn(5),
+            "b": list("abcde"),
+            "c": np.arange(5),
+            "d": np.random.randn(5),
+            "e": pd.date_range("2022-01-01", periods=5),
+            "f": pd.Categorical(list("xxyyx")),
+        },
+        index=list("vwxyz"),
+    )
+
+    # Should round-trip through pickle
+    shared = pickle.loads(pickle.dumps(SharedFrame(df, str(tmp_path))))
+    loaded = shared.load()
+    pd.testing.assert_frame_equal(loaded, df)
+
+    # One file per numpy dtype
+    assert len(shared.files) == 3
+    assert len(list(tmp_path.iterdir())) == 3
+
+    # Numpy columns should be read-only memory maps (not copies)
+    for col in ["a", "c", "d", "e"]:
+        assert not loaded[col].values.flags.writeable
+
+    # Slicing rows should give a normal, writable, copy
+    fold = loaded.iloc[[0, 2], :].copy()
+    fold["a"] = 1.0
+    assert (fold["a"] == 1.0).all()
+    pd.testing.assert_frame_equal(loaded, df)
+
+
+def test_shared_series(tmp_path):
+    y = pd.Series(np.random.randn(5), name="y", index=np.arange(5) * 2)
+    loaded = SharedFrame(y, str(tmp_path)).load()
+    pd.testing.assert_series_equal(loaded, y)